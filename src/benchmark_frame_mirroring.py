@@ -0,0 +1,56 @@
+from __future__ import annotations
+import argparse
+import logging
+import time
+from typing import Any, Callable
+from cv2 import cv2
+import numpy as np
+from common.Log import init_logging
+from common.FrameBufferPool import FrameBufferPool
+from common.frame_util import convert_bgr_to_rgb, mirror_frame
+
+# Compares the per-frame cost of preparing a captured BGR frame for the hand tracking, with capture_flip enabled.
+# Previously, every analyzed frame was mirrored. Now only the landmarks are mirrored, and the frame is only mirrored for a visible preview.
+# Example: python benchmark_frame_mirroring.py --frames 1000
+parser = argparse.ArgumentParser(description="Benchmark mirroring the analyzed frame against mirroring only the preview.")
+parser.add_argument("--frames", type=int, default=1000, help="number of frames per measurement")
+args = parser.parse_args()
+
+init_logging()
+log = logging.getLogger("root")
+
+def measure_ms_per_frame(prepare_frame: Callable[[Any], Any], frame: Any) -> float:
+    # Warm up, such that pooled buffers are allocated
+    prepare_frame(frame)
+    start_time = time.perf_counter()
+    for _ in range(args.frames):
+        prepare_frame(frame)
+    return (time.perf_counter() - start_time) * 1000 / args.frames
+
+def allocating_flip_and_convert(frame: Any) -> Any:
+    return cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB)
+
+def benchmark(width: int, height: int) -> None:
+    frame = np.random.default_rng(0).integers(0, 256, (height, width, 3), dtype=np.uint8)
+    frame_buffer_pool = FrameBufferPool()
+
+    def mirror_analyzed_frame(frame: Any) -> Any:
+        return mirror_frame(frame, True, frame_buffer_pool)
+
+    def convert_analyzed_frame(frame: Any) -> Any:
+        return convert_bgr_to_rgb(frame, frame_buffer_pool)
+
+    def convert_analyzed_frame_and_mirror_preview(frame: Any) -> Any:
+        convert_bgr_to_rgb(frame, frame_buffer_pool)
+        return mirror_frame(frame, True, frame_buffer_pool)
+
+    log.info(f"{width}x{height}:")
+    log.info(f"  before, allocating flip + cvtColor: {measure_ms_per_frame(allocating_flip_and_convert, frame):.3f} ms")
+    log.info(f"  before, mirror in conversion pass: {measure_ms_per_frame(mirror_analyzed_frame, frame):.3f} ms")
+    log.info(f"  now, preview hidden: {measure_ms_per_frame(convert_analyzed_frame, frame):.3f} ms")
+    log.info(f"  now, preview visible: {measure_ms_per_frame(convert_analyzed_frame_and_mirror_preview, frame):.3f} ms")
+
+log.info(f"{args.frames} frames per measurement, BGR capture with capture_flip enabled")
+benchmark(640, 360)
+benchmark(1280, 720)
+benchmark(1920, 1080)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import argparse
+import logging
+import time
+from typing import Any, Callable, List, Tuple
+from common.Log import init_logging
+from common.ArrayHandLandmarks import ArrayHandLandmarks
+from common.GesturePredicateCache import GesturePredicateCache
+from common.GestureEvaluationPlan import GestureEvaluationPlan
+from common.GestureRule import get_default_gesture_rules
+from common.GestureRuleEngine import GestureRuleEngine
+from common.HandFeatures import HandFeatures
+from common.HandFingerPositions import HandFingerPositions
+from common.LandmarkRecorder import load_landmark_records
+from common.Vector import Vector
+from tests import reference_gesture_predicates as reference
+from tests.synthetic_hands import capture_size, create_session
+
+# Compares the cost of the gesture predicates per frame: the previous predicates on FingerPositions (Vectors)
+# with the HandFeatures and the GestureRuleEngine. Both evaluate the mouse positioning triggers, the click gestures and thumb up and down.
+# The frames come from a landmark recording, or from a synthetic session if no recording is given.
+# Example: python benchmark_hand_features.py recordings/landmarks-20211001-120000.npy --repeat 5
+parser = argparse.ArgumentParser(description="Benchmark the gesture predicates on FingerPositions against the HandFeatures.")
+parser.add_argument("file_path", nargs="?", help="landmark recording (.npy), a synthetic session if not given")
+parser.add_argument("--frames", type=int, default=3000, help="frame count of the synthetic session")
+parser.add_argument("--repeat", type=int, default=5, help="runs per path, the fastest run is reported")
+args = parser.parse_args()
+
+init_logging()
+log = logging.getLogger("root")
+
+# Thresholds of the default config
+near_distance = 0.05
+faraway_distance = 0.075
+tip_indexes = [HandFingerPositions.index_tip_index, HandFingerPositions.middle_tip_index,
+               HandFingerPositions.ring_tip_index, HandFingerPositions.pinky_tip_index]
+
+def load_hands() -> List[Tuple[Any, Vector]]:
+    """ Returns (landmarks, capture size) of the frames with a hand. """
+    if args.file_path is None:
+        return [(ArrayHandLandmarks(landmarks), capture_size) for _, landmarks in create_session(args.frames) if landmarks is not None]
+    records = load_landmark_records(args.file_path)
+    return [(ArrayHandLandmarks(record["landmarks"]), Vector(int(record["capture_width"]), int(record["capture_height"])))
+            for record in records if record["has_hand"]]
+
+def evaluate_reference_predicates(hands: List[Tuple[Any, Vector]]) -> None:
+    for single_hand_landmarks, hand_capture_size in hands:
+        hand_finger_positions = HandFingerPositions(single_hand_landmarks, hand_capture_size)
+        thumb_tip = hand_finger_positions.thumb_tip_position
+        tips = hand_finger_positions.get_finger_positions_by_index(tip_indexes)
+        reference.is_near_target(tips, thumb_tip, near_distance)
+        reference.is_faraway_target(tips, thumb_tip, faraway_distance)
+        for near_tip_indexes in [[8], [12, 16], [16, 20]]:
+            reference.is_only_near_thumb(hand_finger_positions, near_tip_indexes, near_distance, faraway_distance)
+        if not reference.is_thumb_down(hand_finger_positions):
+            reference.is_thumb_up(hand_finger_positions)
+
+def create_feature_evaluation() -> Callable[[List[Tuple[Any, Vector]]], None]:
+    gesture_rule_engine = GestureRuleEngine(get_default_gesture_rules())
+    gesture_rule_engine.set_evaluation_plan(GestureEvaluationPlan(True, True, True))
+    gesture_predicate_cache = GesturePredicateCache(lambda: False)
+
+    def evaluate_features(hands: List[Tuple[Any, Vector]]) -> None:
+        for single_hand_landmarks, hand_capture_size in hands:
+            hand_features = HandFeatures(HandFingerPositions(single_hand_landmarks, hand_capture_size))
+            hand_features.compute_tip_distances()
+            thumb_tip_distances = hand_features.thumb_tip_distances[1:]
+            all(distance < near_distance for distance in thumb_tip_distances)
+            all(distance > faraway_distance for distance in thumb_tip_distances)
+            gesture_rule_engine.evaluate(hand_features, near_distance, faraway_distance, gesture_predicate_cache)
+    return evaluate_features
+
+def measure_us_per_frame(evaluate: Callable[[List[Tuple[Any, Vector]]], None], hands: List[Tuple[Any, Vector]]) -> float:
+    durations_seconds = []
+    for _ in range(args.repeat):
+        start_time_seconds = time.perf_counter()
+        evaluate(hands)
+        durations_seconds.append(time.perf_counter() - start_time_seconds)
+    return min(durations_seconds) * 1_000_000 / len(hands)
+
+benchmark_hands = load_hands()
+if not benchmark_hands:
+    log.warning("no frames with a hand")
+else:
+    log.info(f"frames with a hand: {len(benchmark_hands)}, runs per path: {args.repeat}")
+    log.info(f"FingerPosition predicates: {measure_us_per_frame(evaluate_reference_predicates, benchmark_hands):.1f} us per frame")
+    log.info(f"HandFeatures and GestureRuleEngine: {measure_us_per_frame(create_feature_evaluation(), benchmark_hands):.1f} us per frame")
@@ -0,0 +1,67 @@
+from __future__ import annotations
+import argparse
+import logging
+import time
+from typing import Any, Callable, List
+from cv2 import cv2
+import numpy as np
+from common.Log import init_logging
+from common.FrameRingBuffer import FrameRingBuffer
+from common.MjpegStreamReader import MjpegStreamReader
+from common.ReducedJpegDecoder import ReducedJpegDecoder
+from common.Vector import Vector
+from tests.canned_http_server import MjpegServer, get_frame_number
+
+# Compares the lag of the native MJPEG reader and of cv2.VideoCapture with a consumer that is slower than the stream.
+# A local server streams numbered frames. The lag of a frame is the number of newer frames that the server has sent when it is consumed.
+# Example: python benchmark_mjpeg_reader.py --fps 30 --consumer-ms 100 --seconds 10
+parser = argparse.ArgumentParser(description="Benchmark the native MJPEG reader against cv2.VideoCapture.")
+parser.add_argument("--fps", type=float, default=30, help="frame rate of the canned MJPEG stream")
+parser.add_argument("--consumer-ms", type=float, default=100, help="time that the consumer takes per frame")
+parser.add_argument("--seconds", type=float, default=10, help="duration of each run")
+args = parser.parse_args()
+
+init_logging()
+log = logging.getLogger("root")
+
+def measure_lags(mjpeg_server: MjpegServer, take_frame: Callable[[], Any]) -> List[int]:
+    lags = []
+    end_time = time.monotonic() + args.seconds
+    while time.monotonic() < end_time:
+        frame = take_frame()
+        if frame is None:
+            continue
+        lags.append(mjpeg_server.last_sent_frame_number - get_frame_number(frame))
+        time.sleep(args.consumer_ms / 1000)
+    return lags
+
+def measure_native_reader_lags() -> List[int]:
+    with MjpegServer(fps=args.fps) as mjpeg_server:
+        frame_ring_buffer = FrameRingBuffer()
+        mjpeg_stream_reader = MjpegStreamReader(mjpeg_server.get_url("/video"), frame_ring_buffer, ReducedJpegDecoder(lambda: Vector(640, 480)))
+        mjpeg_stream_reader.start()
+        try:
+            return measure_lags(mjpeg_server, lambda: frame_ring_buffer.take_latest_frame(1))
+        finally:
+            mjpeg_stream_reader.stop()
+
+def measure_video_capture_lags() -> List[int]:
+    with MjpegServer(fps=args.fps) as mjpeg_server:
+        # The extension lets the ffmpeg backend detect the stream format
+        cap = cv2.VideoCapture(mjpeg_server.get_url("/video?type=.mjpg"))
+        if not cap.isOpened():
+            log.warning("cv2.VideoCapture could not open the stream")
+            return []
+        try:
+            return measure_lags(mjpeg_server, lambda: cap.read()[1])
+        finally:
+            cap.release()
+
+def get_lag_text(lags: List[int]) -> str:
+    if not lags:
+        return "no frames"
+    return f"lag mean: {np.mean(lags):.1f} frames, max: {np.max(lags)} frames, consumed frames: {len(lags)}"
+
+log.info(f"stream: {args.fps} fps, consumer: {args.consumer_ms} ms per frame, {args.seconds} s per run")
+log.info(f"native MJPEG reader: {get_lag_text(measure_native_reader_lags())}")
+log.info(f"cv2.VideoCapture: {get_lag_text(measure_video_capture_lags())}")
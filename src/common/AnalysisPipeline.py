@@ -0,0 +1,120 @@
+from __future__ import annotations
+from typing import Any, Callable, Union
+import time
+import common.WebcamControl as WebcamControl
+from .DropOldestQueue import DropOldestQueue
+from .FrameRingBuffer import FrameRingBuffer
+from .FramePacer import FramePacer
+from .FrameSource import FrameSource
+from .GestureEvaluationPlan import GestureEvaluationPlan
+from .LogHolder import LogHolder
+from .PipelineStage import PipelineStage
+from .Vector import Vector
+
+class AnalysisPipeline(LogHolder):
+    """ Analyzes frames in stages that run in parallel, each on its own thread:
+    capture (the FrameSource) -> preprocess -> inference -> gestures and preview -> output (mouse actions).
+    Stages are connected by DropOldestQueues. While a frame is in inference, the next frame is already preprocessed.
+    Thus the throughput approaches the one of the slowest stage instead of the sum of all stages.
+    """
+    # Mouse actions must not get lost, the queue only overflows if the output stalls
+    mouse_action_queue_size = 64
+    check_interval_seconds = 0.1
+
+    def __init__(self, webcam_control: WebcamControl.WebcamControl, frame_source: FrameSource, frame_ring_buffer: FrameRingBuffer) -> None:
+        super().__init__()
+        self.webcam_control = webcam_control
+        self.config = webcam_control.config
+        self.gesture_recognizer = webcam_control.gesture_recognizer
+        self.frame_source = frame_source
+        self.frame_ring_buffer = frame_ring_buffer
+
+        self.preprocessed_frame_queue = DropOldestQueue(1)
+        self.analyzed_frame_queue = DropOldestQueue(1)
+        self.mouse_action_queue = DropOldestQueue(self.mouse_action_queue_size)
+        # Limits the rate of the pipeline when nothing is controlled
+        self.standby_frame_pacer = FramePacer(GestureEvaluationPlan.standby_fps)
+        self.stages = [
+            PipelineStage("preprocess", self.take_latest_frame, self.preprocess, self.preprocessed_frame_queue),
+            PipelineStage("inference", self.preprocessed_frame_queue.get, self.detect_hand_landmarks, self.analyzed_frame_queue),
+            PipelineStage("gestures", self.analyzed_frame_queue.get, self.recognize_gestures, None),
+            PipelineStage("output", self.mouse_action_queue.get, self.run_mouse_action, None),
+        ]
+
+    def run(self) -> Union[str, None]:
+        """ Runs the stages until the capture is stopped, restarted, or fails. Returns an error message or None. """
+        self.log.info("starting analysis pipeline")
+        self.webcam_control.frame_rate_counter.start()
+        self.gesture_recognizer.mouse_action_queue = self.mouse_action_queue
+        for stage in self.stages:
+            stage.start()
+
+        error_message: Union[str, None] = None
+        try:
+            while self.config.running.value and not self.webcam_control.is_restart_video_capture:
+                time.sleep(self.check_interval_seconds)
+                if (self.frame_source.error_message
+                        and self.frame_ring_buffer.published_frame_count == 0):
+                    error_message = self.frame_source.error_message
+                    break
+                if self.frame_source.is_finished and self.is_drained():
+                    break
+        finally:
+            # In order of the data flow
+            for stage in self.stages:
+                stage.stop()
+            for queue in [self.preprocessed_frame_queue, self.analyzed_frame_queue, self.mouse_action_queue]:
+                queue.close()
+            self.gesture_recognizer.mouse_action_queue = None
+
+        self.log.info(f"analysis frame rate: {self.webcam_control.frame_rate_counter.get_statistics_text()}")
+        for stage in self.stages:
+            self.log.info(f"pipeline stage statistics: {stage.get_statistics_text()}")
+        return error_message
+
+    def is_drained(self) -> bool:
+        return (self.frame_ring_buffer.last_taken_sequence >= self.frame_ring_buffer.published_frame_count
+                and len(self.preprocessed_frame_queue.items) == 0
+                and len(self.analyzed_frame_queue.items) == 0)
+
+    def take_latest_frame(self, timeout_seconds: float) -> Any:
+        # In standby, wait before taking the frame such that it is not outdated
+        if self.gesture_recognizer.evaluation_plan.is_standby:
+            self.standby_frame_pacer.wait_for_next_frame()
+        return self.frame_ring_buffer.take_latest_frame(timeout_seconds)
+
+    def preprocess(self, ring_buffer_frame: Any) -> PipelineFrame:
+        native_frame_size = self.frame_source.get_native_frame_size(ring_buffer_frame)
+        if native_frame_size != self.webcam_control.actual_capture_size:
+            self.webcam_control.actual_capture_size = native_frame_size
+
+        # Frames in flight must not share buffers: the slot of the ring buffer is reused after the next frame is taken,
+        # and a frame can be dropped in any queue. Thus the frames are not taken from a FrameBufferPool.
+        captured_frame, frame = self.webcam_control.preprocess_frame(ring_buffer_frame, None)
+        if captured_frame is ring_buffer_frame:
+            captured_frame = captured_frame.copy()
+            if not self.webcam_control.is_bgr_capture():
+                frame = captured_frame
+        return PipelineFrame(captured_frame, frame, native_frame_size)
+
+    def detect_hand_landmarks(self, pipeline_frame: PipelineFrame) -> PipelineFrame:
+        pipeline_frame.multi_hand_landmarks = self.gesture_recognizer.detect_hand_landmarks(pipeline_frame.frame)
+        return pipeline_frame
+
+    def recognize_gestures(self, pipeline_frame: PipelineFrame) -> None:
+        self.gesture_recognizer.record_hand_landmarks(pipeline_frame.multi_hand_landmarks)
+        self.gesture_recognizer.process_multi_hand_landmarks(pipeline_frame.multi_hand_landmarks)
+        self.webcam_control.show_preview(pipeline_frame.captured_frame, pipeline_frame.frame, None)
+        self.webcam_control.frame_rate_counter.count_frame()
+
+    def run_mouse_action(self, mouse_action: Callable[[], None]) -> None:
+        mouse_action()
+
+class PipelineFrame:
+    def __init__(self, captured_frame: Any, frame: Any, native_frame_size: Vector) -> None:
+        # Reduced to inference resolution, in the color space of the capture
+        self.captured_frame = captured_frame
+        # RGB frame for the analysis
+        self.frame = frame
+        self.native_frame_size = native_frame_size
+        self.multi_hand_landmarks: Any = None
@@ -11,7 +11,7 @@ from common.GestureRecognizer import GestureRecognizer
 from common.GlobalShortcutControl import GlobalShortcutControl
 
 class AppContext:
-    def __init__(self) -> None:
+    def __init__(self, is_headless: bool = False) -> None:
         # Load config from file
         self.config = Config.load_from_file()
         if self.config.screen_size.value.x <= 0 or self.config.screen_size.value.y <= 0:
@@ -25,6 +25,10 @@ class AppContext:
         self.gesture_recognizer = GestureRecognizer(self)
         self.webcam_control = WebcamControl(self)
 
+        # Without GUI and shortcuts, e.g. to replay recorded landmarks
+        if is_headless:
+            return
+
         # Create Qt Application
         self.qt_application = QApplication(sys.argv)
         apply_stylesheet(self.qt_application, theme=self.config.ui_theme.value)
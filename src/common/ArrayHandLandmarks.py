@@ -0,0 +1,27 @@
+from __future__ import annotations
+from typing import Any, List
+import numpy as np
+
+def hand_landmarks_to_array(single_hand_landmarks: Any, dtype: Any = np.float32) -> Any:
+    """ Returns the landmarks of a hand as array of shape (21, 3), float32 by default. """
+    return np.array([(landmark.x, landmark.y, landmark.z) for landmark in single_hand_landmarks.landmark], dtype=dtype)
+
+def mirror_hand_landmarks(single_hand_landmarks: Any) -> None:
+    """ Mirrors the landmarks horizontally in place, such that they are the landmarks of the mirrored frame.
+    Landmarks are relative to the frame size, thus pixel column c of a frame of width w (x = (c + 0.5) / w) becomes w - 1 - c.
+    """
+    for landmark in single_hand_landmarks.landmark:
+        landmark.x = 1 - landmark.x
+
+class ArrayHandLandmarks:
+    """ Provides landmarks of an array of shape (21, 3) in the same form as the hand landmarks of mediapipe,
+    e.g. recorded landmarks or landmarks from the inference worker.
+    """
+    def __init__(self, landmarks: Any) -> None:
+        self.landmark: List[ArrayLandmark] = [ArrayLandmark(x, y, z) for x, y, z in landmarks.tolist()]
+
+class ArrayLandmark:
+    def __init__(self, x: float, y: float, z: float) -> None:
+        self.x = x
+        self.y = y
+        self.z = z
@@ -0,0 +1,244 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Union
+import time
+from cv2 import cv2
+from .LogHolder import LogHolder
+from .Vector import Vector
+from .util import from_json, to_json
+
+# Backends that can be selected by name. Which of these are available depends on the OpenCV build and platform.
+video_capture_backends = {
+    "ANY": cv2.CAP_ANY,
+    "V4L2": cv2.CAP_V4L2,
+    "FFMPEG": cv2.CAP_FFMPEG,
+    "GSTREAMER": cv2.CAP_GSTREAMER,
+    "DSHOW": cv2.CAP_DSHOW,
+    "MSMF": cv2.CAP_MSMF,
+    "AVFOUNDATION": cv2.CAP_AVFOUNDATION,
+}
+
+def fourcc_to_int(fourcc: str) -> int:
+    return cv2.VideoWriter_fourcc(*fourcc) # type: ignore
+
+def int_to_fourcc(value: float) -> str:
+    int_value = int(value)
+    return "".join(chr((int_value >> (8 * i)) & 0xFF) for i in range(4)).strip("\x00 ")
+
+def get_v4l2_device_name(device_index: int) -> str:
+    """ Returns the name of the camera, e.g. 'HD Pro Webcam C920'. Only Linux exposes it, elsewhere the name is empty. """
+    try:
+        with open(file=f"/sys/class/video4linux/video{device_index}/name", mode="r", encoding="utf-8") as file:
+            return file.read().strip()
+    except OSError:
+        return ""
+
+class CameraModeProbe(LogHolder):
+    """ Finds the modes (backend, FOURCC, size, fps) that a camera actually delivers.
+    Each accepted mode is measured by reading frames: the delivered frame rate and the time a read takes.
+    The results are cached per device, such that the probe only runs once.
+    The device index alone does not identify a camera, thus the cache key includes the device name where it is known,
+    and the selected mode is validated on the camera before it is used. A rejected mode triggers a new probe.
+    The capture factory (cv2.VideoCapture by default) can be replaced, e.g. by a fake camera.
+    """
+    cache_file_path = "camera_modes.json"
+    candidate_fourccs = ["MJPG", "YUYV"]
+    candidate_sizes = [Vector(640, 480), Vector(1280, 720), Vector(1920, 1080)]
+    candidate_fps = [30, 60]
+    warmup_frame_count = 5
+    measured_frame_count = 20
+
+    def __init__(self,
+                 capture_factory: Callable[[int, int], Any] = cv2.VideoCapture,
+                 device_name_getter: Callable[[int], str] = get_v4l2_device_name) -> None:
+        super().__init__()
+        self.capture_factory = capture_factory
+        self.device_name_getter = device_name_getter
+
+    def get_best_mode(self, device_index: int, target_latency_ms: float, min_size: Vector) -> Union[CameraMode, None]:
+        """ Returns the cheapest mode that covers the min size and meets the target latency.
+        Falls back to the mode with the lowest latency if no mode meets the target.
+        A cached mode that the camera no longer accepts (e.g. another camera at the same index) is probed again.
+        """
+        best_mode = self.select_best_mode(self.get_modes(device_index), target_latency_ms, min_size)
+        if best_mode is None or self.is_mode_accepted(device_index, best_mode):
+            return best_mode
+
+        self.log.warning(f"camera {device_index} does not accept the cached mode {best_mode}, probing again")
+        best_mode = self.select_best_mode(self.get_modes(device_index, True), target_latency_ms, min_size)
+        if best_mode is not None and not self.is_mode_accepted(device_index, best_mode):
+            self.log.warning(f"camera {device_index} does not accept the probed mode {best_mode}")
+            return None
+        return best_mode
+
+    def select_best_mode(self, modes: List[CameraMode], target_latency_ms: float, min_size: Vector) -> Union[CameraMode, None]:
+        if not modes:
+            return None
+
+        large_enough_modes = [mode for mode in modes if mode.width >= min_size.x and mode.height >= min_size.y] or modes
+        fast_enough_modes = [mode for mode in large_enough_modes if mode.get_latency_ms() <= target_latency_ms]
+        if not fast_enough_modes:
+            best_mode = min(large_enough_modes, key=lambda mode: mode.get_latency_ms())
+            self.log.warning(f"no camera mode meets the target latency of {target_latency_ms} ms, using {best_mode}")
+            return best_mode
+        # Fewer pixels are cheaper to read, decode and downscale
+        return min(fast_enough_modes, key=lambda mode: (mode.width * mode.height, mode.get_latency_ms()))
+
+    def get_modes(self, device_index: int, is_reprobe: bool = False) -> List[CameraMode]:
+        cache = self.load_cache()
+        device_key = self.get_device_key(device_index)
+        if device_key in cache and not is_reprobe:
+            return cache[device_key]
+
+        modes = self.probe(device_index)
+        # Probe again next time if the camera was not available
+        if modes:
+            cache[device_key] = modes
+            self.save_cache(cache)
+        elif device_key in cache:
+            del cache[device_key]
+            self.save_cache(cache)
+        return modes
+
+    def get_device_key(self, device_index: int) -> str:
+        device_name = self.device_name_getter(device_index)
+        if not device_name:
+            return f"device-{device_index}"
+        return f"device-{device_index}-{device_name}"
+
+    def probe(self, device_index: int) -> List[CameraMode]:
+        self.log.info(f"probing modes of camera {device_index}")
+        modes: List[CameraMode] = []
+        for backend_name in self.get_available_backend_names():
+            try:
+                modes.extend(self.probe_backend(device_index, backend_name))
+            except Exception:
+                self.log.exception(f"Failed to probe camera {device_index} with backend {backend_name}")
+        return modes
+
+    def probe_backend(self, device_index: int, backend_name: str) -> List[CameraMode]:
+        modes: List[CameraMode] = []
+        cap = self.capture_factory(device_index, video_capture_backends[backend_name])
+        try:
+            if not cap.isOpened():
+                return modes
+            for fourcc in self.candidate_fourccs:
+                for size in self.candidate_sizes:
+                    for fps in self.candidate_fps:
+                        mode = self.probe_mode(cap, CameraModeRequest(backend_name, fourcc, int(size.x), int(size.y), fps))
+                        # The camera may silently pick the same mode for different requests
+                        if mode is None or any(mode.is_same_mode(accepted_mode) for accepted_mode in modes):
+                            continue
+                        modes.append(mode)
+                        self.log.info(f"found camera mode: {mode}")
+        finally:
+            cap.release()
+        return modes
+
+    def is_mode_accepted(self, device_index: int, mode: CameraMode) -> bool:
+        """ Returns True if the camera opens with the backend of the mode, accepts the mode and delivers a frame. """
+        if mode.backend_name not in video_capture_backends:
+            return False
+        cap = self.capture_factory(device_index, video_capture_backends[mode.backend_name])
+        try:
+            if not cap.isOpened() or not self.apply_mode(cap, mode.get_request()):
+                return False
+            ret, frame = cap.read()
+            return bool(ret) and frame is not None
+        finally:
+            cap.release()
+
+    def apply_mode(self, cap: Any, request: CameraModeRequest) -> bool:
+        """ Requests the mode. Returns False if the camera picked another FOURCC or size instead. """
+        # The FOURCC must be set first, it limits the available sizes
+        cap.set(cv2.CAP_PROP_FOURCC, fourcc_to_int(request.fourcc))
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, request.width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, request.height)
+        cap.set(cv2.CAP_PROP_FPS, request.fps)
+        return (int_to_fourcc(cap.get(cv2.CAP_PROP_FOURCC)) == request.fourcc
+                and int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)) == request.width
+                and int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)) == request.height)
+
+    def probe_mode(self, cap: Any, request: CameraModeRequest) -> Union[CameraMode, None]:
+        if not self.apply_mode(cap, request):
+            return None
+        reported_fps = cap.get(cv2.CAP_PROP_FPS)
+
+        for _ in range(self.warmup_frame_count):
+            cap.read()
+
+        read_seconds = 0.0
+        frame_count = 0
+        start_time_seconds = time.monotonic()
+        for _ in range(self.measured_frame_count):
+            read_start_time_seconds = time.monotonic()
+            ret, frame = cap.read()
+            read_seconds = read_seconds + time.monotonic() - read_start_time_seconds
+            if ret and frame is not None:
+                frame_count = frame_count + 1
+        duration_seconds = time.monotonic() - start_time_seconds
+        if frame_count == 0 or duration_seconds <= 0:
+            return None
+
+        return CameraMode(request, reported_fps,
+                          frame_count / duration_seconds,
+                          1000 * read_seconds / self.measured_frame_count)
+
+    def get_available_backend_names(self) -> List[str]:
+        available_backend_ids = cv2.videoio_registry.getCameraBackends()
+        return [name for name, backend_id in video_capture_backends.items() if backend_id in available_backend_ids]
+
+    def load_cache(self) -> Dict[str, List[CameraMode]]:
+        try:
+            with open(file=self.cache_file_path, mode="r", encoding="utf-8") as file:
+                return from_json(file.read(), dict)
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            self.log.exception(f"Could not load camera modes from '{self.cache_file_path}'")
+            return {}
+
+    def save_cache(self, cache: Dict[str, List[CameraMode]]) -> None:
+        with open(file=self.cache_file_path, mode="w", encoding="utf-8") as file:
+            file.write(to_json(cache, True))
+        self.log.info(f"Saved camera modes to: {self.cache_file_path}")
+
+@dataclass
+class CameraModeRequest:
+    """ Settings that are requested from the camera to select a mode. """
+    backend_name: str
+    fourcc: str
+    width: int
+    height: int
+    fps: float
+
+class CameraMode:
+    def __init__(self, request: CameraModeRequest, reported_fps: float, measured_fps: float, read_latency_ms: float) -> None:
+        # The fields of the request are kept as attributes, such that cached modes keep their format
+        self.backend_name = request.backend_name
+        self.fourcc = request.fourcc
+        self.width = request.width
+        self.height = request.height
+        self.requested_fps = request.fps
+        self.reported_fps = reported_fps
+        self.measured_fps = measured_fps
+        # Mean time that a read blocks, which includes waiting for the frame and decoding it
+        self.read_latency_ms = read_latency_ms
+
+    def get_request(self) -> CameraModeRequest:
+        return CameraModeRequest(self.backend_name, self.fourcc, self.width, self.height, self.requested_fps)
+
+    def is_same_mode(self, other: CameraMode) -> bool:
+        return (self.backend_name == other.backend_name
+                and self.fourcc == other.fourcc
+                and self.width == other.width
+                and self.height == other.height
+                and self.reported_fps == other.reported_fps)
+
+    def get_latency_ms(self) -> float:
+        # A frame is on average half a frame interval old when it is read, then the read itself takes time
+        return 500 / self.measured_fps + self.read_latency_ms
+
+    def __repr__(self) -> str:
+        return (f"CameraMode({self.backend_name}, {self.fourcc}, {self.width}x{self.height}@{self.requested_fps}, "
+                f"measured: {self.measured_fps:.1f} fps, read: {self.read_latency_ms:.1f} ms)")
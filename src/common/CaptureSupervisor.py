@@ -0,0 +1,83 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Optional
+from rx import operators as ops
+from rx.core import typing
+import rx
+from .Config import Config
+from .Config import VideoCaptureSource
+from .LogHolder import LogHolder
+from .Vector import Vector
+
+class CaptureSupervisor(LogHolder):
+    """ Watches the capture related config and decides how a change is applied to the running capture.
+    Changes of only size and fps of a webcam are applied in place. Other changes require a restart of the capture.
+    """
+    capture_field_names = [
+        "capture_device_index",
+        "capture_size",
+        "capture_fps",
+        "capture_source",
+        "capture_source_url",
+        "capture_snapshot_connection_count",
+        "capture_native_mjpeg",
+        "capture_file_path",
+        "capture_file_loop",
+        "capture_file_realtime",
+        "capture_backend",
+        "capture_fourcc",
+        "is_capture_autotune",
+        "capture_target_latency_ms",
+        "is_capture_low_latency",
+        "is_high_frame_rate",
+        "is_analysis_pipeline",
+    ]
+    # Fields that a running webcam may be able to change without reopening it
+    reconfigurable_field_names = ["capture_size", "capture_fps"]
+    # Spin boxes change the value with every typed digit
+    debounce_seconds = 0.3
+
+    def __init__(self,
+                 config: Config,
+                 restart_callback: Callable[[], None],
+                 reconfigure_callback: Callable[[Vector, float], None],
+                 scheduler: Optional[typing.Scheduler] = None) -> None:
+        super().__init__()
+        self.config = config
+        self.restart_callback = restart_callback
+        self.reconfigure_callback = reconfigure_callback
+        self.active_capture_settings = self.get_capture_settings()
+
+        (rx.of(*[self.config.__dict__[field_name].subject for field_name in self.capture_field_names])
+            .pipe(ops.merge_all())
+            # The scheduler of the debounce, e.g. a virtual time scheduler in tests
+            .pipe(ops.debounce(self.debounce_seconds, scheduler))
+            .subscribe(self.on_capture_config_changed))
+
+    def get_capture_settings(self) -> Dict[str, Any]:
+        return {field_name: self.config.__dict__[field_name].value for field_name in self.capture_field_names}
+
+    def on_capture_started(self) -> None:
+        # The capture uses the current config
+        self.active_capture_settings = self.get_capture_settings()
+
+    def on_capture_config_changed(self, argument: Any = None) -> None:
+        capture_settings = self.get_capture_settings()
+        changed_field_names = self.get_changed_field_names(self.active_capture_settings, capture_settings)
+        if not changed_field_names:
+            return
+
+        self.active_capture_settings = capture_settings
+        if (all(field_name in self.reconfigurable_field_names for field_name in changed_field_names)
+                and capture_settings["capture_source"] == VideoCaptureSource.INTEGRATED_WEBCAM
+                # The autotuned camera mode overrides the configured size and fps
+                and not capture_settings["is_capture_autotune"]):
+            self.log.info(f"reconfiguring video capture (changed: {changed_field_names})")
+            self.reconfigure_callback(capture_settings["capture_size"], capture_settings["capture_fps"])
+        else:
+            self.log.info(f"restarting video capture (changed: {changed_field_names})")
+            self.restart_callback()
+
+    @staticmethod
+    def get_changed_field_names(old_capture_settings: Dict[str, Any], new_capture_settings: Dict[str, Any]) -> List[str]:
+        return [field_name for field_name, value in new_capture_settings.items()
+                if old_capture_settings.get(field_name) != value]
@@ -5,6 +5,7 @@ from screeninfo import get_monitors
 from .Vector import Vector
 from .util import from_json, to_json
 from .ReactiveProperty import ReactiveProperty
+from .GestureRule import get_default_gesture_rules
 
 class Config:
     config_file_path = "config.json"
@@ -37,7 +38,52 @@ class Config:
         self.capture_device_index = ReactiveProperty(0)
         self.capture_source = ReactiveProperty(VideoCaptureSource.INTEGRATED_WEBCAM)
         self.capture_source_url = ReactiveProperty("http://192.168.1.1:4444/shot.jpg")
+        # Number of persistent connections (i.e. requests in flight) when fetching JPG snapshots from an IP webcam
+        self.capture_snapshot_connection_count = ReactiveProperty(2)
+        # Parse MJPEG streams of an IP webcam natively instead of via OpenCV, which hides (and accumulates) buffered frames
+        self.capture_native_mjpeg = ReactiveProperty(True)
+        # Video file or directory of images that is played instead of a camera, e.g. to measure the analysis frame rate.
+        # When not realtime, frames are played as fast as they are analyzed.
+        self.capture_file_path = ReactiveProperty("")
+        self.capture_file_loop = ReactiveProperty(True)
+        self.capture_file_realtime = ReactiveProperty(True)
+        # Video backend (e.g. "V4L2", "DSHOW", "MSMF") and pixel format (e.g. "MJPG") of the webcam. Empty for the default of OpenCV.
+        self.capture_backend = ReactiveProperty("")
+        self.capture_fourcc = ReactiveProperty("")
+        # Probe the modes of the webcam once (cached in camera_modes.json) and use the cheapest mode that meets the target latency.
+        # This overrides the configured capture size, fps, backend and pixel format.
+        self.is_capture_autotune = ReactiveProperty(False)
+        self.capture_target_latency_ms = ReactiveProperty(50)
+        # Keep the buffer of the video backend small and only decode the newest frame when the analysis is ready for it.
+        # Applies to webcams and video streams that are read via OpenCV.
+        self.is_capture_low_latency = ReactiveProperty(False)
+        # Use the full frame rate of cameras with more than 30 fps.
+        # When the analysis cannot keep up, only every Nth frame is analyzed.
+        self.is_high_frame_rate = ReactiveProperty(False)
         self.capture_flip = ReactiveProperty(True)
+        # Frames are reduced to fit into this size before hand tracking. The hand model works on far smaller inputs than HD video.
+        self.inference_size = ReactiveProperty(Vector(640, 480))
+        # Run preprocessing, hand tracking, gesture recognition and mouse output in parallel threads.
+        # The next frame is prepared while the current one is analyzed. Frames that cannot be analyzed in time are dropped.
+        self.is_analysis_pipeline = ReactiveProperty(False)
+        # Run hand tracking in a separate process, such that it runs in parallel to capture, gesture recognition and GUI.
+        self.is_inference_worker = ReactiveProperty(False)
+        # Lower the quality of the hand tracking (model, confidence, inference size) when it takes longer than the budget per frame.
+        self.is_adaptive_inference_quality = ReactiveProperty(True)
+        self.inference_time_budget_ms = ReactiveProperty(25)
+        # Once a hand has been found, only analyze the region around it in the next frame.
+        # The margin is relative to the size of the hand and should cover the hand motion between two frames.
+        self.is_hand_region_tracking = ReactiveProperty(True)
+        self.hand_region_margin = ReactiveProperty(0.5)
+        # Skip hand tracking while no hand is present and the scene does not change.
+        # The threshold is the mean difference in gray levels (0 to 255) of a tiny version of the frame to the background.
+        # A static scene is still checked for a hand in the given interval.
+        self.is_motion_gate = ReactiveProperty(True)
+        self.motion_gate_threshold = ReactiveProperty(3.0)
+        self.motion_gate_recheck_interval_ms = ReactiveProperty(1000)
+        # Record the hand landmarks of every analyzed frame, e.g. to reproduce issues via replay_landmarks.py
+        self.is_landmark_recording = ReactiveProperty(False)
+        self.landmark_recording_directory = ReactiveProperty("recordings")
 
         # Motion does not (cannot) use the full capture range
         self.motion_border_left = ReactiveProperty(0.15)
@@ -72,6 +118,15 @@ class Config:
         self.continued_scroll_pause_ms = ReactiveProperty(100)
         # A drag gesture is started when a click is held for at least this duration.
         self.drag_start_click_delay_ms = ReactiveProperty(1000)
+        # Definition of the click, drag and scroll gestures (see GestureRule).
+        self.gesture_rules = ReactiveProperty(get_default_gesture_rules())
+        # If enabled, the gestures of the classes of the gesture classifier (e.g. SCROLL_UP) are recognized by the classifier
+        # instead of the conditions of their rules. The classifier is trained with train_gesture_classifier.py.
+        self.is_gesture_classifier = ReactiveProperty(False)
+        self.gesture_classifier_file_path = ReactiveProperty("gesture_classifier.npz")
+        # Reuse the results of the tip distance predicates (e.g. finger tip near thumb tip) while the finger tips moved too little
+        # to bring a distance across a threshold. The gestures are the same as without reuse.
+        self.is_gesture_predicate_cache = ReactiveProperty(True)
 
         self.pyautogui_scroll_factor = ReactiveProperty(200)
 
@@ -131,6 +186,7 @@ class ConfigException(Exception):
 class VideoCaptureSource(Enum):
     INTEGRATED_WEBCAM = 0
     IP_WEBCAM = 1
+    FILE = 2
 
 class MousePositioningMode(Enum):
     RELATIVE = 0
@@ -0,0 +1,39 @@
+from __future__ import annotations
+from typing import Any, Deque, Optional
+from collections import deque
+import threading
+
+class DropOldestQueue:
+    """ Bounded queue between two threads. When the queue is full, the oldest item is dropped to make room for the new one.
+    Thus the consumer always works on recent items and the producer never blocks.
+    """
+    def __init__(self, max_size: int) -> None:
+        if max_size < 1:
+            raise ValueError("DropOldestQueue needs a max size of at least 1")
+        self.items: Deque[Any] = deque(maxlen=max_size)
+        self.condition = threading.Condition()
+        self.put_count = 0
+        self.dropped_count = 0
+        self.is_closed = False
+
+    def put(self, item: Any) -> None:
+        with self.condition:
+            if len(self.items) == self.items.maxlen:
+                self.dropped_count = self.dropped_count + 1
+            self.items.append(item)
+            self.put_count = self.put_count + 1
+            self.condition.notify()
+
+    def get(self, timeout_seconds: Optional[float] = None) -> Any:
+        """ Waits for the oldest item and returns it (or None on timeout or close). """
+        with self.condition:
+            has_item = self.condition.wait_for(lambda: self.is_closed or len(self.items) > 0, timeout_seconds)
+            if not has_item or self.is_closed:
+                return None
+            return self.items.popleft()
+
+    def close(self) -> None:
+        with self.condition:
+            self.is_closed = True
+            self.items.clear()
+            self.condition.notify_all()
@@ -0,0 +1,31 @@
+from __future__ import annotations
+from typing import Any, Dict, Tuple
+import numpy as np
+
+class FrameBufferPool:
+    """ Named output buffers that are reused from frame to frame, e.g. as dst parameter of OpenCV functions.
+    A buffer is only reallocated when its shape changes. Thus, a buffer is only valid until it is requested again.
+    """
+    def __init__(self) -> None:
+        self.buffers: Dict[str, Any] = {}
+        self.allocation_count = 0
+        self.allocated_byte_count = 0
+        self.reuse_count = 0
+
+    def get_buffer(self, name: str, shape: Tuple[int, ...], dtype: Any = np.uint8) -> Any:
+        buffer = self.buffers.get(name)
+        if buffer is not None and buffer.shape == shape and buffer.dtype == dtype:
+            self.reuse_count = self.reuse_count + 1
+            return buffer
+
+        buffer = np.empty(shape, dtype=dtype)
+        self.buffers[name] = buffer
+        self.allocation_count = self.allocation_count + 1
+        self.allocated_byte_count = self.allocated_byte_count + buffer.nbytes
+        return buffer
+
+    def get_statistics_text(self) -> str:
+        pooled_byte_count = sum(buffer.nbytes for buffer in self.buffers.values())
+        return (f"buffers: {len(self.buffers)} ({pooled_byte_count / (1024 * 1024):.1f} MiB), "
+                f"allocations: {self.allocation_count} ({self.allocated_byte_count / (1024 * 1024):.1f} MiB), "
+                f"reuses: {self.reuse_count}")
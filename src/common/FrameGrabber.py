@@ -0,0 +1,88 @@
+from __future__ import annotations
+from typing import Any, Callable, Tuple, Union
+import time
+from cv2 import cv2
+from .FrameRingBuffer import FrameRingBuffer
+from .FrameSource import FrameSource
+from .Vector import Vector
+
+class FrameGrabber(FrameSource):
+    """ Continuously drains a cv2.VideoCapture into a FrameRingBuffer on a dedicated thread,
+    such that the camera's internal queue never fills up while a frame is analyzed.
+    In low latency mode, frames are only grabbed while the analysis is busy. A frame is only decoded (retrieved)
+    when the analysis waits for it. Thus no decoding time is spent on frames that would be dropped anyway.
+    """
+    def __init__(self, cap: Any, frame_ring_buffer: FrameRingBuffer, is_low_latency: bool = False) -> None:
+        super().__init__(frame_ring_buffer)
+        self.cap = cap
+        self.is_low_latency = is_low_latency
+        self.grabbed_frame_count = 0
+        self.decoded_frame_count = 0
+        self.failed_read_count = 0
+        self.requested_capture_settings: Union[Tuple[Vector, float, Callable[[bool], None]], None] = None
+
+    def request_capture_settings(self, capture_size: Vector, capture_fps: float, applied_callback: Callable[[bool], None]) -> bool:
+        # Applied on the thread of the grabber, because the camera must not be changed during a read
+        self.requested_capture_settings = (capture_size, capture_fps, applied_callback)
+        return True
+
+    def apply_capture_settings(self, capture_size: Vector, capture_fps: float, applied_callback: Callable[[bool], None]) -> None:
+        # Some backends can only change the settings when the camera is opened
+        is_success = (self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, capture_size.x)
+                      and self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, capture_size.y)
+                      and self.cap.set(cv2.CAP_PROP_FPS, capture_fps))
+        self.log.info(f"applied capture settings (width: {capture_size.x}, height: {capture_size.y}, fps: {capture_fps}, success: {is_success})")
+        applied_callback(is_success)
+
+    def run(self) -> None:
+        self.log.info("started frame grabber")
+        while self.is_running:
+            requested_capture_settings = self.requested_capture_settings
+            if requested_capture_settings is not None:
+                self.requested_capture_settings = None
+                self.apply_capture_settings(*requested_capture_settings)
+
+            if self.is_low_latency:
+                self.grab_and_retrieve_frame()
+            else:
+                self.read_frame()
+        self.log.info(f"frame grabber finished ({self.get_statistics_text()})")
+
+    def read_frame(self) -> None:
+        slot_index = self.frame_ring_buffer.get_write_slot_index()
+        ret, frame = self.cap.read(self.frame_ring_buffer.get_slot(slot_index))
+        if not ret or frame is None:
+            self.on_failed_read()
+            return
+
+        self.grabbed_frame_count = self.grabbed_frame_count + 1
+        self.decoded_frame_count = self.decoded_frame_count + 1
+        self.frame_ring_buffer.publish(slot_index, frame)
+
+    def grab_and_retrieve_frame(self) -> None:
+        if not self.cap.grab():
+            self.on_failed_read()
+            return
+
+        self.grabbed_frame_count = self.grabbed_frame_count + 1
+        if not self.frame_ring_buffer.is_consumer_waiting():
+            # The frame would be outdated when the analysis is ready for it
+            return
+
+        slot_index = self.frame_ring_buffer.get_write_slot_index()
+        ret, frame = self.cap.retrieve(self.frame_ring_buffer.get_slot(slot_index))
+        if not ret or frame is None:
+            self.on_failed_read()
+            return
+
+        self.decoded_frame_count = self.decoded_frame_count + 1
+        self.frame_ring_buffer.publish(slot_index, frame)
+
+    def on_failed_read(self) -> None:
+        self.failed_read_count = self.failed_read_count + 1
+        # Avoid busy waiting when the camera does not deliver frames
+        time.sleep(0.01)
+
+    def get_statistics_text(self) -> str:
+        return (f"grabbed frames: {self.grabbed_frame_count}, decoded frames: {self.decoded_frame_count}, "
+                f"failed reads: {self.failed_read_count}")
@@ -0,0 +1,65 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+from .Vector import Vector
+from .draw_util import draw_circle, draw_line, put_text
+
+class FrameOverlay:
+    """ Drawing commands that are collected while a frame is analyzed and rendered later onto the preview (see OverlayRenderer).
+    Positions are in percent of the frame, such that the commands do not depend on the size of the preview.
+    """
+    def __init__(self) -> None:
+        self.commands: List[OverlayCommand] = []
+
+    def clear(self) -> None:
+        self.commands.clear()
+
+    def add_line(self, start_percent: Vector, end_percent: Vector, color_rgb: Tuple[int, int, int], thickness: int) -> None:
+        self.commands.append(OverlayLine(start_percent, end_percent, color_rgb, thickness))
+
+    def add_circle(self, center_percent: Vector, radius_px: float, radius_percent: float, color_rgb: Tuple[int, int, int], thickness: int = -1) -> None:
+        """ The radius is radius_px plus radius_percent of the frame width. """
+        self.commands.append(OverlayCircle(center_percent, radius_px, radius_percent, color_rgb, thickness))
+
+    def add_text(self, text: str, position_percent: Vector, offset_px: Vector, font_scale: float, color_rgb: Tuple[int, int, int], thickness: int) -> None:
+        self.commands.append(OverlayText(text, position_percent, offset_px, font_scale, color_rgb, thickness))
+
+    def draw(self, frame: Any, frame_size: Vector) -> None:
+        for command in self.commands:
+            command.draw(frame, frame_size)
+
+class OverlayCommand:
+    def draw(self, frame: Any, frame_size: Vector) -> None:
+        raise NotImplementedError()
+
+class OverlayLine(OverlayCommand):
+    def __init__(self, start_percent: Vector, end_percent: Vector, color_rgb: Tuple[int, int, int], thickness: int) -> None:
+        self.start_percent = start_percent
+        self.end_percent = end_percent
+        self.color_rgb = color_rgb
+        self.thickness = thickness
+
+    def draw(self, frame: Any, frame_size: Vector) -> None:
+        draw_line(frame, self.start_percent.scale(frame_size), self.end_percent.scale(frame_size), self.color_rgb, self.thickness)
+
+class OverlayCircle(OverlayCommand):
+    def __init__(self, center_percent: Vector, radius_px: float, radius_percent: float, color_rgb: Tuple[int, int, int], thickness: int) -> None:
+        self.center_percent = center_percent
+        self.radius_px = radius_px
+        self.radius_percent = radius_percent
+        self.color_rgb = color_rgb
+        self.thickness = thickness
+
+    def draw(self, frame: Any, frame_size: Vector) -> None:
+        draw_circle(frame, self.center_percent.scale(frame_size), self.radius_px + self.radius_percent * frame_size.x, self.color_rgb, self.thickness)
+
+class OverlayText(OverlayCommand):
+    def __init__(self, text: str, position_percent: Vector, offset_px: Vector, font_scale: float, color_rgb: Tuple[int, int, int], thickness: int) -> None:
+        self.text = text
+        self.position_percent = position_percent
+        self.offset_px = offset_px
+        self.font_scale = font_scale
+        self.color_rgb = color_rgb
+        self.thickness = thickness
+
+    def draw(self, frame: Any, frame_size: Vector) -> None:
+        put_text(frame, self.text, self.position_percent.scale(frame_size).add(self.offset_px), self.font_scale, self.color_rgb, self.thickness)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+import time
+from .LogHolder import LogHolder
+
+class FramePacer(LogHolder):
+    """ Paces a loop to a target frame rate using deadlines on a monotonic clock.
+    Only the remaining budget of an iteration is slept. When an iteration overruns its deadline,
+    the next deadline is scheduled relative to now instead of trying to catch up with a burst of iterations.
+    """
+    def __init__(self, fps: float) -> None:
+        super().__init__()
+        self.frame_interval_seconds = 0.0
+        self.next_deadline_seconds = time.monotonic()
+        self.iteration_count = 0
+        self.overrun_count = 0
+        self.total_overrun_seconds = 0.0
+        self.max_overrun_seconds = 0.0
+        self.total_sleep_seconds = 0.0
+        self.set_fps(fps)
+
+    def set_fps(self, fps: float) -> None:
+        # A non-positive fps disables pacing (run as fast as possible).
+        self.frame_interval_seconds = 1 / fps if fps > 0 else 0.0
+
+    def start(self) -> None:
+        self.next_deadline_seconds = time.monotonic() + self.frame_interval_seconds
+
+    def wait_for_next_frame(self) -> None:
+        self.iteration_count = self.iteration_count + 1
+        now_seconds = time.monotonic()
+        remaining_seconds = self.next_deadline_seconds - now_seconds
+        if remaining_seconds > 0:
+            time.sleep(remaining_seconds)
+            self.total_sleep_seconds = self.total_sleep_seconds + remaining_seconds
+            self.next_deadline_seconds = self.next_deadline_seconds + self.frame_interval_seconds
+        else:
+            overrun_seconds = -remaining_seconds
+            if self.frame_interval_seconds > 0:
+                self.overrun_count = self.overrun_count + 1
+                self.total_overrun_seconds = self.total_overrun_seconds + overrun_seconds
+                self.max_overrun_seconds = max(self.max_overrun_seconds, overrun_seconds)
+            self.next_deadline_seconds = now_seconds + self.frame_interval_seconds
+
+    def get_statistics_text(self) -> str:
+        overrun_percent = 100 * self.overrun_count / self.iteration_count if self.iteration_count > 0 else 0
+        mean_overrun_ms = 1000 * self.total_overrun_seconds / self.overrun_count if self.overrun_count > 0 else 0
+        return (f"iterations: {self.iteration_count}, "
+                f"overruns: {self.overrun_count} ({overrun_percent:.1f}%), "
+                f"mean overrun: {mean_overrun_ms:.1f} ms, "
+                f"max overrun: {1000 * self.max_overrun_seconds:.1f} ms, "
+                f"slept: {self.total_sleep_seconds:.1f} s")
+
+    def log_statistics(self) -> None:
+        self.log.info(f"frame pacing statistics: {self.get_statistics_text()}")
@@ -0,0 +1,37 @@
+from __future__ import annotations
+import time
+from .ReactiveProperty import ReactiveProperty
+
+class FrameRateCounter:
+    """ Measures the achieved frame rate of a loop. The current rate is updated about once per second. """
+    update_interval_seconds = 1.0
+
+    def __init__(self) -> None:
+        self.fps = ReactiveProperty(0.0)
+        self.start_time_seconds = time.monotonic()
+        self.interval_start_time_seconds = self.start_time_seconds
+        self.interval_frame_count = 0
+        self.frame_count = 0
+
+    def start(self) -> None:
+        self.start_time_seconds = time.monotonic()
+        self.interval_start_time_seconds = self.start_time_seconds
+        self.interval_frame_count = 0
+        self.frame_count = 0
+
+    def count_frame(self) -> None:
+        self.frame_count = self.frame_count + 1
+        self.interval_frame_count = self.interval_frame_count + 1
+        now_seconds = time.monotonic()
+        interval_seconds = now_seconds - self.interval_start_time_seconds
+        if interval_seconds >= self.update_interval_seconds:
+            self.fps.value = self.interval_frame_count / interval_seconds
+            self.interval_start_time_seconds = now_seconds
+            self.interval_frame_count = 0
+
+    def get_mean_fps(self) -> float:
+        duration_seconds = time.monotonic() - self.start_time_seconds
+        return self.frame_count / duration_seconds if duration_seconds > 0 else 0
+
+    def get_statistics_text(self) -> str:
+        return f"frames: {self.frame_count}, mean: {self.get_mean_fps():.1f} fps"
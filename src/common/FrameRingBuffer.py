@@ -0,0 +1,83 @@
+from __future__ import annotations
+from typing import Any, List, Optional
+import threading
+
+class FrameRingBuffer:
+    """ Small ring of reusable frame slots shared by one producer and one consumer.
+    The producer writes into a slot that is neither the newest published frame nor the frame that is currently analyzed.
+    The consumer always takes the newest frame. Frames that were published but never taken are counted as dropped.
+    """
+    def __init__(self, slot_count: int = 3) -> None:
+        if slot_count < 3:
+            raise ValueError("FrameRingBuffer needs at least 3 slots")
+        self.slots: List[Any] = [None] * slot_count
+        self.condition = threading.Condition()
+        self.latest_slot_index = -1
+        self.reading_slot_index = -1
+        self.next_write_slot_index = 0
+        self.published_frame_count = 0
+        self.taken_frame_count = 0
+        self.dropped_frame_count = 0
+        self.last_taken_sequence = 0
+        self.waiting_consumer_count = 0
+        self.is_closed = False
+
+    def get_write_slot_index(self) -> int:
+        with self.condition:
+            slot_index = self.next_write_slot_index
+            while slot_index in (self.latest_slot_index, self.reading_slot_index):
+                slot_index = (slot_index + 1) % len(self.slots)
+            self.next_write_slot_index = (slot_index + 1) % len(self.slots)
+            return slot_index
+
+    def get_slot(self, slot_index: int) -> Any:
+        # The frame that has been in the slot before. Can be reused as destination buffer, e.g. via cap.read(image=...).
+        return self.slots[slot_index]
+
+    def publish(self, slot_index: int, frame: Any) -> None:
+        with self.condition:
+            self.slots[slot_index] = frame
+            self.latest_slot_index = slot_index
+            self.published_frame_count = self.published_frame_count + 1
+            self.condition.notify_all()
+
+    def take_latest_frame(self, timeout_seconds: Optional[float] = None) -> Any:
+        """ Waits for a frame that has not been taken yet and returns the newest one (or None on timeout or close).
+        The returned frame stays valid until the next call of this method.
+        """
+        with self.condition:
+            self.waiting_consumer_count = self.waiting_consumer_count + 1
+            try:
+                has_new_frame = self.condition.wait_for(lambda: self.is_closed or self.published_frame_count > self.last_taken_sequence,
+                                                        timeout_seconds)
+            finally:
+                self.waiting_consumer_count = self.waiting_consumer_count - 1
+            if not has_new_frame or self.is_closed:
+                return None
+
+            self.dropped_frame_count = self.dropped_frame_count + (self.published_frame_count - self.last_taken_sequence - 1)
+            self.last_taken_sequence = self.published_frame_count
+            self.taken_frame_count = self.taken_frame_count + 1
+            self.reading_slot_index = self.latest_slot_index
+            # Wake a producer that waits until its frames are taken
+            self.condition.notify_all()
+            return self.slots[self.reading_slot_index]
+
+    def is_consumer_waiting(self) -> bool:
+        """ True if the consumer waits for a frame, i.e. a frame that is published now is analyzed right away. """
+        with self.condition:
+            return self.waiting_consumer_count > 0 and self.last_taken_sequence >= self.published_frame_count
+
+    def wait_until_taken(self, timeout_seconds: Optional[float] = None) -> bool:
+        """ Waits until all published frames have been taken. A producer that waits before publishing does not lose frames.
+        Returns False on timeout or close.
+        """
+        with self.condition:
+            is_taken = self.condition.wait_for(lambda: self.is_closed or self.last_taken_sequence >= self.published_frame_count,
+                                               timeout_seconds)
+            return is_taken and not self.is_closed
+
+    def close(self) -> None:
+        with self.condition:
+            self.is_closed = True
+            self.condition.notify_all()
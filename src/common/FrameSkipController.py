@@ -0,0 +1,52 @@
+from __future__ import annotations
+import math
+from .LogHolder import LogHolder
+from .ReactiveProperty import ReactiveProperty
+
+class FrameSkipController(LogHolder):
+    """ Decides to analyze only every Nth frame of the camera when the analysis cannot keep up with the frame rate.
+    Thus frames are analyzed in a steady rhythm instead of at random, overrunning deadlines.
+    The analysis time is smoothed, and the stride is only decreased when the analysis would fit with some margin.
+    """
+    smoothing_factor = 0.1
+    # The analysis must fit into this share of the shorter frame interval to decrease the stride
+    decrease_margin = 0.8
+    max_stride = 8
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.stride = ReactiveProperty(1)
+        self.mean_analysis_seconds = 0.0
+        self.stride_change_count = 0
+
+    def reset(self) -> None:
+        self.stride.value = 1
+        self.mean_analysis_seconds = 0.0
+
+    def update(self, analysis_seconds: float, fps: float) -> int:
+        """ Returns the stride, i.e. every how many camera frames one frame is analyzed. """
+        if self.mean_analysis_seconds <= 0:
+            self.mean_analysis_seconds = analysis_seconds
+        else:
+            self.mean_analysis_seconds = (self.mean_analysis_seconds * (1 - self.smoothing_factor)
+                                          + analysis_seconds * self.smoothing_factor)
+        if fps <= 0:
+            return self.stride.value
+
+        frame_interval_seconds = 1 / fps
+        stride = self.stride.value
+        if self.mean_analysis_seconds > stride * frame_interval_seconds:
+            stride = math.ceil(self.mean_analysis_seconds / frame_interval_seconds)
+        elif stride > 1 and self.mean_analysis_seconds < (stride - 1) * frame_interval_seconds * self.decrease_margin:
+            stride = stride - 1
+        stride = min(stride, self.max_stride)
+
+        if stride != self.stride.value:
+            self.stride_change_count = self.stride_change_count + 1
+            self.log.info(f"analyzing every {stride}. frame (mean analysis time: {1000 * self.mean_analysis_seconds:.1f} ms, camera: {fps:.0f} fps)")
+            self.stride.value = stride
+        return stride
+
+    def get_statistics_text(self) -> str:
+        return (f"stride: {self.stride.value}, stride changes: {self.stride_change_count}, "
+                f"mean analysis time: {1000 * self.mean_analysis_seconds:.1f} ms")
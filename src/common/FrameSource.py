@@ -0,0 +1,44 @@
+from __future__ import annotations
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Union
+import threading
+from .FrameRingBuffer import FrameRingBuffer
+from .LogHolder import LogHolder
+from .Vector import Vector
+from .frame_util import get_frame_size
+
+class FrameSource(LogHolder, ABC):
+    """ Base class of sources that produce frames on their own thread and publish them into a FrameRingBuffer. """
+    def __init__(self, frame_ring_buffer: FrameRingBuffer) -> None:
+        super().__init__()
+        self.frame_ring_buffer = frame_ring_buffer
+        self.is_running = False
+        # Set when the source currently fails to deliver frames. Reset on success.
+        self.error_message: Union[str, None] = None
+        # Set when the source has no more frames (e.g. end of a video file)
+        self.is_finished = False
+        self.thread = threading.Thread(target=self.run, name=self.__class__.__name__, daemon=True)
+
+    def start(self) -> None:
+        self.is_running = True
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.is_running = False
+        self.frame_ring_buffer.close()
+        if self.thread.is_alive() and threading.current_thread() is not self.thread:
+            self.thread.join()
+
+    @abstractmethod
+    def run(self) -> None:
+        pass
+
+    def request_capture_settings(self, capture_size: Vector, capture_fps: float, applied_callback: Callable[[bool], None]) -> bool:
+        """ Requests to change size and fps while running. Returns False if this is not supported by the source.
+        Otherwise the callback is called with the result on the thread of the source.
+        """
+        return False
+
+    def get_native_frame_size(self, frame: Any) -> Vector:
+        # Sources that decode at a reduced resolution return the size before the reduction
+        return get_frame_size(frame)
@@ -0,0 +1,100 @@
+from __future__ import annotations
+from typing import Any, List
+import numpy as np
+from .GestureRule import GestureAction
+from .Vector import Vector
+
+class GestureClassifier:
+    """ Nearest-centroid classifier of hand poses, as alternative to the conditions of the gesture rules.
+    Each class has a few centroids of normalised landmark features (see get_landmark_features).
+    The nearest centroid is the one with the largest features * centroid - |centroid|^2 / 2,
+    thus a frame is classified with one matrix multiply.
+    Classes are named by GestureAction, or none_class_name for hands that show no gesture.
+    """
+    none_class_name = "NONE"
+    # Landmarks 1 to 20 relative to the wrist, xy
+    feature_count = 40
+    middle_finger_knuckle_index = 9
+
+    def __init__(self, class_names: List[str], centroids: Any, centroid_class_indexes: Any) -> None:
+        for class_name in class_names:
+            if class_name != self.none_class_name and class_name not in GestureAction.__members__:
+                raise GestureClassifierException(f"unknown gesture class '{class_name}'. Expected {self.none_class_name} or one of {[action.name for action in GestureAction]}")
+        if self.none_class_name not in class_names:
+            raise GestureClassifierException(f"the class {self.none_class_name} is needed for hands that show no gesture")
+        if centroids.ndim != 2 or centroids.shape[1] != self.feature_count:
+            raise GestureClassifierException(f"centroids must have shape (n, {self.feature_count}), not {centroids.shape}")
+
+        self.class_names = class_names
+        self.centroids = centroids.astype(np.float32)
+        self.centroid_class_indexes = centroid_class_indexes.astype(np.int64)
+        self.weights = self.centroids
+        self.biases = -0.5 * np.einsum("ij,ij->i", self.centroids, self.centroids)
+        # GestureAction value of each centroid, -1 for the none class
+        class_action_values = np.array([GestureAction[class_name].value if class_name != self.none_class_name else -1
+                                        for class_name in class_names], dtype=np.int64)
+        self.centroid_action_values = class_action_values[self.centroid_class_indexes].tolist()
+        # Actions that are decided by the classifier instead of gesture rule conditions
+        self.actions = [GestureAction[class_name] for class_name in class_names if class_name != self.none_class_name]
+
+    def classify(self, features: Any) -> Any:
+        """ Returns the class index of each row of features. """
+        return self.centroid_class_indexes[np.argmax(features @ self.weights.T + self.biases, axis=-1)]
+
+    def classify_action_value(self, features: Any) -> int:
+        """ Returns the GestureAction value of the features of a single hand, -1 for no gesture. """
+        return self.centroid_action_values[int(np.argmax(self.weights @ features + self.biases))]
+
+    def save(self, file_path: str) -> None:
+        np.savez(file_path,
+                 class_names=np.array(self.class_names),
+                 centroids=self.centroids,
+                 centroid_class_indexes=self.centroid_class_indexes)
+
+    @staticmethod
+    def load(file_path: str) -> GestureClassifier:
+        with np.load(file_path, allow_pickle=False) as data:
+            return GestureClassifier(data["class_names"].tolist(), data["centroids"], data["centroid_class_indexes"])
+
+    @staticmethod
+    def train(features: Any, class_indexes: Any, class_names: List[str], centroids_per_class: int, seed: int = 0) -> GestureClassifier:
+        """ Clusters the features of each class with k-means. Features are rows, class_indexes index class_names. """
+        random = np.random.default_rng(seed)
+        centroids = []
+        centroid_class_indexes = []
+        for class_index, class_name in enumerate(class_names):
+            class_features = features[class_indexes == class_index]
+            if len(class_features) == 0:
+                raise GestureClassifierException(f"no training frames for class '{class_name}'")
+            class_centroids = get_k_means_centroids(class_features, min(centroids_per_class, len(class_features)), random)
+            centroids.append(class_centroids)
+            centroid_class_indexes.extend([class_index] * len(class_centroids))
+        return GestureClassifier(class_names, np.concatenate(centroids), np.array(centroid_class_indexes))
+
+def get_landmark_features(landmarks: Any, capture_size: Any) -> Any:
+    """ Normalised features of hands. landmarks have shape (..., 21, 3) in percent of the frame, capture_size has shape (..., 2).
+    Positions are in pixels relative to the wrist, scaled by the distance from the wrist to the knuckle of the middle finger.
+    Thus the features do not depend on the position and size of the hand in the frame, but on its orientation (e.g. thumb up or down).
+    """
+    landmarks_xy = landmarks[..., :2] * np.asarray(capture_size, dtype=np.float32)[..., np.newaxis, :]
+    relative_xy = landmarks_xy[..., 1:, :] - landmarks_xy[..., :1, :]
+    hand_size = np.linalg.norm(relative_xy[..., GestureClassifier.middle_finger_knuckle_index - 1, :], axis=-1)
+    features = relative_xy / np.maximum(hand_size, 1e-6)[..., np.newaxis, np.newaxis]
+    return features.reshape(features.shape[:-2] + (GestureClassifier.feature_count,))
+
+def get_capture_size_array(capture_size: Vector) -> Any:
+    return np.array([capture_size.x, capture_size.y], dtype=np.float32)
+
+def get_k_means_centroids(features: Any, centroid_count: int, random: Any, iteration_count: int = 20) -> Any:
+    centroids = features[random.choice(len(features), centroid_count, replace=False)]
+    for _ in range(iteration_count):
+        distances = ((features[:, np.newaxis, :] - centroids[np.newaxis, :, :]) ** 2).sum(axis=2)
+        nearest_centroid_indexes = np.argmin(distances, axis=1)
+        for centroid_index in range(centroid_count):
+            cluster_features = features[nearest_centroid_indexes == centroid_index]
+            if len(cluster_features) > 0:
+                centroids[centroid_index] = cluster_features.mean(axis=0)
+    return centroids
+
+class GestureClassifierException(Exception):
+    pass
@@ -0,0 +1,33 @@
+from __future__ import annotations
+from .Config import Config
+
+class GestureEvaluationPlan:
+    """ Which gesture families are evaluated for the current config.
+    Gestures whose mouse actions would be ignored anyway (e.g. clicks while click control is off) are not computed.
+    When nothing is controlled, frames are only analyzed at a low rate (standby).
+    """
+    # Analysis frame rate in standby. The preview is still updated, at this rate.
+    standby_fps = 5
+
+    def __init__(self, is_mouse_position: bool, is_click: bool, is_scroll: bool) -> None:
+        self.is_mouse_position = is_mouse_position
+        self.is_click = is_click
+        self.is_scroll = is_scroll
+        self.is_standby = not (is_mouse_position or is_click or is_scroll)
+
+    @staticmethod
+    def from_config(config: Config) -> GestureEvaluationPlan:
+        if config.is_all_control_disabled.value:
+            return GestureEvaluationPlan(False, False, False)
+        return GestureEvaluationPlan(config.is_control_mouse_position.value,
+                                     config.is_control_click.value,
+                                     config.is_control_scroll.value)
+
+    def __repr__(self) -> str:
+        if self.is_standby:
+            return "standby"
+        families = [name for name, is_evaluated in [("mouse position", self.is_mouse_position),
+                                                    ("click", self.is_click),
+                                                    ("scroll", self.is_scroll)]
+                    if is_evaluated]
+        return ", ".join(families)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from typing import Any, Callable
+import math
+import numpy as np
+from .HandFeatures import HandFeatures
+from .HandFingerPositions import HandFingerPositions
+
+class GesturePredicateCache:
+    """ Reuses the results of the tip distance predicates (e.g. tip of the index finger near tip of the thumb) across frames.
+    Such a result only changes when a tip distance crosses the near or faraway threshold.
+    When a result is computed, its margin is kept: the smallest difference between a tip distance and a threshold.
+    If no tip moved more than m along x and y since then, no tip distance changed more than 2 * sqrt(2) * m.
+    Thus the result is reused while the tips moved less than margin / (2 * sqrt(2)), which gives the same result as computing it again.
+    The joint order is always computed, as the order of two joints can change with any movement.
+    """
+    # Change of a tip distance per movement of both tips along x and y
+    max_distance_change_per_movement = 2 * math.sqrt(2)
+    # Subtracted from the margin, for the rounding errors of the distances
+    rounding_error = 1e-12
+
+    def __init__(self, is_enabled_getter: Callable[[], bool]) -> None:
+        self.is_enabled_getter = is_enabled_getter
+        self.is_enabled = False
+        # XY positions of the finger tips in the current frame, in percent of the frame size
+        self.tips_xy: Any = None
+
+        # Finger tips near or faraway the thumb tip, which disables the mouse positioning
+        thumb_pair_mask = np.zeros((HandFeatures.finger_count, HandFeatures.finger_count), dtype=bool)
+        thumb_pair_mask[HandFeatures.thumb, HandFeatures.index_finger:] = True
+        self.mouse_positioning_trigger_entry = GesturePredicateCacheEntry("mouse positioning trigger", thumb_pair_mask)
+        # Distance atoms of the gesture rules (see GestureRuleEngine). The distance of a tip to itself is always 0.
+        self.distance_atoms_entry = GesturePredicateCacheEntry("tip distance atoms", ~np.eye(HandFeatures.finger_count, dtype=bool))
+        self.entries = [self.mouse_positioning_trigger_entry, self.distance_atoms_entry]
+
+    def begin_frame(self, hand_finger_positions: HandFingerPositions) -> None:
+        self.is_enabled = self.is_enabled_getter()
+        if not self.is_enabled:
+            return
+        self.tips_xy = hand_finger_positions.percent[HandFeatures.tip_indexes, :2]
+
+    def get_or_compute(self,
+            entry: GesturePredicateCacheEntry,
+            hand_features: HandFeatures,
+            near_distance: float,
+            faraway_distance: float,
+            compute: Callable[[], Any]) -> Any:
+        """ Returns the result of the entry, which compares tip distances with the thresholds.
+        It is only computed if the tips moved too far for the margin of the previous result, or if the thresholds changed.
+        """
+        if not self.is_enabled:
+            return compute()
+
+        entry.lookup_count = entry.lookup_count + 1
+        if (entry.near_distance == near_distance
+                and entry.faraway_distance == faraway_distance
+                and np.abs(self.tips_xy - entry.reference_tips_xy).max() < entry.max_movement):
+            entry.hit_count = entry.hit_count + 1
+            return entry.value
+
+        entry.value = compute()
+        hand_features.compute_tip_distances()
+        tip_distances = hand_features.tip_distances[entry.pair_mask]
+        margin = min(np.abs(tip_distances - near_distance).min(), np.abs(tip_distances - faraway_distance).min())
+        entry.max_movement = (margin - self.rounding_error) / self.max_distance_change_per_movement
+        entry.reference_tips_xy = self.tips_xy
+        entry.near_distance = near_distance
+        entry.faraway_distance = faraway_distance
+        return entry.value
+
+    def get_statistics_text(self) -> str:
+        entry_texts = [entry.get_statistics_text() for entry in self.entries if entry.lookup_count > 0]
+        return ", ".join(entry_texts) if entry_texts else "no lookups"
+
+class GesturePredicateCacheEntry:
+    def __init__(self, name: str, pair_mask: Any) -> None:
+        self.name = name
+        # Pairs of fingers (finger x finger) whose tip distances the result depends on
+        self.pair_mask = pair_mask
+        self.value: Any = None
+        self.near_distance = -1.0
+        self.faraway_distance = -1.0
+        self.reference_tips_xy = np.zeros((HandFeatures.finger_count, 2))
+        # Max. movement of the tips along x and y, in percent of the frame size, for which the value is reused.
+        # Negative if the value must not be reused.
+        self.max_movement = -1.0
+        self.lookup_count = 0
+        self.hit_count = 0
+
+    def get_statistics_text(self) -> str:
+        hit_percent = 100 * self.hit_count / self.lookup_count if self.lookup_count > 0 else 0
+        return f"{self.name} reused: {self.hit_count} of {self.lookup_count} ({hit_percent:.1f}%)"
@@ -1,22 +1,38 @@
 from __future__ import annotations
-from enum import Enum
-from typing import Any, List, Union
-import mediapipe # type: ignore
+from typing import Any, Callable, List, Tuple, Union
+import numpy as np
+import os
+import time
 import common.AppContext as AppContext
 from .LogHolder import LogHolder
+from .ArrayHandLandmarks import mirror_hand_landmarks
 from .Config import MousePositioningMode
 from .Config import DisableMousePositioningTrigger
-from .util import all_decreasing, all_increasing, get_min_element, get_max_element, get_time_ms, get_elements_except, limit_float
-from .draw_util import put_text
+from .util import get_time_ms, limit_float
 from .MouseControl import MouseButton
 from .ReactiveProperty import ReactiveProperty
 from .Vector import Vector
+from .HandFeatures import HandFeatures
 from .HandFingerPositions import HandFingerPositions
-from .FingerPosition import FingerPosition
-from .SignalFlankRecognizer import SignalFlankRecognizer
-from .SignalHoldRecognizer import SignalHoldRecognizer
+from .DropOldestQueue import DropOldestQueue
+from .FrameOverlay import FrameOverlay
+from .GestureClassifier import GestureClassifier, get_capture_size_array, get_landmark_features
+from .GestureEvaluationPlan import GestureEvaluationPlan
+from .GesturePredicateCache import GesturePredicateCache
+from .GestureRule import GestureAction, GestureRule, get_default_gesture_rules
+from .GestureRuleEngine import GestureRuleEngine, GestureRuleException
+from .GestureStateMachine import GestureStateMachine
+from .HandRegionTracker import HandRegionTracker
+from .InferenceQualityController import InferenceQualityController
+from .InferenceWorker import InferenceWorker
+from .LandmarkRecorder import LandmarkRecorder
+from .MotionGate import MotionGate
+from .mediapipe_util import create_mediapipe_hands, get_supported_hands_option_names
+from .StageTimer import StageTimer
 
 class GestureRecognizer(LogHolder):
+    no_classified_actions: List[GestureAction] = []
+
     wrist_index = 0
     thumb_finger_indexes = [1, 2, 3, 4]
     index_finger_indexes = [5, 6, 7, 8]
@@ -30,7 +46,34 @@ class GestureRecognizer(LogHolder):
         self.config = app_context.config
         self.mouse_control = app_context.mouse_control
 
-        self.mediapipe_hands = mediapipe.solutions.hands.Hands(max_num_hands=1)
+        # Lowers the quality of the hand tracking when it takes too long
+        self.inference_quality_controller = InferenceQualityController(lambda: self.config.inference_time_budget_ms.value,
+                                                                       get_supported_hands_option_names())
+        self.mediapipe_hands_level = self.inference_quality_controller.get_level()
+        self.mediapipe_hands = create_mediapipe_hands(self.mediapipe_hands_level.get_hands_options())
+        # Runs mediapipe in a separate process if enabled
+        self.inference_worker = InferenceWorker(self.mediapipe_hands_level.get_hands_options())
+        self.hand_region_tracker = HandRegionTracker(lambda: self.config.hand_region_margin.value)
+        self.config.is_hand_region_tracking.subscribe(lambda new_value: self.hand_region_tracker.reset())
+        self.motion_gate = MotionGate(lambda: self.config.motion_gate_threshold.value,
+                                      lambda: self.config.motion_gate_recheck_interval_ms.value)
+        self.config.is_motion_gate.subscribe(lambda new_value: self.motion_gate.reset())
+        self.was_hand_present_last_frame = False
+        self.landmark_recorder: Union[LandmarkRecorder, None] = None
+        # What should be drawn onto the preview of the last frame
+        self.frame_overlay = FrameOverlay()
+        # Mouse actions are performed on the output stage of the AnalysisPipeline if set
+        self.mouse_action_queue: Union[DropOldestQueue, None] = None
+
+        # Only the gestures of enabled controls are evaluated.
+        # The plan is replaced on config changes and applied on the analysis thread.
+        self.evaluation_plan = GestureEvaluationPlan.from_config(self.config)
+        self.applied_evaluation_plan = self.evaluation_plan
+        for control_property in [self.config.is_control_mouse_position,
+                                 self.config.is_control_click,
+                                 self.config.is_control_scroll,
+                                 self.config.is_all_control_disabled]:
+            control_property.subscribe(lambda new_value: self.update_evaluation_plan())
 
         self.is_potential_left_click_gesture = False
         self.last_index_near_thumb_gesture_time_ms = 0
@@ -58,101 +101,328 @@ class GestureRecognizer(LogHolder):
         self.jitter_pause_time_ms = ReactiveProperty(0.0)
         self.last_frame_analysis_time_ms = get_time_ms()
 
-        # gesture flank recognizers
-        self.index_near_thumb_flank_recognizer = SignalFlankRecognizer(False)
-        self.middle_and_ring_near_thumb_flank_recognizer = SignalFlankRecognizer(False)
-        self.ring_and_pinky_near_thumb_flank_recognizer = SignalFlankRecognizer(False)
-
-        # left click gesture
-        self.left_click_gesture_recognizer = SignalHoldRecognizer(self.index_near_thumb_flank_recognizer, lambda: self.config.click_delay_ms.value)
-        self.left_click_gesture_recognizer.hold_high_event_stream.subscribe(self.on_left_click_gesture_change)
-
-        # double click gesture
-        self.index_near_thumb_flank_recognizer.rising_flank_event_stream.subscribe(self.on_index_near_thumb_rising_flank)
-
-        # drag gesture
-        self.drag_gesture_recognizer = SignalHoldRecognizer(self.index_near_thumb_flank_recognizer, lambda: self.config.click_delay_ms.value + self.config.drag_start_click_delay_ms.value)
-        self.drag_gesture_recognizer.hold_high_event_stream.subscribe(self.on_drag_gesture_change)
-
-        # right click gesture
-        self.right_click_gesture_recognizer = SignalHoldRecognizer(self.middle_and_ring_near_thumb_flank_recognizer, lambda: self.config.click_delay_ms.value)
-        self.right_click_gesture_recognizer.hold_high_event_stream.subscribe(self.on_right_click_gesture_change)
-
-        # middle click gesture
-        self.middle_click_gesture_recognizer = SignalHoldRecognizer(self.ring_and_pinky_near_thumb_flank_recognizer, lambda: self.config.click_delay_ms.value)
-        self.middle_click_gesture_recognizer.hold_high_event_stream.subscribe(self.on_middle_click_gesture_change)
+        # Gestures are defined by rules in the config, which are evaluated together.
+        # The engine is replaced on config changes and applied on the analysis thread.
+        self.gesture_rule_engine = self.create_gesture_rule_engine(self.config.gesture_rules.value)
+        self.applied_gesture_rule_engine = self.gesture_rule_engine
+        self.config.gesture_rules.subscribe(self.update_gesture_rules)
+        self.action_hold_duration_ms = self.get_action_hold_duration_ms()
+        self.config.click_delay_ms.subscribe(lambda new_value: self.update_action_hold_duration_ms())
+        self.config.drag_start_click_delay_ms.subscribe(lambda new_value: self.update_action_hold_duration_ms())
+        # Results of the tip distance predicates are reused while the finger tips are far from the thresholds
+        self.gesture_predicate_cache = GesturePredicateCache(lambda: self.config.is_gesture_predicate_cache.value)
+        # Optionally recognizes gestures instead of the conditions of their rules
+        self.gesture_classifier: Union[GestureClassifier, None] = None
+        self.config.is_gesture_classifier.subscribe_and_run(lambda new_value: self.update_gesture_classifier())
+        self.config.gesture_classifier_file_path.subscribe(lambda new_value: self.update_gesture_classifier())
+        # Flanks in the first pass, hold starts in the second pass (after the click count has been reset)
+        self.flank_events = (GestureStateMachine.rising_flank_event
+                             | GestureStateMachine.falling_flank_event
+                             | GestureStateMachine.hold_high_end_event
+                             | GestureStateMachine.hold_low_end_event)
+        self.hold_start_events = GestureStateMachine.hold_high_start_event | GestureStateMachine.hold_low_start_event
+        # Handlers per action and GestureStateMachine event
+        self.gesture_event_handlers = {
+            # left click and double click gesture
+            (GestureAction.LEFT_CLICK, GestureStateMachine.rising_flank_event): lambda: self.on_index_near_thumb_rising_flank(True),
+            (GestureAction.LEFT_CLICK, GestureStateMachine.hold_high_start_event): lambda: self.on_left_click_gesture_change(True),
+            # drag gesture
+            (GestureAction.DRAG, GestureStateMachine.hold_high_start_event): lambda: self.on_drag_gesture_change(True),
+            (GestureAction.DRAG, GestureStateMachine.hold_high_end_event): lambda: self.on_drag_gesture_change(False),
+            # right click gesture
+            (GestureAction.RIGHT_CLICK, GestureStateMachine.hold_high_start_event): lambda: self.on_right_click_gesture_change(True),
+            # middle click gesture
+            (GestureAction.MIDDLE_CLICK, GestureStateMachine.hold_high_start_event): lambda: self.on_middle_click_gesture_change(True),
+        }
+
+    def process_frame(self, frame: Any, stage_timer: Union[StageTimer, None] = None) -> Union[HandFingerPositions, None]:
+        multi_hand_landmarks = self.detect_hand_landmarks(frame)
+        if stage_timer:
+            stage_timer.mark("inference")
+        self.record_hand_landmarks(multi_hand_landmarks)
+        hand_finger_positions = self.process_multi_hand_landmarks(multi_hand_landmarks)
+        if stage_timer:
+            stage_timer.mark("gestures")
+        return hand_finger_positions
 
-    def process_frame(self, frame: Any) -> Union[HandFingerPositions, None]:
+    def process_multi_hand_landmarks(self, multi_hand_landmarks: Any) -> Union[HandFingerPositions, None]:
+        """ Recognizes gestures from the landmarks of a frame (which have already been mirrored if needed). """
         hand_finger_positions = None
-        mediapipe_results = self.mediapipe_hands.process(frame)
+        self.frame_overlay.clear()
         delta_time_ms = get_time_ms() - self.last_frame_analysis_time_ms
-        if mediapipe_results.multi_hand_landmarks and len(mediapipe_results.multi_hand_landmarks) > 0:
+        if multi_hand_landmarks and len(multi_hand_landmarks) > 0:
             if (self.jitter_pause_time_ms.value > 0):
                 # ignore finger positions until it is more stable
                 self.jitter_pause_time_ms.value = self.jitter_pause_time_ms.value - delta_time_ms
             else:
-                hand_finger_positions = self.process_hand_landmarks(frame, mediapipe_results.multi_hand_landmarks)
+                hand_finger_positions = self.process_hand_landmarks(multi_hand_landmarks)
         else:
             self.jitter_pause_time_ms.value = limit_float(self.jitter_pause_time_ms.value + (delta_time_ms * 3), 0, self.config.max_jitter_pause_time_ms.value)
             if self.jitter_pause_time_ms.value > 0.4:
-                self.mouse_control.last_mouse_position = None
+                self.run_mouse_action(self.mouse_control.reset_last_mouse_position)
 
         self.last_frame_analysis_time_ms = get_time_ms()
         return hand_finger_positions
 
-    def process_hand_landmarks(self, frame: Any, multi_hand_landmarks: Any) -> HandFingerPositions:
+    def detect_hand_landmarks(self, frame: Any) -> Any:
+        # Skip inference on a static scene without hand, it is only re-checked from time to time
+        if (self.config.is_motion_gate.value
+                and not self.motion_gate.is_inference_needed(frame, self.was_hand_present_last_frame, get_time_ms())):
+            return None
+
+        multi_hand_landmarks = self.detect_hand_landmarks_with_mediapipe(frame)
+        self.was_hand_present_last_frame = bool(multi_hand_landmarks)
+
+        # The frame is analyzed unmirrored. Mirroring the landmarks is far cheaper than mirroring the frame.
+        # Note that the hand region of the next frame has been determined from the unmirrored landmarks.
+        if multi_hand_landmarks and self.config.capture_flip.value:
+            for single_hand_landmarks in multi_hand_landmarks:
+                mirror_hand_landmarks(single_hand_landmarks)
+        return multi_hand_landmarks
+
+    def detect_hand_landmarks_with_mediapipe(self, frame: Any) -> Any:
+        if not self.config.is_hand_region_tracking.value:
+            return self.process_with_mediapipe(frame)
+
+        # Only analyze the region around the hand of the last frame
+        crop_region = self.hand_region_tracker.get_crop_region(frame)
+        multi_hand_landmarks = self.process_with_mediapipe(self.hand_region_tracker.crop(frame))
+        if multi_hand_landmarks and crop_region:
+            for single_hand_landmarks in multi_hand_landmarks:
+                self.hand_region_tracker.to_frame_landmarks(single_hand_landmarks, crop_region)
+        self.hand_region_tracker.update(multi_hand_landmarks[0] if multi_hand_landmarks else None)
+        return multi_hand_landmarks
+
+    def process_with_mediapipe(self, frame: Any) -> Any:
+        start_time_seconds = time.perf_counter()
+        if self.config.is_inference_worker.value:
+            multi_hand_landmarks = self.inference_worker.process_frame(frame)
+        else:
+            self.stop_inference_worker()
+            multi_hand_landmarks = self.get_mediapipe_hands().process(frame).multi_hand_landmarks
+        self.update_inference_quality(1000 * (time.perf_counter() - start_time_seconds))
+        return multi_hand_landmarks
+
+    def get_mediapipe_hands(self) -> Any:
+        # Changing the options requires a new instance
+        level = self.inference_quality_controller.get_level()
+        if level is not self.mediapipe_hands_level:
+            self.mediapipe_hands.close()
+            self.mediapipe_hands = create_mediapipe_hands(level.get_hands_options())
+            self.mediapipe_hands_level = level
+        return self.mediapipe_hands
+
+    def update_inference_quality(self, inference_time_ms: float) -> None:
+        if self.config.is_adaptive_inference_quality.value:
+            is_level_changed = self.inference_quality_controller.update(inference_time_ms, get_time_ms())
+        else:
+            is_level_changed = self.inference_quality_controller.reset()
+        if is_level_changed:
+            self.inference_worker.set_hands_options(self.inference_quality_controller.get_level().get_hands_options())
+
+    def get_inference_size(self) -> Vector:
+        return self.inference_quality_controller.get_inference_size(self.config.inference_size.value)
+
+    def stop_inference_worker(self) -> None:
+        if self.inference_worker.process is not None:
+            self.inference_worker.stop()
+
+    def record_hand_landmarks(self, multi_hand_landmarks: Any) -> None:
+        # The recorder is opened and closed on this thread, thus the config can be changed from any thread.
+        if self.config.is_landmark_recording.value and not self.landmark_recorder:
+            os.makedirs(self.config.landmark_recording_directory.value, exist_ok=True)
+            file_name = time.strftime("landmarks-%Y%m%d-%H%M%S.npy")
+            self.landmark_recorder = LandmarkRecorder(os.path.join(self.config.landmark_recording_directory.value, file_name))
+        elif not self.config.is_landmark_recording.value and self.landmark_recorder:
+            self.stop_landmark_recording()
+
+        if self.landmark_recorder:
+            self.landmark_recorder.add_record(get_time_ms(),
+                                              multi_hand_landmarks[0] if multi_hand_landmarks else None,
+                                              self.app_context.webcam_control.actual_capture_size)
+
+    def stop_landmark_recording(self) -> None:
+        if self.landmark_recorder:
+            self.landmark_recorder.close()
+            self.landmark_recorder = None
+
+    def log_statistics(self) -> None:
+        self.log.info(f"hand region statistics: {self.hand_region_tracker.get_statistics_text()}")
+        self.log.info(f"motion gate statistics: {self.motion_gate.get_statistics_text()}")
+        self.log.info(f"inference quality statistics: {self.inference_quality_controller.get_statistics_text()}")
+        if self.config.is_inference_worker.value:
+            self.log.info(f"inference worker statistics: {self.inference_worker.get_statistics_text()}")
+        self.log.info(f"gesture predicate cache statistics: {self.gesture_predicate_cache.get_statistics_text()}")
+
+    def run_mouse_action(self, mouse_action: Callable[[], None]) -> None:
+        if self.mouse_action_queue is not None:
+            self.mouse_action_queue.put(mouse_action)
+        else:
+            mouse_action()
+
+    def create_gesture_rule_engine(self, gesture_rules: List[GestureRule]) -> GestureRuleEngine:
+        try:
+            return GestureRuleEngine(gesture_rules)
+        except GestureRuleException as e:
+            self.log.exception(e)
+            self.log.warning("using default gesture rules")
+            return GestureRuleEngine(get_default_gesture_rules())
+
+    def update_gesture_rules(self, gesture_rules: List[GestureRule]) -> None:
+        try:
+            self.gesture_rule_engine = GestureRuleEngine(gesture_rules)
+        except GestureRuleException as e:
+            self.log.exception(e)
+            self.log.warning("keeping previous gesture rules")
+
+    def apply_gesture_rules(self, current_time_ms: int) -> GestureRuleEngine:
+        """ Ends the gestures of the previous rules, e.g. such that a drag is ended, and evaluates the changed rules from now on. """
+        gesture_rule_engine = self.gesture_rule_engine
+        if gesture_rule_engine is self.applied_gesture_rule_engine:
+            return gesture_rule_engine
+
+        previous_gesture_rule_engine = self.applied_gesture_rule_engine
+        gesture_events = previous_gesture_rule_engine.update(np.zeros_like(previous_gesture_rule_engine.signals),
+                                                             self.action_hold_duration_ms,
+                                                             current_time_ms)
+        self.dispatch_gesture_events(gesture_events, self.flank_events)
+        self.applied_gesture_rule_engine = gesture_rule_engine
+        return gesture_rule_engine
+
+    def update_gesture_classifier(self) -> None:
+        gesture_classifier = None
+        if self.config.is_gesture_classifier.value:
+            file_path = self.config.gesture_classifier_file_path.value
+            try:
+                gesture_classifier = GestureClassifier.load(file_path)
+                self.log.info(f"loaded gesture classifier from '{file_path}' (classes: {gesture_classifier.class_names})")
+            except Exception:
+                self.log.exception(f"could not load gesture classifier from '{file_path}'. Using gesture rules instead.")
+        self.gesture_classifier = gesture_classifier
+
+    def get_action_hold_duration_ms(self) -> Any:
+        """ Hold duration of each GestureAction, indexed by its value. """
+        click_delay_ms = self.config.click_delay_ms.value
+        action_hold_duration_ms = np.full(len(GestureAction), click_delay_ms, dtype=np.int64)
+        action_hold_duration_ms[GestureAction.DRAG.value] = click_delay_ms + self.config.drag_start_click_delay_ms.value
+        return action_hold_duration_ms
+
+    def update_action_hold_duration_ms(self) -> None:
+        self.action_hold_duration_ms = self.get_action_hold_duration_ms()
+
+    def dispatch_gesture_events(self, gesture_events: List[Tuple[GestureRule, int]], event_mask: int) -> None:
+        for rule, events in gesture_events:
+            for event in GestureStateMachine.event_flags:
+                if events & event & event_mask:
+                    handler = self.gesture_event_handlers.get((rule.action, event))
+                    if handler is not None:
+                        handler()
+
+    def update_evaluation_plan(self) -> None:
+        self.evaluation_plan = GestureEvaluationPlan.from_config(self.config)
+        self.log.info(f"evaluated gestures: {self.evaluation_plan}")
+
+    def apply_evaluation_plan(self, current_time_ms: int) -> GestureEvaluationPlan:
+        """ Resets the state of gesture families that are no longer evaluated, such that they start anew when enabled again. """
+        evaluation_plan = self.evaluation_plan
+        if evaluation_plan is self.applied_evaluation_plan:
+            return evaluation_plan
+
+        if not evaluation_plan.is_click and self.applied_evaluation_plan.is_click:
+            # Let the click gestures end, e.g. such that a drag is ended
+            gesture_rule_engine = self.applied_gesture_rule_engine
+            gesture_rule_engine.set_evaluation_plan(evaluation_plan)
+            gesture_events = gesture_rule_engine.update(gesture_rule_engine.signals & gesture_rule_engine.rule_mask,
+                                                        self.action_hold_duration_ms,
+                                                        current_time_ms)
+            self.dispatch_gesture_events(gesture_events, self.flank_events)
+            self.left_click_count = 0
+        if not evaluation_plan.is_scroll and self.applied_evaluation_plan.is_scroll:
+            self.start_scroll_time_ms = 0
+            self.was_thumb_up_last_frame = False
+            self.was_thumb_down_last_frame = False
+        self.applied_evaluation_plan = evaluation_plan
+        return evaluation_plan
+
+    def process_hand_landmarks(self, multi_hand_landmarks: Any) -> HandFingerPositions:
+        current_time_ms = get_time_ms()
+        evaluation_plan = self.apply_evaluation_plan(current_time_ms)
+        gesture_rule_engine = self.apply_gesture_rules(current_time_ms)
+
         # find landmark positions
         first_hand_landmarks = multi_hand_landmarks[0]
         hand_finger_positions = HandFingerPositions(first_hand_landmarks, self.app_context.webcam_control.actual_capture_size)
+        self.add_finger_position_overlay(hand_finger_positions)
+        # distances and joint order that the gestures are based on
+        hand_features = HandFeatures(hand_finger_positions)
+        predicate_cache = self.gesture_predicate_cache
+        predicate_cache.begin_frame(hand_finger_positions)
 
         # detect mouse position
-        self.detect_mouse_position(frame, hand_finger_positions)
-
-        # detect click gestures
-        current_time_ms = get_time_ms()
-        is_only_index_near_thumb = self.detect_index_near_thumb_gesture(hand_finger_positions)
-        self.detect_middle_and_ring_near_thumb_gesture(hand_finger_positions)
-        self.detect_ring_and_pinky_near_thumb_gesture(hand_finger_positions)
-
-        # reset click count
-        if (not is_only_index_near_thumb
-                and self.last_index_near_thumb_gesture_time_ms + self.config.double_click_max_pause_ms.value < current_time_ms):
-            self.left_click_count = 0
-
-        # detect scroll
-        self.detect_scoll(current_time_ms, hand_finger_positions)
-
-        # update hold gesture recognizers
-        self.left_click_gesture_recognizer.update(current_time_ms)
-        self.right_click_gesture_recognizer.update(current_time_ms)
-        self.middle_click_gesture_recognizer.update(current_time_ms)
-        self.drag_gesture_recognizer.update(current_time_ms)
+        if evaluation_plan.is_mouse_position:
+            self.detect_mouse_position(hand_finger_positions, hand_features, predicate_cache)
+
+        # detect click and scroll gestures
+        if evaluation_plan.is_click or evaluation_plan.is_scroll:
+            gesture_classifier = self.gesture_classifier
+            gesture_rule_engine.set_evaluation_plan(evaluation_plan)
+            gesture_rule_engine.set_classified_actions(gesture_classifier.actions if gesture_classifier is not None else self.no_classified_actions)
+            signals = gesture_rule_engine.evaluate(hand_features,
+                                                   self.config.click_distance_threshold_low_percent.value,
+                                                   self.config.click_distance_threshold_high_percent.value,
+                                                   predicate_cache)
+            if gesture_classifier is not None and gesture_rule_engine.is_any_rule_classified:
+                classified_action_value = self.classify_action_value(gesture_classifier, hand_finger_positions)
+                signals = gesture_rule_engine.apply_classified_action(signals, classified_action_value)
+            gesture_events = gesture_rule_engine.update(signals, self.action_hold_duration_ms, current_time_ms)
+            self.dispatch_gesture_events(gesture_events, self.flank_events)
+
+            # reset click count
+            if (evaluation_plan.is_click
+                    and not gesture_rule_engine.is_action_present(GestureAction.LEFT_CLICK)
+                    and self.last_index_near_thumb_gesture_time_ms + self.config.double_click_max_pause_ms.value < current_time_ms):
+                self.left_click_count = 0
+
+            # detect scroll
+            if evaluation_plan.is_scroll:
+                self.detect_scoll(current_time_ms,
+                                  gesture_rule_engine.is_action_present(GestureAction.SCROLL_UP),
+                                  gesture_rule_engine.is_action_present(GestureAction.SCROLL_DOWN))
+
+            self.dispatch_gesture_events(gesture_events, self.hold_start_events)
 
         return hand_finger_positions
 
-    def detect_mouse_position(self, frame: Any, hand_finger_positions: HandFingerPositions) -> None:
-        all_fingers_near_thumb = self.is_near_target([hand_finger_positions.index_tip_position,
-                                                      hand_finger_positions.middle_tip_position,
-                                                      hand_finger_positions.ring_tip_position,
-                                                      hand_finger_positions.pinky_tip_position],
-                                                     hand_finger_positions.thumb_tip_position)
-        all_fingers_faraway_thumb = self.is_faraway_target([hand_finger_positions.index_tip_position,
-                                                            hand_finger_positions.middle_tip_position,
-                                                            hand_finger_positions.ring_tip_position,
-                                                            hand_finger_positions.pinky_tip_position],
-                                                           hand_finger_positions.thumb_tip_position)
+    def classify_action_value(self, gesture_classifier: GestureClassifier, hand_finger_positions: HandFingerPositions) -> int:
+        landmark_features = get_landmark_features(hand_finger_positions.percent, get_capture_size_array(hand_finger_positions.capture_size))
+        return gesture_classifier.classify_action_value(landmark_features)
+
+    def detect_mouse_position(self,
+            hand_finger_positions: HandFingerPositions,
+            hand_features: HandFeatures,
+            predicate_cache: GesturePredicateCache) -> None:
+        all_fingers_near_thumb, all_fingers_faraway_thumb = predicate_cache.get_or_compute(predicate_cache.mouse_positioning_trigger_entry,
+                                                                                           hand_features,
+                                                                                           self.config.click_distance_threshold_low_percent.value,
+                                                                                           self.config.click_distance_threshold_high_percent.value,
+                                                                                           lambda: self.get_mouse_positioning_trigger_predicates(hand_features))
         if ((all_fingers_near_thumb and self.config.disable_mouse_positioning_trigger.value == DisableMousePositioningTrigger.ALL_FINGERS_NEAR_THUMB)
                 or (not all_fingers_near_thumb and self.config.disable_mouse_positioning_trigger.value == DisableMousePositioningTrigger.ANY_FINGER_FARAWAY_THUMB)
                 or (all_fingers_faraway_thumb and self.config.disable_mouse_positioning_trigger.value == DisableMousePositioningTrigger.ALL_FINGERS_FARAWAY_THUMB)):
-            self.mouse_control.last_mouse_position = None
+            self.run_mouse_action(self.mouse_control.reset_last_mouse_position)
             return
 
         if (self.config.motion_border_left.value + self.config.motion_border_right.value < 1
                 and self.config.motion_border_bottom.value + self.config.motion_border_top.value < 1):
-            mouse_pos_px = self.get_mouse_position_px(hand_finger_positions.wrist_position.percent, frame)
-            self.mouse_control.on_new_mouse_position_detected(mouse_pos_px)
+            mouse_pos_px = self.get_mouse_position_px(hand_finger_positions.get_percent_vector(HandFingerPositions.wrist_index))
+            self.run_mouse_action(lambda: self.mouse_control.on_new_mouse_position_detected(mouse_pos_px))
+
+    def get_mouse_positioning_trigger_predicates(self, hand_features: HandFeatures) -> Tuple[bool, bool]:
+        """ Returns whether all fingers are near the thumb and whether all fingers are faraway the thumb. """
+        all_fingers = [HandFeatures.index_finger, HandFeatures.middle_finger, HandFeatures.ring_finger, HandFeatures.pinky_finger]
+        return self.is_near_thumb(hand_features, all_fingers), self.is_faraway_thumb(hand_features, all_fingers)
 
-    def get_mouse_position_px(self, screen_pos_percent: Vector, frame: Any) -> Vector:
+    def get_mouse_position_px(self, screen_pos_percent: Vector) -> Vector:
         pos_percent_x = (screen_pos_percent.x - self.config.motion_border_left.value) / (1 - self.config.motion_border_left.value - self.config.motion_border_right.value)
         pos_percent_x = max(0, min(1, pos_percent_x))
         pos_percent_y = (screen_pos_percent.y - self.config.motion_border_top.value) / (1 - self.config.motion_border_top.value - self.config.motion_border_bottom.value)
@@ -160,23 +430,36 @@ class GestureRecognizer(LogHolder):
         mouse_x = int(self.config.screen_offset.value.x + self.config.screen_size.value.x * pos_percent_x)
         mouse_y = int(self.config.screen_offset.value.y + self.config.screen_size.value.y * pos_percent_y)
 
-        screen_pos_px = screen_pos_percent.scale(self.config.capture_size.value).add(Vector(10, 10))
         if self.config.mouse_positioning_mode.value == MousePositioningMode.ABSOLUTE:
             pos_text = f"{pos_percent_x * 100:.0f}% ({mouse_x}px) | {pos_percent_y * 100:.0f}% ({mouse_y}px)"
-            put_text(frame, pos_text, screen_pos_px, 1.5, (255, 255, 255), 2)
+            self.frame_overlay.add_text(pos_text, screen_pos_percent, Vector(10, 10), 1.5, (255, 255, 255), 2)
         
         return Vector(mouse_x, mouse_y, 0)
 
+    def add_finger_position_overlay(self, hand_finger_positions: HandFingerPositions) -> None:
+        # draw landmark positions
+        thumb_tip_percent = hand_finger_positions.get_percent_vector(HandFingerPositions.thumb_tip_index)
+        self.frame_overlay.add_circle(hand_finger_positions.get_percent_vector(HandFingerPositions.wrist_index), 5, 0, (255, 0, 0))
+        self.frame_overlay.add_circle(thumb_tip_percent, 5, 0, (0, 255, 255))
+        self.frame_overlay.add_circle(hand_finger_positions.get_percent_vector(HandFingerPositions.index_tip_index), 5, 0, (255, 255, 0))
+        self.frame_overlay.add_circle(hand_finger_positions.get_percent_vector(HandFingerPositions.middle_tip_index), 5, 0, (0, 255, 0))
+        self.frame_overlay.add_circle(hand_finger_positions.get_percent_vector(HandFingerPositions.ring_tip_index), 5, 0, (255, 0, 255))
+        self.frame_overlay.add_circle(hand_finger_positions.get_percent_vector(HandFingerPositions.pinky_tip_index), 5, 0, (0, 0, 255))
+
+        # draw click threshold
+        self.frame_overlay.add_circle(thumb_tip_percent, 0, self.config.click_distance_threshold_low_percent.value / 2, (0, 255, 0), 2)
+        self.frame_overlay.add_circle(thumb_tip_percent, 0, self.config.click_distance_threshold_high_percent.value / 2, (0, 255, 0), 2)
+
     def detect_scoll(self,
             current_time_ms: int,
-            hand_finger_positions: HandFingerPositions) -> None:
+            is_scroll_up_gesture: bool,
+            is_scroll_down_gesture: bool) -> None:
         # scroll up gesture: thumb up
         # scroll down gesture: thumb down
 
-        # scrolling down is more common, thus check first thumb-down gesture
-        is_thumb_down = self.is_thumb_down(hand_finger_positions)
-        # thumb-up gesture is a relatively complex calculation, thus assume false if thumb-down gesture has been detected already.
-        is_thumb_up = not is_thumb_down and self.is_thumb_up(hand_finger_positions)
+        # scrolling down is more common, thus prefer it if both gestures are present
+        is_thumb_down = is_scroll_down_gesture
+        is_thumb_up = not is_thumb_down and is_scroll_up_gesture
 
         if (not is_thumb_up and not is_thumb_down):
             # not scrolling in any direction
@@ -202,153 +485,21 @@ class GestureRecognizer(LogHolder):
         self.was_thumb_up_last_frame = is_thumb_up
         self.was_thumb_down_last_frame = is_thumb_down
 
-    def detect_index_near_thumb_gesture(self,
-                                        hand_finger_positions: HandFingerPositions) -> bool:
-        index_finger_tip = hand_finger_positions.index_finger_positions[-1]
-        thumb_finger_tip = hand_finger_positions.thumb_finger_positions[-1]
-        middle_finger_tip = hand_finger_positions.middle_finger_positions[-1]
-        ring_finger_tip = hand_finger_positions.ring_finger_positions[-1]
-        pinky_finger_tip = hand_finger_positions.pinky_finger_positions[-1]
-
-        is_only_index_near_thumb = (self.is_near_target([index_finger_tip], thumb_finger_tip)
-                                    and self.is_faraway_target([middle_finger_tip, ring_finger_tip, pinky_finger_tip], thumb_finger_tip))
-        self.index_near_thumb_flank_recognizer.set_value(is_only_index_near_thumb)
-
-        return is_only_index_near_thumb
-
-    def is_faraway_target(self,
-            finger_positions: List[FingerPosition],
-            target_position: FingerPosition) -> bool:
-        finger_target_distances_percent = [Vector.distance_xy(finger_position.percent, target_position.percent) for finger_position in finger_positions]
-
-        all_fingers_not_near_target = all(distance_percent > self.config.click_distance_threshold_high_percent.value
-            for distance_percent in finger_target_distances_percent)
-
-        return all_fingers_not_near_target
-
-    def is_near_target(self,
-            finger_positions: List[FingerPosition],
-            target_position: FingerPosition) -> bool:
-        finger_target_distances_percent = [Vector.distance_xy(finger_position.percent, target_position.percent) for finger_position in finger_positions]
-
-        all_fingers_near_target = all(distance_percent < self.config.click_distance_threshold_low_percent.value
-            for distance_percent in finger_target_distances_percent)
-
-        return all_fingers_near_target
-
-    def detect_middle_and_ring_near_thumb_gesture(self,
-                                                  hand_finger_positions: HandFingerPositions) -> None:
-        middle_finger_tip = hand_finger_positions.middle_finger_positions[-1]
-        ring_finger_tip = hand_finger_positions.ring_finger_positions[-1]
-        thumb_finger_tip = hand_finger_positions.thumb_finger_positions[-1]
-        index_finger_tip = hand_finger_positions.index_finger_positions[-1]
-        pinky_finger_tip = hand_finger_positions.pinky_finger_positions[-1]
-        only_middle_and_ring_near_thumb = (self.is_near_target([middle_finger_tip, ring_finger_tip], thumb_finger_tip)
-                                           and self.is_faraway_target([index_finger_tip, pinky_finger_tip], thumb_finger_tip))
-        self.middle_and_ring_near_thumb_flank_recognizer.set_value(only_middle_and_ring_near_thumb)
-
-    def detect_ring_and_pinky_near_thumb_gesture(self,
-                                                 hand_finger_positions: HandFingerPositions) -> None:
-        ring_finger_tip = hand_finger_positions.ring_finger_positions[-1]
-        pinky_finger_tip = hand_finger_positions.pinky_finger_positions[-1]
-        thumb_finger_tip = hand_finger_positions.thumb_finger_positions[-1]
-        index_finger_tip = hand_finger_positions.index_finger_positions[-1]
-        middle_finger_tip = hand_finger_positions.middle_finger_positions[-1]
-        only_ring_and_pinky_near_thumb = (self.is_near_target([ring_finger_tip, pinky_finger_tip], thumb_finger_tip)
-                                          and self.is_faraway_target([index_finger_tip, middle_finger_tip], thumb_finger_tip))
-        self.ring_and_pinky_near_thumb_flank_recognizer.set_value(only_ring_and_pinky_near_thumb)
-
-    def is_thumb_up(self,
-            hand_finger_positions: HandFingerPositions) -> bool:
-        # thumbs up: thumb is stretched and upwards, other fingers curved and vertically aligned
-        
-        # thumb must be vertically aligned upwards
-        if (not self.is_vertically_aligned_upwards(hand_finger_positions.thumb_finger_positions)):
-            return False
-        
-        # thumb must be at the top
-        relevant_thumb_positions = get_elements_except(hand_finger_positions.thumb_finger_positions, [hand_finger_positions.thumb_finger_positions[0], hand_finger_positions.thumb_finger_positions[1]])
-        lowest_thumb_joint = get_min_element(relevant_thumb_positions, lambda finger_position: finger_position.px.y)
-        all_finger_positions_except_thumb = get_elements_except(hand_finger_positions.all_finger_positions, hand_finger_positions.thumb_finger_positions)
-        is_thumb_at_top = all(finger_position.px.y > lowest_thumb_joint.px.y for finger_position in all_finger_positions_except_thumb)
-        if (not is_thumb_at_top):
-            return False
-
-        # other finger joints are vertically aligned and curved
-        if (not self.is_fingers_aligned_for_thumb_up_or_thumb_down(hand_finger_positions, ThumbGestureDirection.UP)):
-            return False
-
-        return True
-
-    def is_thumb_down(self,
-            hand_finger_positions: HandFingerPositions) -> bool:
-        # thumbs down: thumb is stretched and downwards, other fingers curved and vertically aligned
-        
-        # thumb must be vertically aligned downwards
-        if (not self.is_vertically_aligned_downwards(hand_finger_positions.thumb_finger_positions)):
-            return False
-
-        # thumb must be at the bottom
-        relevant_thumb_positions = get_elements_except(hand_finger_positions.thumb_finger_positions, [hand_finger_positions.thumb_finger_positions[0], hand_finger_positions.thumb_finger_positions[1]])
-        highest_thumb_joint = get_max_element(relevant_thumb_positions, lambda finger_position: finger_position.px.y)
-        all_finger_positions_except_thumb = get_elements_except(hand_finger_positions.all_finger_positions, hand_finger_positions.thumb_finger_positions)
-        is_thumb_at_bottom = all(finger_position.px.y < highest_thumb_joint.px.y for finger_position in all_finger_positions_except_thumb)
-        if (not is_thumb_at_bottom):
-            return False
-        
-        # other finger joints are vertically aligned and curved
-        if (not self.is_fingers_aligned_for_thumb_up_or_thumb_down(hand_finger_positions, ThumbGestureDirection.DOWN)):
-            return False
-        
-        return True
-
-    def is_fingers_aligned_for_thumb_up_or_thumb_down(self, hand_finger_positions: HandFingerPositions, direction: ThumbGestureDirection) -> bool:
-        # Fingers are curved
-        if (self.is_finger_straight_horizontally(hand_finger_positions.index_finger_positions)
-                or self.is_finger_straight_horizontally(hand_finger_positions.middle_finger_positions)
-                or self.is_finger_straight_horizontally(hand_finger_positions.ring_finger_positions)
-                or self.is_finger_straight_horizontally(hand_finger_positions.pinky_finger_positions)):
-            return False
-
-        # Finger joints are vertically aligned.
-        # Note that depending on the gesture, the camera is faced with different joints
-        if direction == ThumbGestureDirection.UP:
-            vertically_aligned_check_function = self.is_vertically_aligned_downwards
-            relevant_column_finger_positions = hand_finger_positions.get_finger_positions_by_index([5, 9, 13, 17])
-        elif direction == ThumbGestureDirection.DOWN:
-            vertically_aligned_check_function = self.is_vertically_aligned_upwards
-            relevant_column_finger_positions = hand_finger_positions.get_finger_positions_by_index([6, 10, 14, 18])
-        else:
-            raise Exception(f"Unsupported ThumbGestureDirection {direction}")
-
-        all_columns_vertically_aligned = all(vertically_aligned_check_function(column_finger_positions)
-                for column_finger_positions in [relevant_column_finger_positions])
-        return all_columns_vertically_aligned
-
-    def is_finger_straight_horizontally(self, finger_positions: List[FingerPosition]) -> bool:
-        # stretched finger joints: 0-1-2
-        # curved finger joints: 0-2-1
-        if (all_increasing(finger_positions, lambda finger_position: finger_position.px.x)
-                or all_decreasing(finger_positions, lambda finger_position: finger_position.px.x)):
-            return True
-
-        return False
-
-    def is_vertically_aligned_upwards(self,
-            finger_positions: List[FingerPosition]) -> bool:
-
-        for i in range(1, len(finger_positions)):
-            if (finger_positions[i - 1].px.y < finger_positions[i].px.y):
-                return False
-        return True
-
-    def is_vertically_aligned_downwards(self,
-            finger_positions: List[FingerPosition]) -> bool:
-
-        for i in range(1, len(finger_positions)):
-            if (finger_positions[i - 1].px.y > finger_positions[i].px.y):
-                return False
-        return True
+    def is_faraway_thumb(self,
+            hand_features: HandFeatures,
+            fingers: List[int]) -> bool:
+        hand_features.compute_tip_distances()
+        thumb_tip_distances = hand_features.thumb_tip_distances
+        click_distance_threshold_high_percent = self.config.click_distance_threshold_high_percent.value
+        return all(thumb_tip_distances[finger] > click_distance_threshold_high_percent for finger in fingers)
+
+    def is_near_thumb(self,
+            hand_features: HandFeatures,
+            fingers: List[int]) -> bool:
+        hand_features.compute_tip_distances()
+        thumb_tip_distances = hand_features.thumb_tip_distances
+        click_distance_threshold_low_percent = self.config.click_distance_threshold_low_percent.value
+        return all(thumb_tip_distances[finger] < click_distance_threshold_low_percent for finger in fingers)
 
     def get_motion_border_top(self) -> float:
         if self.config.mouse_positioning_mode.value == MousePositioningMode.ABSOLUTE:
@@ -382,38 +533,38 @@ class GestureRecognizer(LogHolder):
         self.allow_left_click = False
         self.is_potential_left_click_gesture = False
         self.left_click_count = self.left_click_count + 1
-        self.mouse_control.on_single_click_detected(MouseButton.LEFT)
+        self.run_mouse_action(lambda: self.mouse_control.on_single_click_detected(MouseButton.LEFT))
         self.left_click_start_time_ms = current_time_ms
         self.last_left_click_time_ms = current_time_ms
 
     def on_double_left_click(self, current_time_ms: int) -> None:
         self.allow_left_click = False
         self.left_click_count = 2
-        self.mouse_control.on_double_left_click_detected()
+        self.run_mouse_action(self.mouse_control.on_double_left_click_detected)
         self.last_left_click_time_ms = current_time_ms
 
     def on_right_click(self, current_time_ms: int) -> None:
         self.allow_right_click = False
-        self.mouse_control.on_single_click_detected(MouseButton.RIGHT)
+        self.run_mouse_action(lambda: self.mouse_control.on_single_click_detected(MouseButton.RIGHT))
         self.last_right_click_time_ms = current_time_ms
 
     def on_middle_click(self, current_time_ms: int) -> None:
         self.allow_middle_click = False
-        self.mouse_control.on_single_click_detected(MouseButton.MIDDLE)
+        self.run_mouse_action(lambda: self.mouse_control.on_single_click_detected(MouseButton.MIDDLE))
         self.last_middle_click_time_ms = current_time_ms
 
     def on_begin_drag(self) -> None:
         self.is_drag_started = True
-        self.mouse_control.on_begin_drag()
+        self.run_mouse_action(self.mouse_control.on_begin_drag)
 
     def on_end_drag(self) -> None:
         self.is_drag_started = False
         self.is_potential_drag_gesture = False
-        self.mouse_control.on_end_drag()
+        self.run_mouse_action(self.mouse_control.on_end_drag)
 
     def on_scroll(self, x: int, y: int, current_time_ms: int) -> None:
         self.last_scroll_time_ms = current_time_ms
-        self.mouse_control.on_scroll(x, y)
+        self.run_mouse_action(lambda: self.mouse_control.on_scroll(x, y))
 
     def on_drag_gesture_change(self, value: bool) -> None:
         if self.left_click_count == 1:
@@ -443,7 +594,3 @@ class GestureRecognizer(LogHolder):
                 and current_time_ms < self.last_index_near_thumb_gesture_time_ms + self.config.double_click_max_pause_ms.value):
             self.on_double_left_click(current_time_ms)
         self.last_index_near_thumb_gesture_time_ms = current_time_ms
-
-class ThumbGestureDirection(Enum):
-    UP = 1
-    DOWN = 2
\ No newline at end of file
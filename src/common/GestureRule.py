@@ -0,0 +1,110 @@
+from __future__ import annotations
+from enum import Enum
+from typing import Any, Dict, List
+
+class GestureRule:
+    """ Declarative definition of a gesture: the gesture is present while all conditions hold.
+    The action is performed when the gesture is held for the delay of the action plus hold_duration_ms,
+    e.g. click_delay_ms for clicks (see GestureRuleEngine).
+    """
+    def __init__(self, name: str, action: GestureAction, conditions: List[GestureCondition], hold_duration_ms: int = 0) -> None:
+        self.name = name
+        self.action = action
+        self.conditions = conditions
+        self.hold_duration_ms = hold_duration_ms
+
+    # Enums are stored by name in the config file, which keeps it readable and editable.
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"name": self.name, "action": self.action.name, "conditions": self.conditions, "hold_duration_ms": self.hold_duration_ms}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(state["name"], GestureAction[state["action"]], state["conditions"], state["hold_duration_ms"]) # type: ignore
+
+    def __repr__(self) -> str:
+        return f"GestureRule({self.name}, {self.action}, {self.conditions}, {self.hold_duration_ms})"
+
+class GestureCondition:
+    """ Condition on parts of the hand. It holds if it holds for each of the parts.
+    The target is only used by NEAR and FARAWAY, which compare the distance of the finger tips.
+    """
+    def __init__(self, kind: GestureConditionKind, parts: List[HandPart], target: HandPart = None) -> None:
+        self.kind = kind
+        self.parts = parts
+        self.target = target if target is not None else HandPart.THUMB
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {"kind": self.kind.name, "parts": [part.name for part in self.parts], "target": self.target.name}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(GestureConditionKind[state["kind"]], [HandPart[part] for part in state["parts"]], HandPart[state["target"]]) # type: ignore
+
+    def __repr__(self) -> str:
+        if self.kind in (GestureConditionKind.NEAR, GestureConditionKind.FARAWAY):
+            return f"{self.kind.name} {[part.name for part in self.parts]} {self.target.name}"
+        return f"{self.kind.name} {[part.name for part in self.parts]}"
+
+class GestureConditionKind(Enum):
+    # Tip is nearer to the tip of the target than click_distance_threshold_low_percent
+    NEAR = 0
+    # Tip is farther from the tip of the target than click_distance_threshold_high_percent
+    FARAWAY = 1
+    # Joints are ordered from left to right or from right to left
+    STRAIGHT = 2
+    CURVED = 3
+    # Joints are ordered from bottom to top (UPWARDS) or from top to bottom (DOWNWARDS)
+    UPWARDS = 4
+    DOWNWARDS = 5
+    # The outer two joints are above (ABOVE) or below (BELOW) all joints of the other fingers
+    ABOVE = 6
+    BELOW = 7
+
+class HandPart(Enum):
+    # Fingers, in the order of the landmarks
+    THUMB = 0
+    INDEX_FINGER = 1
+    MIDDLE_FINGER = 2
+    RING_FINGER = 3
+    PINKY_FINGER = 4
+    # Joint columns across the fingers except the thumb, from index finger to pinky.
+    # Only for STRAIGHT, CURVED, UPWARDS and DOWNWARDS.
+    KNUCKLES = 5
+    MIDDLE_JOINTS = 6
+
+class GestureAction(Enum):
+    LEFT_CLICK = 0
+    RIGHT_CLICK = 1
+    MIDDLE_CLICK = 2
+    DRAG = 3
+    SCROLL_UP = 4
+    SCROLL_DOWN = 5
+
+def get_default_gesture_rules() -> List[GestureRule]:
+    # The rules do not share objects, such that each rule is written in full to the config file.
+    other_fingers = [HandPart.INDEX_FINGER, HandPart.MIDDLE_FINGER, HandPart.RING_FINGER, HandPart.PINKY_FINGER]
+    return [
+        GestureRule("left click", GestureAction.LEFT_CLICK,
+                    [GestureCondition(GestureConditionKind.NEAR, [HandPart.INDEX_FINGER]),
+                     GestureCondition(GestureConditionKind.FARAWAY, [HandPart.MIDDLE_FINGER, HandPart.RING_FINGER, HandPart.PINKY_FINGER])]),
+        GestureRule("drag", GestureAction.DRAG,
+                    [GestureCondition(GestureConditionKind.NEAR, [HandPart.INDEX_FINGER]),
+                     GestureCondition(GestureConditionKind.FARAWAY, [HandPart.MIDDLE_FINGER, HandPart.RING_FINGER, HandPart.PINKY_FINGER])]),
+        GestureRule("right click", GestureAction.RIGHT_CLICK,
+                    [GestureCondition(GestureConditionKind.NEAR, [HandPart.MIDDLE_FINGER, HandPart.RING_FINGER]),
+                     GestureCondition(GestureConditionKind.FARAWAY, [HandPart.INDEX_FINGER, HandPart.PINKY_FINGER])]),
+        GestureRule("middle click", GestureAction.MIDDLE_CLICK,
+                    [GestureCondition(GestureConditionKind.NEAR, [HandPart.RING_FINGER, HandPart.PINKY_FINGER]),
+                     GestureCondition(GestureConditionKind.FARAWAY, [HandPart.INDEX_FINGER, HandPart.MIDDLE_FINGER])]),
+        # Thumb up: thumb is stretched and upwards, other fingers curved and vertically aligned.
+        # Note that depending on the gesture, the camera is faced with different joints.
+        GestureRule("scroll up", GestureAction.SCROLL_UP,
+                    [GestureCondition(GestureConditionKind.UPWARDS, [HandPart.THUMB]),
+                     GestureCondition(GestureConditionKind.ABOVE, [HandPart.THUMB]),
+                     GestureCondition(GestureConditionKind.CURVED, list(other_fingers)),
+                     GestureCondition(GestureConditionKind.DOWNWARDS, [HandPart.KNUCKLES])]),
+        # Thumb down: thumb is stretched and downwards, other fingers curved and vertically aligned
+        GestureRule("scroll down", GestureAction.SCROLL_DOWN,
+                    [GestureCondition(GestureConditionKind.DOWNWARDS, [HandPart.THUMB]),
+                     GestureCondition(GestureConditionKind.BELOW, [HandPart.THUMB]),
+                     GestureCondition(GestureConditionKind.CURVED, list(other_fingers)),
+                     GestureCondition(GestureConditionKind.UPWARDS, [HandPart.MIDDLE_JOINTS])]),
+    ]
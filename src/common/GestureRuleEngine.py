@@ -0,0 +1,180 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+import numpy as np
+from .GestureEvaluationPlan import GestureEvaluationPlan
+from .GesturePredicateCache import GesturePredicateCache
+from .GestureRule import GestureAction, GestureConditionKind, GestureRule, HandPart
+from .GestureStateMachine import GestureStateMachine
+from .HandFeatures import HandFeatures
+
+class GestureRuleEngine:
+    """ Evaluates a set of GestureRules in one pass per frame and recognizes flanks and holds of all gestures.
+    The rules are compiled into a boolean matrix (rule x atom). Atoms are the elementary conditions on a hand,
+    e.g. "tip of the index finger near tip of the thumb", computed from the HandFeatures for all parts at once.
+    A rule holds if all of its atoms hold, which is a single matrix product. Thus the cost per frame hardly grows with the number of rules.
+    """
+    click_actions = [GestureAction.LEFT_CLICK, GestureAction.RIGHT_CLICK, GestureAction.MIDDLE_CLICK, GestureAction.DRAG]
+    scroll_actions = [GestureAction.SCROLL_UP, GestureAction.SCROLL_DOWN]
+
+    # Atom layout: distance atoms per (finger, target finger), joint atoms per chain, extent atoms per finger
+    distance_atom_count = HandFeatures.finger_count * HandFeatures.finger_count
+    near_atom_offset = 0
+    faraway_atom_offset = near_atom_offset + distance_atom_count
+    straight_atom_offset = faraway_atom_offset + distance_atom_count
+    curved_atom_offset = straight_atom_offset + HandFeatures.chain_count
+    upwards_atom_offset = curved_atom_offset + HandFeatures.chain_count
+    downwards_atom_offset = upwards_atom_offset + HandFeatures.chain_count
+    above_atom_offset = downwards_atom_offset + HandFeatures.chain_count
+    below_atom_offset = above_atom_offset + HandFeatures.finger_count
+    atom_count = below_atom_offset + HandFeatures.finger_count
+    joint_atom_offset = straight_atom_offset
+
+    def __init__(self, rules: List[GestureRule]) -> None:
+        self.rules = rules
+        # Raises GestureRuleException
+        self.condition_matrix = compile_gesture_rules(rules)
+        self.condition_count_matrix = self.condition_matrix.astype(np.int32)
+        self.condition_counts = self.condition_count_matrix.sum(axis=1)
+        self.action_indexes = np.array([rule.action.value for rule in rules], dtype=np.int64)
+        self.hold_duration_ms = np.array([rule.hold_duration_ms for rule in rules], dtype=np.int64)
+        # Matrix (action x rule), to count the present rules of each action
+        self.action_matrix = (np.array([[rule.action == action for rule in rules] for action in GestureAction], dtype=np.int32)
+                              .reshape(len(GestureAction), len(rules)))
+        self.click_rule_mask = np.array([rule.action in self.click_actions for rule in rules], dtype=bool)
+        self.scroll_rule_mask = np.array([rule.action in self.scroll_actions for rule in rules], dtype=bool)
+        self.joint_rule_mask = np.any(self.condition_matrix[:, self.joint_atom_offset:], axis=1)
+        self.zero_joint_atoms = np.zeros(self.atom_count - self.joint_atom_offset, dtype=bool)
+
+        self.evaluation_plan: Any = None
+        # Rules of actions that are decided by a GestureClassifier instead of their conditions
+        self.classified_actions: List[GestureAction] = []
+        self.classified_rule_mask = np.zeros(len(rules), dtype=bool)
+        self.rule_mask = np.zeros(len(rules), dtype=bool)
+        self.classified_rule_mask_of_plan = np.zeros(len(rules), dtype=bool)
+        self.is_any_rule_classified = False
+        self.is_any_rule_evaluated = False
+        # Number of atoms that must hold for each rule, -1 for rules that are not evaluated
+        self.required_condition_counts = np.full(len(rules), -1, dtype=np.int32)
+        self.is_joint_order_needed = False
+        self.state_machine = GestureStateMachine(len(rules))
+        self.signals = np.zeros(len(rules), dtype=bool)
+        self.no_signals = np.zeros(len(rules), dtype=bool)
+        self.present_rule_counts = [0] * len(GestureAction)
+        self.action_hold_duration_ms: Any = None
+        self.rule_hold_duration_ms = self.hold_duration_ms
+
+    def set_evaluation_plan(self, evaluation_plan: GestureEvaluationPlan) -> None:
+        """ Rules of gesture families that are not evaluated are treated as not holding. """
+        if evaluation_plan is self.evaluation_plan:
+            return
+        self.evaluation_plan = evaluation_plan
+        self.update_rule_masks()
+
+    def set_classified_actions(self, actions: List[GestureAction]) -> None:
+        """ The rules of these actions hold when the GestureClassifier recognizes their action (see apply_classified_action). """
+        if actions is self.classified_actions:
+            return
+        self.classified_actions = actions
+        self.classified_rule_mask = np.array([rule.action in actions for rule in self.rules], dtype=bool)
+        self.update_rule_masks()
+
+    def update_rule_masks(self) -> None:
+        if self.evaluation_plan is None:
+            return
+        self.rule_mask = ((self.click_rule_mask & self.evaluation_plan.is_click)
+                          | (self.scroll_rule_mask & self.evaluation_plan.is_scroll))
+        # The conditions of classified rules are not evaluated
+        condition_rule_mask = self.rule_mask & ~self.classified_rule_mask
+        self.classified_rule_mask_of_plan = self.rule_mask & self.classified_rule_mask
+        self.is_any_rule_classified = bool(self.classified_rule_mask_of_plan.any())
+        self.is_any_rule_evaluated = bool(condition_rule_mask.any())
+        self.required_condition_counts = np.where(condition_rule_mask, self.condition_counts, -1)
+        self.is_joint_order_needed = bool(np.any(condition_rule_mask & self.joint_rule_mask))
+
+    def evaluate(self, hand_features: HandFeatures, near_distance: float, faraway_distance: float, predicate_cache: GesturePredicateCache) -> Any:
+        """ Returns which rules hold for the hand, as boolean array.
+        The distance atoms do not depend on the rules, thus their cached results stay valid when the rules or the evaluation plan change.
+        """
+        if not self.is_any_rule_evaluated:
+            return self.no_signals
+        distance_atoms = predicate_cache.get_or_compute(predicate_cache.distance_atoms_entry, hand_features, near_distance, faraway_distance,
+                                                        lambda: self.compute_distance_atoms(hand_features, near_distance, faraway_distance))
+        if self.is_joint_order_needed:
+            joint_atoms = self.compute_joint_atoms(hand_features)
+        else:
+            joint_atoms = self.zero_joint_atoms
+        atoms = np.concatenate((distance_atoms, joint_atoms))
+        return self.condition_count_matrix @ atoms == self.required_condition_counts
+
+    def compute_distance_atoms(self, hand_features: HandFeatures, near_distance: float, faraway_distance: float) -> Any:
+        hand_features.compute_tip_distances()
+        tip_distances = hand_features.tip_distances
+        return np.concatenate(((tip_distances < near_distance).ravel(), (tip_distances > faraway_distance).ravel()))
+
+    def compute_joint_atoms(self, hand_features: HandFeatures) -> Any:
+        hand_features.compute_joint_order()
+        is_straight = hand_features.is_chain_increasing[:, 0] | hand_features.is_chain_decreasing[:, 0]
+        return np.concatenate((is_straight,
+                               ~is_straight,
+                               # In image coordinates, upwards means decreasing y
+                               hand_features.is_chain_decreasing[:, 1],
+                               hand_features.is_chain_increasing[:, 1],
+                               hand_features.is_outer_joints_above,
+                               hand_features.is_outer_joints_below))
+
+    def apply_classified_action(self, signals: Any, action_value: int) -> Any:
+        """ Returns the signals of evaluate, with the classified rules of the action (GestureAction value, -1 for none) holding. """
+        return signals | (self.classified_rule_mask_of_plan & (self.action_indexes == action_value))
+
+    def update(self, signals: Any, action_hold_duration_ms: Any, current_time_ms: int) -> List[Tuple[GestureRule, int]]:
+        """ Takes the signals of evaluate and the hold duration of each action (indexed by GestureAction value).
+        Returns (rule, GestureStateMachine event flags) for the rules with flanks or holds in this frame.
+        """
+        if action_hold_duration_ms is not self.action_hold_duration_ms:
+            self.action_hold_duration_ms = action_hold_duration_ms
+            self.rule_hold_duration_ms = self.hold_duration_ms + action_hold_duration_ms[self.action_indexes]
+        self.signals = signals
+        gesture_events = self.state_machine.update(signals, self.rule_hold_duration_ms, current_time_ms)
+        if gesture_events:
+            # Signals only change with a flank
+            self.present_rule_counts = (self.action_matrix @ signals).tolist()
+        return [(self.rules[rule_index], events) for rule_index, events in gesture_events]
+
+    def is_action_present(self, action: GestureAction) -> bool:
+        return self.present_rule_counts[action.value] > 0
+
+def compile_gesture_rules(rules: List[GestureRule]) -> Any:
+    """ Returns the boolean matrix (rule x atom) of the atoms that must hold for each rule. """
+    condition_matrix = np.zeros((len(rules), GestureRuleEngine.atom_count), dtype=bool)
+    for rule_index, rule in enumerate(rules):
+        if not rule.conditions:
+            raise GestureRuleException(f"gesture rule '{rule.name}' has no conditions")
+        for condition in rule.conditions:
+            for part in condition.parts:
+                condition_matrix[rule_index, get_atom_index(condition.kind, part, condition.target, rule.name)] = True
+    return condition_matrix
+
+def get_atom_index(kind: GestureConditionKind, part: HandPart, target: HandPart, rule_name: str) -> int:
+    is_finger = part.value < HandFeatures.finger_count
+    if kind in (GestureConditionKind.NEAR, GestureConditionKind.FARAWAY):
+        if not is_finger or target.value >= HandFeatures.finger_count or part == target:
+            raise GestureRuleException(f"gesture rule '{rule_name}': {kind.name} needs two different fingers, not {part.name} and {target.name}")
+        offset = GestureRuleEngine.near_atom_offset if kind == GestureConditionKind.NEAR else GestureRuleEngine.faraway_atom_offset
+        return offset + target.value * HandFeatures.finger_count + part.value
+    if kind in (GestureConditionKind.ABOVE, GestureConditionKind.BELOW):
+        if not is_finger:
+            raise GestureRuleException(f"gesture rule '{rule_name}': {kind.name} needs a finger, not {part.name}")
+        offset = GestureRuleEngine.above_atom_offset if kind == GestureConditionKind.ABOVE else GestureRuleEngine.below_atom_offset
+        return offset + part.value
+    chain_atom_offsets = {
+        GestureConditionKind.STRAIGHT: GestureRuleEngine.straight_atom_offset,
+        GestureConditionKind.CURVED: GestureRuleEngine.curved_atom_offset,
+        GestureConditionKind.UPWARDS: GestureRuleEngine.upwards_atom_offset,
+        GestureConditionKind.DOWNWARDS: GestureRuleEngine.downwards_atom_offset,
+    }
+    if kind not in chain_atom_offsets:
+        raise GestureRuleException(f"gesture rule '{rule_name}': unsupported condition {kind}")
+    return chain_atom_offsets[kind] + part.value
+
+class GestureRuleException(Exception):
+    pass
@@ -0,0 +1,99 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+import numpy as np
+
+class GestureStateMachine:
+    """ Recognizes flanks and holds of many boolean signals at once.
+    A flank is a change of a signal. A signal is held high (or low) once it has been high (or low) longer than its hold duration since its last flank.
+    The next state and the events of all signals are looked up in two tables,
+    indexed by the current state and the transition (previous signal, signal, hold duration elapsed).
+    Python code only runs for signals with events.
+    Frames without flanks before the next hold duration elapses, which are most frames, only cost a comparison of the signals.
+    """
+    # States of a signal: no value yet, high or low since the last flank, and high or low longer than the hold duration
+    no_value = 0
+    high_value = 1
+    high_hold_value = 2
+    low_value = 3
+    low_hold_value = 4
+    state_count = 5
+    # States that wait for the hold duration to elapse
+    is_hold_pending_state = np.array([False, True, False, True, False])
+    no_hold_pending_time_ms = np.iinfo(np.int64).max
+
+    # Event flags
+    rising_flank_event = 1
+    falling_flank_event = 2
+    # The signal has been high longer than the hold duration (start), and falls after such a hold (end)
+    hold_high_start_event = 4
+    hold_high_end_event = 8
+    # The signal has been low longer than the hold duration (start), and rises after such a hold (end)
+    hold_low_start_event = 16
+    hold_low_end_event = 32
+    event_flags = [rising_flank_event, falling_flank_event, hold_high_start_event, hold_high_end_event, hold_low_start_event, hold_low_end_event]
+
+    def __init__(self, signal_count: int) -> None:
+        self.next_state_table, self.event_table = create_transition_tables()
+        self.states = np.full(signal_count, self.no_value, dtype=np.int8)
+        self.signals = np.zeros(signal_count, dtype=bool)
+        self.last_flank_time_ms = np.zeros(signal_count, dtype=np.int64)
+        self.hold_duration_ms: Any = None
+        # Time when the next pending hold duration elapses
+        self.next_hold_time_ms = self.no_hold_pending_time_ms
+
+    def update(self, signals: Any, hold_duration_ms: Any, current_time_ms: int) -> List[Tuple[int, int]]:
+        """ Takes the signals of a frame and the hold durations as arrays. Returns (signal index, event flags) for signals with events. """
+        is_flank = signals != self.signals
+        if (current_time_ms <= self.next_hold_time_ms
+                and hold_duration_ms is self.hold_duration_ms
+                and not is_flank.any()):
+            return []
+        self.hold_duration_ms = hold_duration_ms
+        self.last_flank_time_ms[is_flank] = current_time_ms
+        hold_time_ms = self.last_flank_time_ms + hold_duration_ms
+        is_hold_elapsed = hold_time_ms < current_time_ms
+        transitions = self.signals * 4 + signals * 2 + is_hold_elapsed
+        events = self.event_table[self.states, transitions]
+        self.states = self.next_state_table[self.states, transitions]
+        self.signals = signals
+        pending_hold_time_ms = hold_time_ms[self.is_hold_pending_state[self.states]]
+        self.next_hold_time_ms = int(pending_hold_time_ms.min()) if len(pending_hold_time_ms) > 0 else self.no_hold_pending_time_ms
+        if not events.any():
+            return []
+        signal_indexes = np.flatnonzero(events)
+        return list(zip(signal_indexes.tolist(), events[signal_indexes].tolist()))
+
+def get_next_state(state: int, previous_signal: bool, signal: bool, is_hold_elapsed: bool) -> Tuple[int, int]:
+    """ Returns the next state and the events of a single signal. Used to fill the tables of the GestureStateMachine. """
+    events = 0
+    if signal and not previous_signal:
+        events = events | GestureStateMachine.rising_flank_event
+        if state == GestureStateMachine.low_hold_value:
+            events = events | GestureStateMachine.hold_low_end_event
+        state = GestureStateMachine.high_value
+    elif previous_signal and not signal:
+        events = events | GestureStateMachine.falling_flank_event
+        if state == GestureStateMachine.high_hold_value:
+            events = events | GestureStateMachine.hold_high_end_event
+        state = GestureStateMachine.low_value
+
+    # The hold duration is measured from the last flank, i.e. it cannot have elapsed in the frame of a flank
+    if is_hold_elapsed:
+        if state == GestureStateMachine.high_value:
+            events = events | GestureStateMachine.hold_high_start_event
+            state = GestureStateMachine.high_hold_value
+        elif state == GestureStateMachine.low_value:
+            events = events | GestureStateMachine.hold_low_start_event
+            state = GestureStateMachine.low_hold_value
+    return state, events
+
+def create_transition_tables() -> Tuple[Any, Any]:
+    next_state_table = np.zeros((GestureStateMachine.state_count, 8), dtype=np.int8)
+    event_table = np.zeros((GestureStateMachine.state_count, 8), dtype=np.int8)
+    for state in range(GestureStateMachine.state_count):
+        for transition in range(8):
+            previous_signal = bool(transition & 4)
+            signal = bool(transition & 2)
+            is_hold_elapsed = bool(transition & 1)
+            next_state_table[state, transition], event_table[state, transition] = get_next_state(state, previous_signal, signal, is_hold_elapsed)
+    return next_state_table, event_table
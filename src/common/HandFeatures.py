@@ -0,0 +1,80 @@
+from __future__ import annotations
+import numpy as np
+from .HandFingerPositions import HandFingerPositions
+
+class HandFeatures:
+    """ Measures of a hand that the gestures are based on, computed with a few NumPy operations per frame:
+    XY distances between the finger tips, whether joints are ordered along an axis, and vertical extents.
+    The measures are only computed when needed (see compute_tip_distances and compute_joint_order),
+    i.e. only while a gesture depends on them. Tip distances are not needed while their results are reused (see GesturePredicateCache).
+    """
+    # Fingers in the order of the landmarks
+    thumb = 0
+    index_finger = 1
+    middle_finger = 2
+    ring_finger = 3
+    pinky_finger = 4
+    finger_count = 5
+    tip_indexes = [HandFingerPositions.thumb_tip_index,
+                   HandFingerPositions.index_tip_index,
+                   HandFingerPositions.middle_tip_index,
+                   HandFingerPositions.ring_tip_index,
+                   HandFingerPositions.pinky_tip_index]
+    # Chains of landmark indexes whose order is checked: the joints of each finger,
+    # and the joint columns across the fingers except the thumb (knuckles and middle joints).
+    joint_chains = np.array([[1, 2, 3, 4],
+                             [5, 6, 7, 8],
+                             [9, 10, 11, 12],
+                             [13, 14, 15, 16],
+                             [17, 18, 19, 20],
+                             [5, 9, 13, 17],
+                             [6, 10, 14, 18]])
+    chain_count = len(joint_chains)
+    # Per finger: landmark indexes of its outer two joints and of the joints of the other fingers
+    outer_joint_indexes = joint_chains[:finger_count, 2:]
+    other_finger_joint_indexes = (np.broadcast_to(joint_chains[:finger_count], (finger_count, finger_count, 4))[~np.eye(finger_count, dtype=bool)]
+                                  .reshape(finger_count, -1))
+
+    def __init__(self, hand_finger_positions: HandFingerPositions) -> None:
+        self.hand_finger_positions = hand_finger_positions
+        self.is_tip_distances_computed = False
+        # Matrix of shape (5, 5)
+        self.tip_distances = np.zeros((self.finger_count, self.finger_count))
+        self.thumb_tip_distances = [0.0] * self.finger_count
+
+        self.is_joint_order_computed = False
+        # Per chain and axis (x, y): all joints are ordered in increasing or decreasing pixel coordinates
+        self.is_chain_increasing = np.zeros((self.chain_count, 2), dtype=bool)
+        self.is_chain_decreasing = np.zeros((self.chain_count, 2), dtype=bool)
+        # Per finger: the outer two joints are above (smaller y) or below all joints of the other fingers
+        self.is_outer_joints_above = np.zeros(self.finger_count, dtype=bool)
+        self.is_outer_joints_below = np.zeros(self.finger_count, dtype=bool)
+
+    def compute_tip_distances(self) -> None:
+        if self.is_tip_distances_computed:
+            return
+        self.is_tip_distances_computed = True
+
+        tips_percent = self.hand_finger_positions.percent[self.tip_indexes, :2]
+        tip_deltas = tips_percent[:, np.newaxis, :] - tips_percent[np.newaxis, :, :]
+        self.tip_distances = np.hypot(tip_deltas[..., 0], tip_deltas[..., 1])
+        self.thumb_tip_distances = self.tip_distances[self.thumb].tolist()
+
+    def compute_joint_order(self) -> None:
+        if self.is_joint_order_computed:
+            return
+        self.is_joint_order_computed = True
+
+        # Pixel deltas between neighboring joints of each chain, shape (chain count, 3, xy)
+        px = self.hand_finger_positions.px
+        chains_px_xy = px[self.joint_chains, :2]
+        joint_deltas = chains_px_xy[:, 1:] - chains_px_xy[:, :-1]
+        self.is_chain_increasing = joint_deltas.min(axis=1) >= 0
+        self.is_chain_decreasing = joint_deltas.max(axis=1) <= 0
+
+        # Vertical extents of the outer joints of each finger and of the joints of the other fingers
+        px_y = px[:, 1]
+        outer_joints_y = px_y[self.outer_joint_indexes]
+        other_fingers_y = px_y[self.other_finger_joint_indexes]
+        self.is_outer_joints_above = other_fingers_y.min(axis=1) > outer_joints_y.min(axis=1)
+        self.is_outer_joints_below = other_fingers_y.max(axis=1) < outer_joints_y.max(axis=1)
@@ -1,68 +1,111 @@
 from __future__ import annotations
-from typing import Any, List
-from itertools import chain
+from typing import Any, List, Union
+import numpy as np
+from .ArrayHandLandmarks import hand_landmarks_to_array
 from .Vector import Vector
 from .FingerPosition import FingerPosition
-import common.GestureRecognizer as GestureRecognizer
 
 class HandFingerPositions:
+    """ Landmarks of a hand as one float64 array of shape (21, 3) in percent of the frame size.
+    float64 keeps the values of the landmarks, thus distances compare with thresholds as with the previous Vectors.
+    The pixel positions are only computed when needed. Fingers are static slices of the landmark indexes.
+    FingerPositions (Vectors) for the existing gesture code are created on first access.
+    """
+    landmark_count = 21
+    wrist_index = 0
+    thumb_slice = slice(1, 5)
+    index_finger_slice = slice(5, 9)
+    middle_finger_slice = slice(9, 13)
+    ring_finger_slice = slice(13, 17)
+    pinky_finger_slice = slice(17, 21)
+    all_fingers_slice = slice(1, 21)
+    thumb_tip_index = 4
+    index_tip_index = 8
+    middle_tip_index = 12
+    ring_tip_index = 16
+    pinky_tip_index = 20
+
     def __init__(self, single_hand_landmarks: Any, capture_size: Vector) -> None:
         self.single_hand_landmarks = single_hand_landmarks
+        self.capture_size = capture_size
+        self.percent = hand_landmarks_to_array(single_hand_landmarks, np.float64)
+        self.px_or_none: Union[Any, None] = None
+        self.finger_positions_or_none: Union[List[FingerPosition], None] = None
+
+    @property
+    def px(self) -> Any:
+        """ Pixel positions as int32 array of shape (21, 3). """
+        if self.px_or_none is None:
+            scale = np.array([self.capture_size.x, self.capture_size.y, self.capture_size.z], dtype=np.float64)
+            self.px_or_none = (self.percent * scale).astype(np.int32)
+        return self.px_or_none
+
+    @property
+    def wrist_position(self) -> FingerPosition:
+        return self.get_finger_position_by_index(self.wrist_index)
+
+    @property
+    def thumb_finger_positions(self) -> List[FingerPosition]:
+        return self.get_finger_positions_by_slice(self.thumb_slice)
+
+    @property
+    def index_finger_positions(self) -> List[FingerPosition]:
+        return self.get_finger_positions_by_slice(self.index_finger_slice)
+
+    @property
+    def middle_finger_positions(self) -> List[FingerPosition]:
+        return self.get_finger_positions_by_slice(self.middle_finger_slice)
+
+    @property
+    def ring_finger_positions(self) -> List[FingerPosition]:
+        return self.get_finger_positions_by_slice(self.ring_finger_slice)
+
+    @property
+    def pinky_finger_positions(self) -> List[FingerPosition]:
+        return self.get_finger_positions_by_slice(self.pinky_finger_slice)
 
-        self.wrist_position = FingerPosition(single_hand_landmarks.landmark[GestureRecognizer.GestureRecognizer.wrist_index], capture_size)
-        self.thumb_finger_positions = self.get_finger_positions_from_hand_landmarks(GestureRecognizer.GestureRecognizer.thumb_finger_indexes, capture_size)
-        self.index_finger_positions = self.get_finger_positions_from_hand_landmarks(GestureRecognizer.GestureRecognizer.index_finger_indexes, capture_size)
-        self.middle_finger_positions = self.get_finger_positions_from_hand_landmarks(GestureRecognizer.GestureRecognizer.middle_finger_indexes, capture_size)
-        self.ring_finger_positions = self.get_finger_positions_from_hand_landmarks(GestureRecognizer.GestureRecognizer.ring_finger_indexes, capture_size)
-        self.pinky_finger_positions = self.get_finger_positions_from_hand_landmarks(GestureRecognizer.GestureRecognizer.pinky_finger_indexes, capture_size)
-
-        self.thumb_tip_position = self.thumb_finger_positions[-1]
-        self.index_tip_position = self.index_finger_positions[-1]
-        self.middle_tip_position = self.middle_finger_positions[-1]
-        self.ring_tip_position = self.ring_finger_positions[-1]
-        self.pinky_tip_position = self.pinky_finger_positions[-1]
-
-        self.all_finger_positions = list(chain.from_iterable([self.thumb_finger_positions,
-                                                              self.index_finger_positions,
-                                                              self.middle_finger_positions,
-                                                              self.ring_finger_positions,
-                                                              self.pinky_finger_positions]))
-
-        self.index_to_finger_position = {
-            0: self.wrist_position,
-            1: self.thumb_finger_positions[0],
-            2: self.thumb_finger_positions[1],
-            3: self.thumb_finger_positions[2],
-            4: self.thumb_finger_positions[3],
-
-            5: self.index_finger_positions[0],
-            6: self.index_finger_positions[1],
-            7: self.index_finger_positions[2],
-            8: self.index_finger_positions[3],
-
-            9: self.middle_finger_positions[0],
-            10: self.middle_finger_positions[1],
-            11: self.middle_finger_positions[2],
-            12: self.middle_finger_positions[3],
-
-            13: self.ring_finger_positions[0],
-            14: self.ring_finger_positions[1],
-            15: self.ring_finger_positions[2],
-            16: self.ring_finger_positions[3],
-
-            17: self.pinky_finger_positions[0],
-            18: self.pinky_finger_positions[1],
-            19: self.pinky_finger_positions[2],
-            20: self.pinky_finger_positions[3],
-        }
-
-    def get_finger_positions_from_hand_landmarks(self,
-                                                 finger_indexes: List[int],
-                                                 capture_size: Vector) -> List[FingerPosition]:
-        return [FingerPosition(self.single_hand_landmarks.landmark[i], capture_size) for i in finger_indexes]
+    @property
+    def all_finger_positions(self) -> List[FingerPosition]:
+        return self.get_finger_positions_by_slice(self.all_fingers_slice)
+
+    @property
+    def thumb_tip_position(self) -> FingerPosition:
+        return self.get_finger_position_by_index(self.thumb_tip_index)
+
+    @property
+    def index_tip_position(self) -> FingerPosition:
+        return self.get_finger_position_by_index(self.index_tip_index)
+
+    @property
+    def middle_tip_position(self) -> FingerPosition:
+        return self.get_finger_position_by_index(self.middle_tip_index)
+
+    @property
+    def ring_tip_position(self) -> FingerPosition:
+        return self.get_finger_position_by_index(self.ring_tip_index)
+
+    @property
+    def pinky_tip_position(self) -> FingerPosition:
+        return self.get_finger_position_by_index(self.pinky_tip_index)
+
+    def get_percent_vector(self, index: int) -> Vector:
+        percent_x, percent_y, percent_z = self.percent[index].tolist()
+        return Vector(percent_x, percent_y, percent_z)
 
     def get_finger_position_by_index(self, index: int) -> FingerPosition:
-        return self.index_to_finger_position[index]
+        return self.get_finger_positions()[index]
 
     def get_finger_positions_by_index(self, indexes: List[int]) -> List[FingerPosition]:
-        return [self.get_finger_position_by_index(index) for index in indexes]
+        finger_positions = self.get_finger_positions()
+        return [finger_positions[index] for index in indexes]
+
+    def get_finger_positions_by_slice(self, index_slice: slice) -> List[FingerPosition]:
+        return self.get_finger_positions()[index_slice]
+
+    def get_finger_positions(self) -> List[FingerPosition]:
+        """ Returns the FingerPositions of all landmarks. They are created together, on first access. """
+        if self.finger_positions_or_none is None:
+            self.finger_positions_or_none = [FingerPosition(Vector(percent_x, percent_y, percent_z), Vector(px_x, px_y, px_z))
+                                             for (percent_x, percent_y, percent_z), (px_x, px_y, px_z)
+                                             in zip(self.percent.tolist(), self.px.tolist())]
+        return self.finger_positions_or_none
@@ -0,0 +1,113 @@
+from __future__ import annotations
+from typing import Any, Callable, Tuple, Union
+import numpy as np
+from .Vector import Vector
+from .frame_util import get_frame_size
+
+class HandRegionTracker:
+    """ Restricts hand tracking to the region around the hand of the previous frame.
+    The region is the bounding box of the last landmarks plus a margin for hand motion.
+    It is kept as long as the hand stays well inside of it, and dropped (i.e. the full frame is used) when the hand is lost.
+    """
+    # The region is at least this fraction of the frame in each dimension. Tiny crops make detection unreliable.
+    min_region_size_percent = 0.3
+    # Regions that cover most of the frame are not worth cropping.
+    max_region_area_percent = 0.8
+
+    def __init__(self, margin_getter: Callable[[], float]) -> None:
+        # Margin relative to the size of the hand's bounding box
+        self.margin_getter = margin_getter
+        self.region: Union[HandRegion, None] = None
+        self.region_frame_count = 0
+        self.full_frame_count = 0
+        self.lost_hand_in_region_count = 0
+
+    def reset(self) -> None:
+        self.region = None
+
+    def crop(self, frame: Any) -> Any:
+        """ Returns the part of the frame that should be analyzed. Use get_crop_region to map results back. """
+        if self.region is None:
+            self.full_frame_count = self.full_frame_count + 1
+            return frame
+
+        self.region_frame_count = self.region_frame_count + 1
+        left, top, right, bottom = self.region.to_px(get_frame_size(frame))
+        return np.ascontiguousarray(frame[top:bottom, left:right])
+
+    def get_crop_region(self, frame: Any) -> Union[HandRegion, None]:
+        """ Returns the region that has been used by crop in frame percent, snapped to whole pixels. """
+        if self.region is None:
+            return None
+        frame_size = get_frame_size(frame)
+        left, top, right, bottom = self.region.to_px(frame_size)
+        return HandRegion(left / frame_size.x, top / frame_size.y, right / frame_size.x, bottom / frame_size.y)
+
+    def to_frame_landmarks(self, single_hand_landmarks: Any, crop_region: HandRegion) -> None:
+        """ Transforms landmarks from percent of the cropped region to percent of the full frame (in place). """
+        width = crop_region.right - crop_region.left
+        height = crop_region.bottom - crop_region.top
+        for landmark in single_hand_landmarks.landmark:
+            landmark.x = crop_region.left + landmark.x * width
+            landmark.y = crop_region.top + landmark.y * height
+            # Depth uses roughly the same scale as x
+            landmark.z = landmark.z * width
+
+    def update(self, single_hand_landmarks: Any) -> None:
+        """ Updates the region using the landmarks in frame percent, or None if no hand has been found. """
+        if single_hand_landmarks is None:
+            if self.region is not None:
+                self.lost_hand_in_region_count = self.lost_hand_in_region_count + 1
+            self.region = None
+            return
+
+        xs = [landmark.x for landmark in single_hand_landmarks.landmark]
+        ys = [landmark.y for landmark in single_hand_landmarks.landmark]
+        hand_box = HandRegion(min(xs), min(ys), max(xs), max(ys))
+
+        # Keep the current region while the hand stays well inside of it.
+        # Changing the region too often would disturb the tracking of mediapipe.
+        margin = self.margin_getter() * max(hand_box.get_width(), hand_box.get_height())
+        if (self.region is not None
+                and self.region.contains(hand_box.expand(margin / 4, margin / 4, 0))):
+            return
+
+        new_region = hand_box.expand(margin, margin, self.min_region_size_percent)
+        if new_region.get_width() * new_region.get_height() >= self.max_region_area_percent:
+            self.region = None
+        else:
+            self.region = new_region
+
+    def get_statistics_text(self) -> str:
+        return (f"region frames: {self.region_frame_count}, full frames: {self.full_frame_count}, "
+                f"hand lost in region: {self.lost_hand_in_region_count}")
+
+class HandRegion:
+    def __init__(self, left: float, top: float, right: float, bottom: float) -> None:
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def get_width(self) -> float:
+        return self.right - self.left
+
+    def get_height(self) -> float:
+        return self.bottom - self.top
+
+    def contains(self, other: HandRegion) -> bool:
+        return (self.left <= other.left and other.right <= self.right
+                and self.top <= other.top and other.bottom <= self.bottom)
+
+    def expand(self, margin_x: float, margin_y: float, min_size: float) -> HandRegion:
+        """ Returns a new region with the margin on each side and at least the min size, limited to the frame. """
+        half_width = max(self.get_width() / 2 + margin_x, min_size / 2)
+        half_height = max(self.get_height() / 2 + margin_y, min_size / 2)
+        center_x = (self.left + self.right) / 2
+        center_y = (self.top + self.bottom) / 2
+        return HandRegion(max(0, center_x - half_width), max(0, center_y - half_height),
+                          min(1, center_x + half_width), min(1, center_y + half_height))
+
+    def to_px(self, frame_size: Vector) -> Tuple[int, int, int, int]:
+        return (int(self.left * frame_size.x), int(self.top * frame_size.y),
+                int(self.right * frame_size.x), int(self.bottom * frame_size.y))
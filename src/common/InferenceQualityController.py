@@ -0,0 +1,130 @@
+from __future__ import annotations
+from typing import Any, Callable, Collection, Dict, List, Union
+from .LogHolder import LogHolder
+from .ReactiveProperty import ReactiveProperty
+from .Vector import Vector
+
+class InferenceQualityController(LogHolder):
+    """ Chooses the quality of the hand tracking such that the measured inference time fits into a time budget.
+    The quality is lowered as soon as the smoothed inference time exceeds the budget.
+    It is only raised again when the inference time is well below the budget for a while,
+    because changing the model options reloads the model.
+    Levels that only differ in options that the installed mediapipe does not support are the same level, thus they are merged.
+    """
+    smoothing_factor = 0.1
+    # Raise the quality if the inference time is below this share of the budget
+    raise_budget_share = 0.5
+    # Minimum time between two changes of the level
+    min_level_duration_ms = 3000
+    # Inference times after a level change that are not used, e.g. because the model is loaded
+    ignored_sample_count = 5
+
+    def __init__(self, inference_time_budget_ms_getter: Callable[[], float], supported_option_names: Union[Collection[str], None] = None) -> None:
+        super().__init__()
+        self.inference_time_budget_ms_getter = inference_time_budget_ms_getter
+        levels = [
+            # The defaults of mediapipe
+            InferenceQualityLevel(model_complexity=1, min_detection_confidence=0.5, min_tracking_confidence=0.5, inference_scale=1.0),
+            InferenceQualityLevel(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.5, inference_scale=1.0),
+            # A lower tracking confidence results in fewer runs of the palm detection
+            InferenceQualityLevel(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.3, inference_scale=0.75),
+            InferenceQualityLevel(model_complexity=0, min_detection_confidence=0.5, min_tracking_confidence=0.3, inference_scale=0.5),
+        ]
+        for level in levels:
+            level.supported_option_names = supported_option_names
+        self.levels = self.get_distinct_levels(levels)
+        self.level_index = ReactiveProperty(0)
+        self.mean_inference_time_ms = 0.0
+        self.sample_count = 0
+        self.last_level_change_time_ms = 0
+        self.level_change_count = 0
+
+    def get_distinct_levels(self, levels: List[InferenceQualityLevel]) -> List[InferenceQualityLevel]:
+        """ Leaves out the levels that are identical to a previous level once the unsupported options are left out.
+        For example, mediapipe 0.8.8 has no model_complexity, thus the first two levels would load the same model.
+        """
+        distinct_levels: List[InferenceQualityLevel] = []
+        for level in levels:
+            if any(level.is_same_level(distinct_level) for distinct_level in distinct_levels):
+                self.log.info(f"hand tracking quality level '{level}' is the same as a previous level with this version of mediapipe")
+                continue
+            distinct_levels.append(level)
+        return distinct_levels
+
+    def get_level(self) -> InferenceQualityLevel:
+        return self.levels[self.level_index.value]
+
+    def reset(self) -> bool:
+        """ Returns to the highest quality. Returns True if the level has changed. """
+        return self.set_level_index(0, 0)
+
+    def update(self, inference_time_ms: float, current_time_ms: int) -> bool:
+        """ Adds a measured inference time. Returns True if the level has changed. """
+        self.sample_count = self.sample_count + 1
+        if self.sample_count <= self.ignored_sample_count:
+            return False
+        if self.sample_count == self.ignored_sample_count + 1:
+            self.mean_inference_time_ms = inference_time_ms
+        else:
+            self.mean_inference_time_ms = (self.mean_inference_time_ms * (1 - self.smoothing_factor)
+                                           + inference_time_ms * self.smoothing_factor)
+
+        if self.last_level_change_time_ms + self.min_level_duration_ms > current_time_ms:
+            return False
+
+        budget_ms = self.inference_time_budget_ms_getter()
+        if self.mean_inference_time_ms > budget_ms and self.level_index.value < len(self.levels) - 1:
+            return self.set_level_index(self.level_index.value + 1, current_time_ms)
+        if self.mean_inference_time_ms < budget_ms * self.raise_budget_share and self.level_index.value > 0:
+            return self.set_level_index(self.level_index.value - 1, current_time_ms)
+        return False
+
+    def set_level_index(self, level_index: int, current_time_ms: int) -> bool:
+        if level_index == self.level_index.value:
+            return False
+        self.log.info(f"changing hand tracking quality to level {level_index}: {self.levels[level_index]} "
+                      f"(mean inference time: {self.mean_inference_time_ms:.1f} ms, budget: {self.inference_time_budget_ms_getter()} ms)")
+        self.level_change_count = self.level_change_count + 1
+        self.last_level_change_time_ms = current_time_ms
+        self.sample_count = 0
+        self.level_index.value = level_index
+        return True
+
+    def get_inference_size(self, inference_size: Vector) -> Vector:
+        inference_scale = self.get_level().inference_scale
+        if inference_scale == 1:
+            return inference_size
+        return Vector(int(inference_size.x * inference_scale), int(inference_size.y * inference_scale))
+
+    def get_statistics_text(self) -> str:
+        return (f"level: {self.level_index.value}, level changes: {self.level_change_count}, "
+                f"mean inference time: {self.mean_inference_time_ms:.1f} ms")
+
+class InferenceQualityLevel:
+    def __init__(self, model_complexity: int, min_detection_confidence: float, min_tracking_confidence: float, inference_scale: float) -> None:
+        self.model_complexity = model_complexity
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        # Factor of the configured inference size
+        self.inference_scale = inference_scale
+        # Options that are passed to mediapipe, None for all
+        self.supported_option_names: Union[Collection[str], None] = None
+
+    def get_hands_options(self) -> Dict[str, Any]:
+        hands_options = {
+            "max_num_hands": 1,
+            "model_complexity": self.model_complexity,
+            "min_detection_confidence": self.min_detection_confidence,
+            "min_tracking_confidence": self.min_tracking_confidence,
+        }
+        if self.supported_option_names is None:
+            return hands_options
+        return {name: value for name, value in hands_options.items() if name in self.supported_option_names}
+
+    def is_same_level(self, other: InferenceQualityLevel) -> bool:
+        return self.get_hands_options() == other.get_hands_options() and self.inference_scale == other.inference_scale
+
+    def __repr__(self) -> str:
+        model_complexity_text = self.model_complexity if self.supported_option_names is None or "model_complexity" in self.supported_option_names else "unsupported"
+        return (f"model complexity: {model_complexity_text}, detection confidence: {self.min_detection_confidence}, "
+                f"tracking confidence: {self.min_tracking_confidence}, inference scale: {self.inference_scale}")
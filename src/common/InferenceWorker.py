@@ -0,0 +1,151 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, List, Union
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+import multiprocessing
+import time
+import numpy as np
+from .ArrayHandLandmarks import ArrayHandLandmarks, hand_landmarks_to_array
+from .LogHolder import LogHolder
+
+def run_inference_worker(shared_memory_name: str,
+        connection: Connection,
+        hands_options: Dict[str, Any],
+        hands_factory: Union[Callable[[Dict[str, Any]], Any], None]) -> None:
+    """ Entry point of the worker process. Detects hand landmarks in the frames of the shared memory.
+    Requests are (height, width) of the frame in the shared memory. Responses are arrays of shape (hand count, 21, 3) or None.
+    The hands are created by the factory, mediapipe's Hands if None.
+    """
+    if hands_factory is None:
+        # Imported here, such that only the worker process loads mediapipe
+        from .mediapipe_util import create_mediapipe_hands # pylint: disable=import-outside-toplevel
+        hands_factory = create_mediapipe_hands
+    frame_memory = shared_memory.SharedMemory(name=shared_memory_name)
+    mediapipe_hands = hands_factory(hands_options)
+    try:
+        while True:
+            request = connection.recv()
+            if request is None:
+                break
+            height, width = request
+            frame: np.ndarray = np.ndarray((height, width, 3), dtype=np.uint8, buffer=frame_memory.buf)
+            multi_hand_landmarks = mediapipe_hands.process(frame).multi_hand_landmarks
+            if multi_hand_landmarks:
+                connection.send(np.stack([hand_landmarks_to_array(single_hand_landmarks) for single_hand_landmarks in multi_hand_landmarks]))
+            else:
+                connection.send(None)
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        mediapipe_hands.close()
+        frame_memory.close()
+
+class InferenceWorker(LogHolder):
+    """ Runs mediapipe hand tracking in a separate process, such that it does not compete for the GIL
+    with capture, gesture recognition and the GUI.
+    Frames are copied into shared memory, only their size and the resulting landmarks are sent through a pipe.
+    The worker is restarted when it crashes or does not respond.
+    The hands factory (mediapipe's Hands by default) can be replaced, e.g. by fake hands. It must be picklable.
+    """
+    # Loading the model takes a while
+    startup_timeout_seconds = 10.0
+    response_timeout_seconds = 2.0
+
+    def __init__(self, hands_options: Dict[str, Any], hands_factory: Union[Callable[[Dict[str, Any]], Any], None] = None) -> None:
+        super().__init__()
+        self.hands_options = hands_options
+        self.hands_factory = hands_factory
+        self.process: Union[multiprocessing.Process, None] = None
+        self.connection: Union[Connection, None] = None
+        self.frame_memory: Union[shared_memory.SharedMemory, None] = None
+        self.is_first_request = True
+        self.request_count = 0
+        self.failed_request_count = 0
+        self.restart_count = 0
+        self.total_round_trip_seconds = 0.0
+
+    def start(self, frame_byte_count: int) -> None:
+        self.frame_memory = shared_memory.SharedMemory(create=True, size=frame_byte_count)
+        self.connection, worker_connection = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(target=run_inference_worker,
+                                               args=(self.frame_memory.name, worker_connection, self.hands_options, self.hands_factory),
+                                               name="InferenceWorker",
+                                               daemon=True)
+        self.process.start()
+        worker_connection.close()
+        self.is_first_request = True
+        self.log.info(f"started inference worker (pid: {self.process.pid}, shared memory: {frame_byte_count} bytes)")
+
+    def stop(self) -> None:
+        if self.process is not None and self.connection is not None:
+            try:
+                self.connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            self.process.join(1)
+            if self.process.is_alive():
+                self.process.kill()
+                self.process.join()
+            self.log.info(f"stopped inference worker ({self.get_statistics_text()})")
+        if self.connection is not None:
+            self.connection.close()
+        if self.frame_memory is not None:
+            self.frame_memory.close()
+            self.frame_memory.unlink()
+        self.process = None
+        self.connection = None
+        self.frame_memory = None
+
+    def restart(self, frame_byte_count: int) -> None:
+        self.stop()
+        self.start(frame_byte_count)
+
+    def set_hands_options(self, hands_options: Dict[str, Any]) -> None:
+        """ The options are applied by restarting the worker with the next frame. """
+        if hands_options != self.hands_options:
+            self.hands_options = hands_options
+            self.stop()
+
+    def process_frame(self, frame: Any) -> Union[List[ArrayHandLandmarks], None]:
+        """ Returns the hand landmarks of the RGB frame in the form of mediapipe's multi_hand_landmarks.
+        Returns None if no hand has been found or the worker failed.
+        """
+        if self.frame_memory is None or self.frame_memory.size < frame.nbytes:
+            self.restart(frame.nbytes)
+        elif self.process is None or not self.process.is_alive():
+            self.log.warning(f"inference worker is not running (exit code: {self.process.exitcode if self.process else None}), restarting it")
+            self.restart_count = self.restart_count + 1
+            self.restart(self.frame_memory.size)
+
+        # The frame may be a view of a larger frame (e.g. the hand region), copyto handles the strides
+        height, width = frame.shape[0], frame.shape[1]
+        np.copyto(np.ndarray((height, width, 3), dtype=np.uint8, buffer=self.frame_memory.buf), frame) # type: ignore
+
+        start_time_seconds = time.perf_counter()
+        self.request_count = self.request_count + 1
+        timeout_seconds = self.startup_timeout_seconds if self.is_first_request else self.response_timeout_seconds
+        try:
+            self.connection.send((height, width)) # type: ignore
+            if not self.connection.poll(timeout_seconds): # type: ignore
+                raise TimeoutError(f"no response within {timeout_seconds} s")
+            multi_hand_landmarks_array = self.connection.recv() # type: ignore
+        except (EOFError, OSError, TimeoutError) as e:
+            # Restarted with the next frame
+            self.log.warning(f"inference worker failed: {type(e).__name__} {str(e)}")
+            self.failed_request_count = self.failed_request_count + 1
+            if self.process is not None:
+                self.process.kill()
+                self.process.join()
+            return None
+        self.is_first_request = False
+        self.total_round_trip_seconds = self.total_round_trip_seconds + time.perf_counter() - start_time_seconds
+
+        if multi_hand_landmarks_array is None:
+            return None
+        return [ArrayHandLandmarks(landmarks) for landmarks in multi_hand_landmarks_array]
+
+    def get_statistics_text(self) -> str:
+        successful_request_count = self.request_count - self.failed_request_count
+        mean_round_trip_ms = 1000 * self.total_round_trip_seconds / successful_request_count if successful_request_count > 0 else 0
+        return (f"requests: {self.request_count}, failed: {self.failed_request_count}, restarts: {self.restart_count}, "
+                f"mean round trip: {mean_round_trip_ms:.1f} ms")
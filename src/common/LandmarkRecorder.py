@@ -0,0 +1,81 @@
+from __future__ import annotations
+from typing import Any, BinaryIO, Union
+import struct
+import numpy as np
+from .ArrayHandLandmarks import hand_landmarks_to_array
+from .LogHolder import LogHolder
+from .Vector import Vector
+
+# One record per analyzed frame. Landmarks are in percent of the frame, as returned by mediapipe.
+landmark_record_dtype = np.dtype([
+    ("time_ms", "<i8"),
+    ("has_hand", "?"),
+    ("capture_width", "<i4"),
+    ("capture_height", "<i4"),
+    ("landmarks", "<f4", (21, 3)),
+])
+
+# Fixed size of the npy header, such that the record count can be rewritten in place.
+npy_header_size = 256
+
+def write_npy_header(file: BinaryIO, record_count: int) -> None:
+    header = repr({"descr": np.lib.format.dtype_to_descr(landmark_record_dtype), "fortran_order": False, "shape": (record_count,)})
+    # Magic string (6 bytes), version (2 bytes), header length (2 bytes), header ending with a newline
+    header = header.ljust(npy_header_size - 10 - 1) + "\n"
+    file.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1"))
+
+def load_landmark_records(file_path: str) -> Any:
+    """ Memory-maps the records of a landmark recording.
+    The record count is derived from the file size, such that recordings that have not been closed properly can be loaded as well.
+    """
+    with open(file_path, mode="rb") as file:
+        np.lib.format.read_magic(file)
+        _, _, dtype = np.lib.format.read_array_header_1_0(file)
+        if dtype != landmark_record_dtype:
+            raise Exception(f"'{file_path}' is not a landmark recording")
+        data_offset = file.tell()
+        file.seek(0, 2)
+        record_count = (file.tell() - data_offset) // landmark_record_dtype.itemsize
+    if record_count <= 0:
+        return np.zeros(0, dtype=landmark_record_dtype)
+    return np.memmap(file_path, dtype=landmark_record_dtype, mode="r", offset=data_offset, shape=(record_count,))
+
+class LandmarkRecorder(LogHolder):
+    """ Records the hand landmarks of each analyzed frame into an npy file of landmark_record_dtype.
+    Records are appended as they come. The record count in the header is updated on close.
+    """
+    def __init__(self, file_path: str) -> None:
+        super().__init__()
+        self.file_path = file_path
+        # Open until close, as records are appended frame by frame
+        self.file: Union[BinaryIO, None] = open(file_path, mode="wb") # pylint: disable=consider-using-with
+        write_npy_header(self.file, 0)
+        self.record = np.zeros(1, dtype=landmark_record_dtype)
+        self.record_count = 0
+        self.log.info(f"started landmark recording to '{file_path}'")
+
+    def add_record(self, time_ms: int, single_hand_landmarks: Any, capture_size: Vector) -> None:
+        if self.file is None:
+            return
+
+        record = self.record[0]
+        record["time_ms"] = time_ms
+        record["has_hand"] = single_hand_landmarks is not None
+        record["capture_width"] = capture_size.x
+        record["capture_height"] = capture_size.y
+        if single_hand_landmarks is not None:
+            record["landmarks"] = hand_landmarks_to_array(single_hand_landmarks)
+        else:
+            record["landmarks"] = 0
+        self.file.write(self.record.tobytes())
+        self.record_count = self.record_count + 1
+
+    def close(self) -> None:
+        if self.file is None:
+            return
+
+        self.file.seek(0)
+        write_npy_header(self.file, self.record_count)
+        self.file.close()
+        self.file = None
+        self.log.info(f"finished landmark recording to '{self.file_path}' (records: {self.record_count})")
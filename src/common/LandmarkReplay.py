@@ -0,0 +1,64 @@
+from __future__ import annotations
+from typing import Any
+import time
+import common.AppContext as AppContext
+from .ArrayHandLandmarks import ArrayHandLandmarks
+from .LandmarkRecorder import load_landmark_records
+from .LogHolder import LogHolder
+from .Vector import Vector
+from .util import set_time_source_ms
+
+class LandmarkReplay(LogHolder):
+    """ Feeds recorded landmarks into the GestureRecognizer without running hand tracking.
+    The clock of get_time_ms is replaced by the recorded timestamps, thus gestures are recognized as in the original session,
+    independent of the replay speed.
+    """
+    def __init__(self, app_context: AppContext.AppContext, file_path: str) -> None:
+        super().__init__()
+        self.app_context = app_context
+        self.file_path = file_path
+        self.records = load_landmark_records(file_path)
+        self.current_time_ms = 0
+        self.replayed_frame_count = 0
+        self.replay_duration_seconds = 0.0
+
+    def run(self, speed: float) -> None:
+        """ Replays all records. A speed of 1 uses the original timing, a non-positive speed replays as fast as possible. """
+        if len(self.records) == 0:
+            self.log.warning(f"no records in '{self.file_path}'")
+            return
+
+        first_time_ms = int(self.records["time_ms"][0])
+        self.log.info(f"replaying {len(self.records)} records of '{self.file_path}' (speed: {speed})")
+        set_time_source_ms(lambda: self.current_time_ms)
+        start_time_seconds = time.monotonic()
+        try:
+            for record in self.records:
+                time_ms = int(record["time_ms"])
+                if speed > 0:
+                    remaining_seconds = start_time_seconds + (time_ms - first_time_ms) / 1000 / speed - time.monotonic()
+                    if remaining_seconds > 0:
+                        time.sleep(remaining_seconds)
+
+                self.current_time_ms = time_ms
+                self.replay_record(record)
+                self.replayed_frame_count = self.replayed_frame_count + 1
+        finally:
+            set_time_source_ms(None)
+            self.replay_duration_seconds = time.monotonic() - start_time_seconds
+
+        self.log.info(f"replay finished ({self.get_statistics_text()})")
+
+    def replay_record(self, record: Any) -> None:
+        webcam_control = self.app_context.webcam_control
+        capture_size = Vector(int(record["capture_width"]), int(record["capture_height"]))
+        if capture_size != webcam_control.actual_capture_size:
+            webcam_control.actual_capture_size = capture_size
+        multi_hand_landmarks = [ArrayHandLandmarks(record["landmarks"])] if record["has_hand"] else None
+        self.app_context.gesture_recognizer.process_multi_hand_landmarks(multi_hand_landmarks)
+
+    def get_statistics_text(self) -> str:
+        fps = self.replayed_frame_count / self.replay_duration_seconds if self.replay_duration_seconds > 0 else 0
+        recorded_duration_seconds = (int(self.records["time_ms"][-1]) - int(self.records["time_ms"][0])) / 1000 if len(self.records) > 0 else 0
+        return (f"replayed frames: {self.replayed_frame_count}, recorded duration: {recorded_duration_seconds:.1f} s, "
+                f"replay duration: {self.replay_duration_seconds:.2f} s, {fps:.0f} fps")
@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import Any, Callable, Union
+
+class MjpegStreamParser:
+    """ Incremental parser for multipart/x-mixed-replace (MJPEG) streams.
+    Bytes are appended to a single buffer. Part boundaries are searched from the end of the buffer,
+    such that only the most recent complete part is handed out and older complete parts are skipped without being copied.
+    """
+    max_buffer_size = 16 * 1024 * 1024
+
+    def __init__(self, boundary: str) -> None:
+        # Some servers already include the leading dashes in the boundary parameter.
+        self.delimiter = b"--" + boundary.strip('"').lstrip("-").encode("latin-1")
+        self.buffer = bytearray()
+        self.complete_part_count = 0
+        self.skipped_part_count = 0
+
+    @staticmethod
+    def get_boundary(content_type: str) -> Union[str, None]:
+        if not content_type.lower().startswith("multipart/x-mixed-replace"):
+            return None
+        for parameter in content_type.split(";")[1:]:
+            name, _, value = parameter.strip().partition("=")
+            if name.lower() == "boundary" and value:
+                return value
+        return None
+
+    def feed(self, data: bytes, part_body_consumer: Callable[[memoryview], Any]) -> Any:
+        """ Appends data and passes the body of the most recent complete part (if any) to the consumer.
+        The memoryview is only valid during the call of the consumer. Returns the consumer's result or None.
+        """
+        self.buffer.extend(data)
+
+        # A part is complete when the delimiter of the following part has been received.
+        last_delimiter_index = self.buffer.rfind(self.delimiter)
+        if last_delimiter_index <= 0:
+            self.discard_oversized_buffer()
+            return None
+        previous_delimiter_index = self.buffer.rfind(self.delimiter, 0, last_delimiter_index)
+        if previous_delimiter_index < 0:
+            # Only preamble before the first part
+            del self.buffer[:last_delimiter_index]
+            return None
+
+        skipped_part_count = self.buffer.count(self.delimiter, 0, previous_delimiter_index)
+        self.skipped_part_count = self.skipped_part_count + skipped_part_count
+        self.complete_part_count = self.complete_part_count + skipped_part_count + 1
+
+        result = None
+        headers_end_index = self.buffer.find(b"\r\n\r\n", previous_delimiter_index, last_delimiter_index)
+        if headers_end_index >= 0:
+            body_start_index = headers_end_index + 4
+            body_end_index = last_delimiter_index
+            # Remove the line break in front of the next delimiter
+            while body_end_index > body_start_index and self.buffer[body_end_index - 1] in (0x0d, 0x0a):
+                body_end_index = body_end_index - 1
+            with memoryview(self.buffer) as buffer_view:
+                with buffer_view[body_start_index:body_end_index] as part_body_view:
+                    result = part_body_consumer(part_body_view)
+
+        # Keep only the incomplete part that follows
+        del self.buffer[:last_delimiter_index]
+        return result
+
+    def discard_oversized_buffer(self) -> None:
+        if len(self.buffer) > self.max_buffer_size:
+            self.buffer.clear()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+from typing import Any, Union
+import http.client
+import time
+from urllib.parse import urlsplit
+from .FrameRingBuffer import FrameRingBuffer
+from .FrameSource import FrameSource
+from .MjpegStreamParser import MjpegStreamParser
+from .ReducedJpegDecoder import ReducedJpegDecoder
+from .Vector import Vector
+
+class MjpegStreamReader(FrameSource):
+    """ Reads an MJPEG (multipart/x-mixed-replace) stream from an IP webcam.
+    Reads whatever bytes are available from the socket and only decodes the most recent complete JPEG,
+    thus stale frames are dropped before they are decoded.
+    """
+    # Large enough to fetch all frames that are queued in the socket with a single read.
+    read_size = 1024 * 1024
+    connection_timeout_seconds = 5
+    reconnect_delay_seconds = 0.5
+
+    def __init__(self, url: str, frame_ring_buffer: FrameRingBuffer, jpeg_decoder: ReducedJpegDecoder) -> None:
+        super().__init__(frame_ring_buffer)
+        self.url = url
+        self.jpeg_decoder = jpeg_decoder
+        self.connection: Union[http.client.HTTPConnection, None] = None
+        self.response: Union[http.client.HTTPResponse, None] = None
+        self.parser: Union[MjpegStreamParser, None] = None
+        self.received_byte_count = 0
+        self.decoded_frame_count = 0
+        self.error_count = 0
+
+    def open(self) -> bool:
+        """ Connects to the URL. Returns False if the URL does not provide an MJPEG stream. """
+        url_parts = urlsplit(self.url)
+        if url_parts.scheme not in ("http", "https"):
+            return False
+
+        path = url_parts.path or "/"
+        if url_parts.query:
+            path = f"{path}?{url_parts.query}"
+        connection_class = http.client.HTTPSConnection if url_parts.scheme == "https" else http.client.HTTPConnection
+        connection = connection_class(url_parts.hostname or "localhost", url_parts.port, timeout=self.connection_timeout_seconds)
+        self.connection = connection
+        try:
+            connection.request("GET", path)
+            response = connection.getresponse()
+            self.response = response
+            boundary = MjpegStreamParser.get_boundary(response.getheader("Content-Type", ""))
+            if response.status != 200 or boundary is None:
+                self.log.info(f"'{self.url}' does not provide an MJPEG stream (status: {response.status}, content type: {response.getheader('Content-Type')})")
+                self.close()
+                return False
+        except Exception:
+            self.close()
+            raise
+
+        self.parser = MjpegStreamParser(boundary)
+        self.log.info(f"opened MJPEG stream of '{self.url}'")
+        return True
+
+    def close(self) -> None:
+        if self.connection:
+            self.connection.close()
+        self.connection = None
+        self.response = None
+
+    def stop(self) -> None:
+        self.is_running = False
+        # Closing the connection unblocks a pending read
+        self.close()
+        super().stop()
+
+    def run(self) -> None:
+        self.log.info("started MJPEG stream reader")
+        while self.is_running:
+            try:
+                if self.response is None and not self.open():
+                    raise Exception("not an MJPEG stream")
+                response = self.response
+                parser = self.parser
+                if response is None or parser is None:
+                    break
+                data = response.read1(self.read_size)
+                if not data:
+                    raise Exception("end of stream")
+                self.received_byte_count = self.received_byte_count + len(data)
+
+                frame = parser.feed(data, self.decode_part_body)
+                if frame is not None:
+                    self.decoded_frame_count = self.decoded_frame_count + 1
+                    self.error_message = None
+                    self.frame_ring_buffer.publish(self.frame_ring_buffer.get_write_slot_index(), frame)
+            except Exception as e:
+                if not self.is_running:
+                    break
+                self.error_count = self.error_count + 1
+                self.error_message = f"Could not read MJPEG stream of '{self.url}'"
+                self.log.warning(f"{self.error_message}: {str(e)}")
+                self.close()
+                time.sleep(self.reconnect_delay_seconds)
+        self.log.info(f"MJPEG stream reader finished ({self.get_statistics_text()})")
+
+    def get_statistics_text(self) -> str:
+        complete_part_count = self.parser.complete_part_count if self.parser else 0
+        skipped_part_count = self.parser.skipped_part_count if self.parser else 0
+        return (f"received: {self.received_byte_count / (1024 * 1024):.1f} MiB, "
+                f"complete parts: {complete_part_count}, skipped parts: {skipped_part_count}, "
+                f"decoded frames: {self.decoded_frame_count}, errors: {self.error_count}")
+
+    def decode_part_body(self, part_body: memoryview) -> Any:
+        # The decoder must not keep a reference to the memoryview
+        return self.jpeg_decoder.decode(part_body)
+
+    def get_native_frame_size(self, frame: Any) -> Vector:
+        return self.jpeg_decoder.native_frame_size or super().get_native_frame_size(frame)
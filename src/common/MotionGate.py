@@ -0,0 +1,59 @@
+from __future__ import annotations
+from typing import Any, Callable, Union
+from cv2 import cv2
+import numpy as np
+from .LogHolder import LogHolder
+
+class MotionGate(LogHolder):
+    """ Cheap check whether hand tracking is needed for a frame.
+    The frame is reduced to a tiny grayscale image and compared to a slowly adapting background.
+    When no hand has been present in the last frame and the scene is static, inference can be skipped.
+    Then the scene is only re-checked by inference at a lower rate.
+    """
+    gate_width = 32
+    gate_height = 24
+    # How fast the background adapts to changes of the scene (e.g. lighting)
+    background_learning_rate = 0.05
+
+    def __init__(self, threshold_getter: Callable[[], float], recheck_interval_ms_getter: Callable[[], int]) -> None:
+        super().__init__()
+        # Mean absolute difference to the background in gray levels (0 to 255)
+        self.threshold_getter = threshold_getter
+        self.recheck_interval_ms_getter = recheck_interval_ms_getter
+        self.background: Union[Any, None] = None
+        self.last_inference_time_ms = 0
+        self.last_difference = 0.0
+        # hit: inference skipped, miss: inference needed
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def reset(self) -> None:
+        self.background = None
+
+    def is_inference_needed(self, frame: Any, was_hand_present: bool, current_time_ms: int) -> bool:
+        small_frame = cv2.resize(frame, (self.gate_width, self.gate_height), interpolation=cv2.INTER_AREA)
+        small_gray_frame = cv2.cvtColor(small_frame, cv2.COLOR_RGB2GRAY).astype(np.float32)
+
+        if self.background is None or self.background.shape != small_gray_frame.shape:
+            self.background = small_gray_frame
+            self.last_difference = 0
+            is_scene_changed = True
+        else:
+            self.last_difference = float(np.mean(np.abs(small_gray_frame - self.background)))
+            is_scene_changed = self.last_difference > self.threshold_getter()
+            cv2.accumulateWeighted(small_gray_frame, self.background, self.background_learning_rate)
+
+        if (was_hand_present
+                or is_scene_changed
+                or self.last_inference_time_ms + self.recheck_interval_ms_getter() <= current_time_ms):
+            self.miss_count = self.miss_count + 1
+            self.last_inference_time_ms = current_time_ms
+            return True
+
+        self.hit_count = self.hit_count + 1
+        return False
+
+    def get_statistics_text(self) -> str:
+        total_count = self.hit_count + self.miss_count
+        hit_percent = 100 * self.hit_count / total_count if total_count > 0 else 0
+        return f"skipped inferences: {self.hit_count} ({hit_percent:.1f}%), inferences: {self.miss_count}"
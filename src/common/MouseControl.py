@@ -18,6 +18,11 @@ from .util import limit_float
 pyautogui.PAUSE = 0
 
 class MouseControl(LogHolder):
+    # The relative positioning has been tuned for this frame rate. Other frame rates result in the same mouse speed.
+    reference_frame_interval_seconds = 1 / 30
+    # Consecutive frames can have the same millisecond timestamp, e.g. at high frame rates
+    min_delta_time_seconds = 0.001
+
     def __init__(self, app_context: AppContext.AppContext):
         super().__init__()
         self.app_context = app_context
@@ -47,6 +52,10 @@ class MouseControl(LogHolder):
         self.is_drag_started = False
         self.last_single_left_click_time_ms = 0
 
+        # When disabled, the mouse is not touched and its position is only simulated (e.g. when replaying recorded landmarks)
+        self.is_output_enabled = True
+        self.simulated_mouse_position = Vector(0, 0)
+
         self.performed_action_desciption = Subject()
 
         # Log all performed actions
@@ -60,7 +69,7 @@ class MouseControl(LogHolder):
 
     def _handle_new_mouse_position_via_absolute_positioning(self, new_mouse_px: Vector) -> None:
         if self.config.is_control_mouse_position.value and not self.config.is_all_control_disabled.value:
-            delta_time_seconds = (get_time_ms() - self.last_mouse_position_time_ms) / 1000
+            delta_time_seconds = self.get_delta_time_seconds()
             current_pos = self._get_mouse_position()
             smooth_mouse_x = self.mouse_x_pid_control.get_next_value(current_pos.x, new_mouse_px.x, delta_time_seconds)
             smooth_mouse_y = self.mouse_y_pid_control.get_next_value(current_pos.y, new_mouse_px.y, delta_time_seconds)
@@ -72,19 +81,24 @@ class MouseControl(LogHolder):
         if self.config.is_control_mouse_position.value and not self.config.is_all_control_disabled.value:
             if not self.last_mouse_position:
                 self.last_mouse_position = new_mouse_px
+                self.last_mouse_position_time_ms = get_time_ms()
                 return
 
             mouse_position_difference = new_mouse_px.subtract(self.last_mouse_position)
             if mouse_position_difference.magnitude() <= min_distance_px:
                 return
-            delta_time_seconds = (get_time_ms() - self.last_mouse_position_time_ms) / 1000
+            delta_time_seconds = self.get_delta_time_seconds()
 
             reduced_mouse_position_difference = mouse_position_difference.scale_by_scalar(1 - self.config.min_mouse_position_difference_percent.value)
+            # The difference that the hand would have moved in one reference frame interval.
+            # Thus the non-linear scaling does not depend on the frame rate.
+            reference_frame_difference_magnitude = (reduced_mouse_position_difference.magnitude()
+                                                    * self.reference_frame_interval_seconds / delta_time_seconds)
             # limit square root to avoid div by zero
-            reduced_mouse_position_difference_magniture_square_root = limit_float(sqrt(reduced_mouse_position_difference.magnitude()), 0.000001, None)
+            reduced_mouse_position_difference_magniture_square_root = limit_float(sqrt(reference_frame_difference_magnitude), 0.000001, None)
             smooth_mouse_difference = (reduced_mouse_position_difference
                                        .scale_by_scalar(1 / reduced_mouse_position_difference_magniture_square_root)
-                                       .scale_by_scalar(1 / delta_time_seconds)
+                                       .scale_by_scalar(1 / self.reference_frame_interval_seconds)
                                        .scale_by_scalar(self.config.mouse_position_difference_sensitivity.value))
 
             current_pos = self._get_mouse_position()
@@ -93,6 +107,12 @@ class MouseControl(LogHolder):
             self.last_mouse_position = new_mouse_px
             self.last_mouse_position_time_ms = get_time_ms()
 
+    def reset_last_mouse_position(self) -> None:
+        self.last_mouse_position = None
+
+    def get_delta_time_seconds(self) -> float:
+        return max((get_time_ms() - self.last_mouse_position_time_ms) / 1000, self.min_delta_time_seconds)
+
     def on_single_click_detected(self, mouse_button: MouseButton) -> None:
         if self.is_drag_started:
             self.performed_action_desciption.on_next(f"{mouse_button.name.lower()} click, but ongoing drag")
@@ -171,6 +191,8 @@ class MouseControl(LogHolder):
             self.performed_action_desciption.on_next(f"scrolling failed (horizontal:{x}, vertical:{y}): {str(e)}")
 
     def _do_click(self, mouse_button: MouseButton) -> None:
+        if not self.is_output_enabled:
+            return
         if mouse_button == MouseButton.LEFT:
             pyautogui.click(button=pyautogui.LEFT)
         if mouse_button == MouseButton.RIGHT:
@@ -179,12 +201,18 @@ class MouseControl(LogHolder):
             pyautogui.click(button=pyautogui.MIDDLE)
 
     def _do_start_drag(self) -> None:
+        if not self.is_output_enabled:
+            return
         pyautogui.mouseDown(button=pyautogui.LEFT)
 
     def _do_end_drag(self) -> None:
+        if not self.is_output_enabled:
+            return
         pyautogui.mouseUp(button=pyautogui.LEFT)
 
     def _do_scroll(self, x: int, y: int) -> None:
+        if not self.is_output_enabled:
+            return
         if x != 0:
             # Horizontal scrolling not yet supported.
             pass
@@ -204,10 +232,15 @@ class MouseControl(LogHolder):
         return "diagonal"
 
     def _get_mouse_position(self) -> Vector:
+        if not self.is_output_enabled:
+            return self.simulated_mouse_position
         x, y = pyautogui.position()
         return Vector(x, y)
 
     def _set_mouse_position(self, new_pos: Vector) -> None:
+        if not self.is_output_enabled:
+            self.simulated_mouse_position = new_pos
+            return
         pyautogui.moveTo(int(new_pos.x), int(new_pos.y))
 
 class MouseButton(Enum):
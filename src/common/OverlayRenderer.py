@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import Any, List, Tuple, Union
+from cv2 import cv2
+import numpy as np
+from .Config import Config
+from .Config import MousePositioningMode
+from .FrameOverlay import FrameOverlay
+from .frame_util import get_frame_size
+
+class OverlayRenderer:
+    """ Draws the FrameOverlay of the analyzed frame and static elements (the motion border) onto the preview.
+    The geometry of the motion border is only computed when the frame size or the border config changes.
+    """
+    motion_border_color = (127, 127, 127)
+    motion_border_thickness = 2
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.motion_border_key: Union[Tuple[Any, ...], None] = None
+        self.motion_border_segments: List[Any] = []
+        self.rendered_frame_count = 0
+
+    def render(self, frame: Any, frame_overlay: FrameOverlay) -> None:
+        frame_size = get_frame_size(frame)
+        if self.config.mouse_positioning_mode.value == MousePositioningMode.ABSOLUTE:
+            self.draw_motion_border(frame)
+        frame_overlay.draw(frame, frame_size)
+        self.rendered_frame_count = self.rendered_frame_count + 1
+
+    def draw_motion_border(self, frame: Any) -> None:
+        key = (frame.shape[1], frame.shape[0],
+               self.config.motion_border_left.value, self.config.motion_border_right.value,
+               self.config.motion_border_top.value, self.config.motion_border_bottom.value)
+        if key != self.motion_border_key:
+            self.motion_border_key = key
+            self.motion_border_segments = self.create_motion_border_segments(*key)
+        cv2.polylines(frame, self.motion_border_segments, False, self.motion_border_color, self.motion_border_thickness)
+
+    def create_motion_border_segments(self, width: int, height: int, left: float, right: float, top: float, bottom: float) -> List[Any]:
+        left_x = int(left * width)
+        right_x = int(width - right * width)
+        top_y = int(top * height)
+        bottom_y = int(height - bottom * height)
+        segments = [
+            # motion border frame
+            [(left_x, top_y), (left_x, bottom_y)],
+            [(right_x, top_y), (right_x, bottom_y)],
+            [(left_x, top_y), (right_x, top_y)],
+            [(left_x, bottom_y), (right_x, bottom_y)],
+            # vertical to edges
+            [(0, 0), (left_x, top_y)],
+            [(width, 0), (right_x, top_y)],
+            [(0, height), (left_x, bottom_y)],
+            [(width, height), (right_x, bottom_y)],
+        ]
+        return [np.array(segment, dtype=np.int32) for segment in segments]
@@ -0,0 +1,71 @@
+from __future__ import annotations
+from typing import Any, Callable, Union
+import threading
+import time
+from .DropOldestQueue import DropOldestQueue
+from .LogHolder import LogHolder
+
+class PipelineStage(LogHolder):
+    """ Runs one step of the analysis on its own thread.
+    Items are taken from the input (e.g. a DropOldestQueue), processed, and the result is put into the output queue.
+    A result of None is not passed on, e.g. when the item has been consumed by the last stage.
+    """
+    # Time to wait for an input item before checking whether the stage has been stopped
+    input_timeout_seconds = 0.1
+
+    def __init__(self,
+                 name: str,
+                 get_input: Callable[[float], Any],
+                 process_item: Callable[[Any], Any],
+                 output_queue: Union[DropOldestQueue, None]) -> None:
+        super().__init__()
+        self.name = name
+        self.get_input = get_input
+        self.process_item = process_item
+        self.output_queue = output_queue
+        self.is_running = False
+        self.thread: Union[threading.Thread, None] = None
+        self.processed_item_count = 0
+        self.failed_item_count = 0
+        self.total_process_seconds = 0.0
+        self.max_process_seconds = 0.0
+
+    def start(self) -> None:
+        self.is_running = True
+        self.thread = threading.Thread(target=self.run, name=f"PipelineStage-{self.name}", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.is_running = False
+        if self.thread is not None:
+            # The stage ends after its current item, thus it cannot run twice after a restart
+            self.thread.join()
+            self.thread = None
+
+    def run(self) -> None:
+        while self.is_running:
+            item = self.get_input(self.input_timeout_seconds)
+            if item is None:
+                continue
+
+            start_time_seconds = time.perf_counter()
+            try:
+                result = self.process_item(item)
+            except Exception:
+                # A single failing item must not stop the analysis
+                self.failed_item_count = self.failed_item_count + 1
+                self.log.exception(f"pipeline stage {self.name} failed to process an item")
+                continue
+            process_seconds = time.perf_counter() - start_time_seconds
+            self.processed_item_count = self.processed_item_count + 1
+            self.total_process_seconds = self.total_process_seconds + process_seconds
+            self.max_process_seconds = max(self.max_process_seconds, process_seconds)
+
+            if result is not None and self.output_queue is not None:
+                self.output_queue.put(result)
+
+    def get_statistics_text(self) -> str:
+        mean_process_ms = 1000 * self.total_process_seconds / self.processed_item_count if self.processed_item_count > 0 else 0
+        dropped_text = f", dropped output: {self.output_queue.dropped_count}" if self.output_queue is not None else ""
+        return (f"{self.name}: items: {self.processed_item_count}, failed: {self.failed_item_count}, "
+                f"mean: {mean_process_ms:.2f} ms, max: {1000 * self.max_process_seconds:.1f} ms{dropped_text}")
@@ -0,0 +1,28 @@
+from __future__ import annotations
+from typing import Any, Callable, Union
+from cv2 import cv2
+import numpy as np
+from .Vector import Vector
+from .frame_util import get_frame_size, get_jpeg_reduction_factor, jpeg_reduction_factor_to_imread_flag
+
+class ReducedJpegDecoder:
+    """ Decodes JPEGs directly at a reduced resolution (cv2.IMREAD_REDUCED_COLOR_X) when the frames are larger than needed for inference.
+    The first JPEG is decoded at full resolution to learn the native frame size.
+    """
+    def __init__(self, inference_size_getter: Callable[[], Vector]) -> None:
+        self.inference_size_getter = inference_size_getter
+        self.native_frame_size: Union[Vector, None] = None
+        self.reduction_factor = 1
+
+    def decode(self, data: Any) -> Any:
+        reduction_factor = 1
+        if self.native_frame_size:
+            reduction_factor = get_jpeg_reduction_factor(self.native_frame_size, self.inference_size_getter())
+
+        frame = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), jpeg_reduction_factor_to_imread_flag[reduction_factor])
+        if frame is None:
+            return None
+
+        self.reduction_factor = reduction_factor
+        self.native_frame_size = get_frame_size(frame).scale_by_scalar(reduction_factor)
+        return frame
@@ -0,0 +1,185 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
+import ssl
+from urllib.parse import urlsplit
+from .FrameRingBuffer import FrameRingBuffer
+from .FrameSource import FrameSource
+from .ReducedJpegDecoder import ReducedJpegDecoder
+from .Vector import Vector
+
+class SnapshotFetcher(FrameSource):
+    """ Fetches JPEG snapshots (e.g. 'http://.../shot.jpg' of an IP webcam app) via asyncio.
+    Uses persistent HTTP/1.1 connections with one request in flight per connection.
+    Snapshots that are unchanged (same ETag or same bytes) or older than the newest published snapshot are skipped.
+    """
+    response_timeout_seconds = 5
+    reconnect_delay_seconds = 0.5
+    unchanged_snapshot_delay_seconds = 0.01
+
+    def __init__(self, url: str, frame_ring_buffer: FrameRingBuffer, jpeg_decoder: ReducedJpegDecoder, connection_count: int = 2) -> None:
+        super().__init__(frame_ring_buffer)
+        self.url = url
+        self.jpeg_decoder = jpeg_decoder
+        self.connection_count = max(1, connection_count)
+        self.loop: Union[asyncio.AbstractEventLoop, None] = None
+        self.fetch_task: Union[asyncio.Future, None] = None
+
+        self.next_request_sequence = 0
+        self.latest_published_request_sequence = -1
+        self.last_etag: Union[str, None] = None
+        self.last_body: Union[bytes, None] = None
+
+        self.response_count = 0
+        self.unchanged_snapshot_count = 0
+        self.outdated_snapshot_count = 0
+        self.decoded_snapshot_count = 0
+        self.connection_count_opened = 0
+        self.error_count = 0
+
+    def stop(self) -> None:
+        self.is_running = False
+        if self.loop and self.fetch_task:
+            self.loop.call_soon_threadsafe(self.fetch_task.cancel)
+        super().stop()
+
+    def run(self) -> None:
+        self.log.info(f"started snapshot fetcher for '{self.url}' with {self.connection_count} connections")
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.fetch_task = self.loop.create_task(self.fetch_snapshots_on_all_connections())
+            self.loop.run_until_complete(self.fetch_task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self.loop.close()
+        self.log.info(f"snapshot fetcher finished ({self.get_statistics_text()})")
+
+    def get_statistics_text(self) -> str:
+        return (f"responses: {self.response_count}, decoded: {self.decoded_snapshot_count}, "
+                f"unchanged: {self.unchanged_snapshot_count}, outdated: {self.outdated_snapshot_count}, "
+                f"opened connections: {self.connection_count_opened}, errors: {self.error_count}")
+
+    async def fetch_snapshots_on_all_connections(self) -> None:
+        await asyncio.gather(*[self.fetch_snapshots() for _ in range(self.connection_count)])
+
+    async def fetch_snapshots(self) -> None:
+        url_parts = urlsplit(self.url)
+        is_https = url_parts.scheme == "https"
+        host = url_parts.hostname or "localhost"
+        port = url_parts.port or (443 if is_https else 80)
+        path = url_parts.path or "/"
+        if url_parts.query:
+            path = f"{path}?{url_parts.query}"
+
+        reader: Optional[asyncio.StreamReader] = None
+        writer: Optional[asyncio.StreamWriter] = None
+        while self.is_running:
+            try:
+                if reader is None or writer is None:
+                    reader, writer = await asyncio.open_connection(host, port, ssl=ssl.create_default_context() if is_https else None)
+                    self.connection_count_opened = self.connection_count_opened + 1
+
+                request_sequence = self.next_request_sequence
+                self.next_request_sequence = self.next_request_sequence + 1
+                writer.write(self.create_request(path, url_parts.netloc))
+                await writer.drain()
+
+                status_code, headers, body = await asyncio.wait_for(self.read_response(reader), self.response_timeout_seconds)
+                self.response_count = self.response_count + 1
+                if headers.get("connection", "").lower() == "close":
+                    writer.close()
+                    reader, writer = None, None
+
+                if not self.handle_response(request_sequence, status_code, headers, body):
+                    # Give the camera some time to produce a new snapshot
+                    await asyncio.sleep(self.unchanged_snapshot_delay_seconds)
+            except Exception as e:
+                self.error_count = self.error_count + 1
+                self.error_message = f"Could not access frame from URL: {self.url}"
+                self.log.warning(f"Could not fetch snapshot from '{self.url}': {str(e)}")
+                if writer:
+                    writer.close()
+                reader, writer = None, None
+                await asyncio.sleep(self.reconnect_delay_seconds)
+
+        if writer:
+            writer.close()
+
+    def create_request(self, path: str, host: str) -> bytes:
+        request = (f"GET {path} HTTP/1.1\r\n"
+                   f"Host: {host}\r\n"
+                   "Connection: keep-alive\r\n"
+                   "Accept: image/jpeg\r\n")
+        if self.last_etag:
+            request = request + f"If-None-Match: {self.last_etag}\r\n"
+        return (request + "\r\n").encode("latin-1")
+
+    async def read_response(self, reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str], bytes]:
+        header_bytes = await reader.readuntil(b"\r\n\r\n")
+        header_lines = header_bytes.decode("latin-1").split("\r\n")
+        status_line_parts = header_lines[0].split(" ", 2)
+        status_code = int(status_line_parts[1])
+        headers: Dict[str, str] = {}
+        for header_line in header_lines[1:]:
+            if ":" in header_line:
+                name, value = header_line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        if status_line_parts[0] == "HTTP/1.0" and headers.get("connection", "").lower() != "keep-alive":
+            headers["connection"] = "close"
+
+        if status_code in (204, 304):
+            body = b""
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            body = await self.read_chunked_body(reader)
+        else:
+            body = await reader.read()
+            headers["connection"] = "close"
+        return status_code, headers, body
+
+    async def read_chunked_body(self, reader: asyncio.StreamReader) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            chunk_size_line = await reader.readuntil(b"\r\n")
+            chunk_size = int(chunk_size_line.split(b";", 1)[0].strip(), 16)
+            if chunk_size == 0:
+                # Skip optional trailer headers
+                while (await reader.readuntil(b"\r\n")) != b"\r\n":
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(chunk_size))
+            await reader.readexactly(2)
+
+    def handle_response(self, request_sequence: int, status_code: int, headers: Dict[str, str], body: bytes) -> bool:
+        if status_code == 304:
+            self.unchanged_snapshot_count = self.unchanged_snapshot_count + 1
+            return False
+        if status_code != 200:
+            raise Exception(f"unexpected HTTP status {status_code}")
+
+        # With multiple requests in flight, responses may arrive out of order.
+        if request_sequence < self.latest_published_request_sequence:
+            self.outdated_snapshot_count = self.outdated_snapshot_count + 1
+            return False
+
+        etag = headers.get("etag")
+        if ((etag and etag == self.last_etag)
+                or body == self.last_body):
+            self.unchanged_snapshot_count = self.unchanged_snapshot_count + 1
+            return False
+        self.last_etag = etag
+        self.last_body = body
+
+        frame = self.jpeg_decoder.decode(body)
+        if frame is None:
+            raise Exception("could not decode snapshot")
+        self.decoded_snapshot_count = self.decoded_snapshot_count + 1
+        self.latest_published_request_sequence = request_sequence
+        self.error_message = None
+        self.frame_ring_buffer.publish(self.frame_ring_buffer.get_write_slot_index(), frame)
+        return True
+
+    def get_native_frame_size(self, frame: Any) -> Vector:
+        return self.jpeg_decoder.native_frame_size or super().get_native_frame_size(frame)
@@ -0,0 +1,51 @@
+from __future__ import annotations
+from typing import Dict, List
+import time
+
+class StageTimer:
+    """ Measures how long the consecutive stages of processing a frame take.
+    A stage lasts from the previous mark (or the start of the frame) to its own mark.
+    """
+    def __init__(self) -> None:
+        self.stage_names: List[str] = []
+        self.total_seconds_by_stage: Dict[str, float] = {}
+        self.max_seconds_by_stage: Dict[str, float] = {}
+        self.last_seconds_by_stage: Dict[str, float] = {}
+        self.frame_count = 0
+        self.frame_start_time_seconds = time.perf_counter()
+        self.last_mark_time_seconds = self.frame_start_time_seconds
+
+    def start_frame(self) -> None:
+        self.frame_count = self.frame_count + 1
+        self.frame_start_time_seconds = time.perf_counter()
+        self.last_mark_time_seconds = self.frame_start_time_seconds
+
+    def mark(self, stage_name: str) -> None:
+        now_seconds = time.perf_counter()
+        duration_seconds = now_seconds - self.last_mark_time_seconds
+        self.last_mark_time_seconds = now_seconds
+        if stage_name not in self.total_seconds_by_stage:
+            self.stage_names.append(stage_name)
+            self.total_seconds_by_stage[stage_name] = 0.0
+            self.max_seconds_by_stage[stage_name] = 0.0
+        self.total_seconds_by_stage[stage_name] = self.total_seconds_by_stage[stage_name] + duration_seconds
+        self.max_seconds_by_stage[stage_name] = max(self.max_seconds_by_stage[stage_name], duration_seconds)
+        self.last_seconds_by_stage[stage_name] = duration_seconds
+
+    def get_frame_seconds(self) -> float:
+        """ Duration from the start of the current frame to the last mark. """
+        return self.last_mark_time_seconds - self.frame_start_time_seconds
+
+    def reset(self) -> None:
+        self.stage_names.clear()
+        self.total_seconds_by_stage.clear()
+        self.max_seconds_by_stage.clear()
+        self.last_seconds_by_stage.clear()
+        self.frame_count = 0
+
+    def get_statistics_text(self) -> str:
+        if self.frame_count == 0:
+            return "no frames"
+        return ", ".join(f"{stage_name}: {1000 * self.total_seconds_by_stage[stage_name] / self.frame_count:.2f} ms"
+                         f" (max {1000 * self.max_seconds_by_stage[stage_name]:.1f} ms)"
+                         for stage_name in self.stage_names)
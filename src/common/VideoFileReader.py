@@ -0,0 +1,116 @@
+from __future__ import annotations
+from typing import Any, List, Union
+import os
+from cv2 import cv2
+from .FramePacer import FramePacer
+from .FrameRingBuffer import FrameRingBuffer
+from .FrameSource import FrameSource
+from .Vector import Vector
+
+class VideoFileReader(FrameSource):
+    """ Plays a video file or a directory of images (sorted by file name) as frame source.
+    In realtime mode, frames are published at the frame rate of the video.
+    Otherwise frames are published as fast as they are analyzed, without dropping any frame.
+    """
+    image_file_extensions = (".jpg", ".jpeg", ".png", ".bmp")
+    # When looping, stop after this many passes in a row without a frame, e.g. when all reads of the file fail
+    max_empty_loop_count = 3
+
+    def __init__(self, path: str, frame_ring_buffer: FrameRingBuffer, is_loop: bool, is_realtime: bool, default_fps: float) -> None:
+        super().__init__(frame_ring_buffer)
+        self.path = path
+        self.is_loop = is_loop
+        self.is_realtime = is_realtime
+        self.fps = default_fps
+        self.frame_size = Vector(0, 0)
+        self.cap: Any = None
+        self.image_file_paths: List[str] = []
+        self.image_index = 0
+        self.read_frame_count = 0
+        self.loop_count = 0
+        self.empty_loop_count = 0
+
+    def open(self) -> Union[str, None]:
+        """ Opens the video file or image directory. Returns an error message on failure. """
+        if os.path.isdir(self.path):
+            self.image_file_paths = sorted(os.path.join(self.path, file_name)
+                                           for file_name in os.listdir(self.path)
+                                           if file_name.lower().endswith(self.image_file_extensions))
+            if not self.image_file_paths:
+                return f"No images found in '{self.path}'"
+        elif not self.open_video_capture():
+            return f"Could not open video file '{self.path}'"
+
+        first_frame = self.read_frame(None)
+        if first_frame is None:
+            return f"Could not read first frame of '{self.path}'"
+        self.frame_size = Vector(first_frame.shape[1], first_frame.shape[0])
+        self.rewind()
+        self.log.info(f"opened '{self.path}' (width: {self.frame_size.x}, height: {self.frame_size.y}, fps: {self.fps})")
+        return None
+
+    def open_video_capture(self) -> bool:
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        video_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        # Some containers do not provide a frame rate
+        if video_fps > 0:
+            self.fps = video_fps
+        return True
+
+    def rewind(self) -> None:
+        if self.image_file_paths:
+            self.image_index = 0
+        else:
+            # Seeking is not supported by every codec, thus reopen the file
+            self.cap.release()
+            self.open_video_capture()
+
+    def read_frame(self, destination_frame: Any) -> Any:
+        if self.image_file_paths:
+            if self.image_index >= len(self.image_file_paths):
+                return None
+            frame = cv2.imread(self.image_file_paths[self.image_index])
+            self.image_index = self.image_index + 1
+            return frame
+
+        ret, frame = self.cap.read(destination_frame)
+        return frame if ret else None
+
+    def run(self) -> None:
+        self.log.info(f"started video file reader (loop: {self.is_loop}, realtime: {self.is_realtime})")
+        frame_pacer = FramePacer(self.fps if self.is_realtime else 0)
+        frame_pacer.start()
+        loop_start_frame_count = 0
+        while self.is_running:
+            slot_index = self.frame_ring_buffer.get_write_slot_index()
+            frame = self.read_frame(self.frame_ring_buffer.get_slot(slot_index))
+            if frame is None:
+                if not self.is_loop:
+                    break
+                self.empty_loop_count = self.empty_loop_count + 1 if self.read_frame_count == loop_start_frame_count else 0
+                if self.empty_loop_count >= self.max_empty_loop_count:
+                    self.error_message = f"Could not read frames of '{self.path}'"
+                    self.log.error(f"{self.error_message} (passes without a frame: {self.empty_loop_count})")
+                    break
+                self.loop_count = self.loop_count + 1
+                loop_start_frame_count = self.read_frame_count
+                self.rewind()
+                continue
+
+            self.read_frame_count = self.read_frame_count + 1
+            if self.is_realtime:
+                frame_pacer.wait_for_next_frame()
+            elif not self.frame_ring_buffer.wait_until_taken():
+                # closed
+                break
+            self.frame_ring_buffer.publish(slot_index, frame)
+
+        if self.is_running:
+            if self.error_message is None:
+                self.log.info("reached end of video file")
+            self.is_finished = True
+        if self.cap:
+            self.cap.release()
+        self.log.info(f"video file reader finished (read frames: {self.read_frame_count}, loops: {self.loop_count})")
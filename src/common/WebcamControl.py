@@ -1,18 +1,28 @@
 from __future__ import annotations
-from typing import Any, Callable, List, Union
+from typing import Any, Callable, List, Tuple, Union
 from cv2 import cv2
-import numpy as np
-import urllib.request
 import common.AppContext as AppContext
-from common.util import to_json
+from .AnalysisPipeline import AnalysisPipeline
+from .CameraModeProbe import CameraModeProbe, fourcc_to_int, int_to_fourcc, video_capture_backends
+from .CaptureSupervisor import CaptureSupervisor
 from .Config import VideoCaptureSource
-from .Config import MousePositioningMode
-from .GestureRecognizer import HandFingerPositions
+from .FrameBufferPool import FrameBufferPool
+from .FrameGrabber import FrameGrabber
+from .FramePacer import FramePacer
+from .FrameRateCounter import FrameRateCounter
+from .FrameRingBuffer import FrameRingBuffer
+from .FrameSkipController import FrameSkipController
+from .FrameSource import FrameSource
+from .GestureEvaluationPlan import GestureEvaluationPlan
+from .MjpegStreamReader import MjpegStreamReader
+from .OverlayRenderer import OverlayRenderer
+from .ReducedJpegDecoder import ReducedJpegDecoder
+from .SnapshotFetcher import SnapshotFetcher
+from .StageTimer import StageTimer
+from .VideoFileReader import VideoFileReader
 from .LogHolder import LogHolder
 from .Vector import Vector
-from .draw_util import draw_circle, draw_line
-from rx import operators as ops
-import rx
+from .frame_util import convert_bgr_to_rgb, downscale_frame, get_frame_size, mirror_frame
 
 class WebcamControl(LogHolder):
     def __init__(self, app_context: AppContext.AppContext):
@@ -20,86 +30,207 @@ class WebcamControl(LogHolder):
         self.app_context = app_context
         self.config = app_context.config
         self.actual_capture_size = self.config.capture_size.value
-        self.actual_fps = self.config.capture_fps.value
+        self.actual_fps: float = self.config.capture_fps.value
         self.gesture_recognizer = app_context.gesture_recognizer
         self.frame_analyzed_callbacks: List[Callable[[Any, Vector], None]] = []
         self.restart_video_capture_callbacks: List[Callable[[], None]] = []
         self.is_restart_video_capture = False
-
-        # Restart video capture when any video-capture-config has been changed and is stable.
-        delay_in_seconds = 3
-        self.last_config_json = to_json(self.config, False)
-        (rx.of(self.config.capture_device_index.subject,
-                  self.config.capture_size.subject,
-                  self.config.capture_fps.subject,
-                  self.config.capture_source.subject,
-                  self.config.capture_source_url.subject)
-            .pipe(ops.merge_all())
-            .pipe(ops.debounce(delay_in_seconds))
-            .subscribe(self.restart_video_capture))
-
-    def restart_video_capture(self, argument: Any = None) -> None:
-        current_config_json = to_json(self.config, False)
-        if (not self.is_restart_video_capture
-                and self.last_config_json != current_config_json):
-            self.last_config_json = current_config_json
-            self.log.info("init restart of video capture")
-            self.is_restart_video_capture = True
-            for callback in self.restart_video_capture_callbacks:
-                callback()
+        self.cap: Any = None
+        self.frame_ring_buffer: Union[FrameRingBuffer, None] = None
+        self.frame_source: Union[FrameSource, None] = None
+        # Achieved frame rate of the analysis loop
+        self.frame_rate_counter = FrameRateCounter()
+        # Duration of the steps of the analysis of a frame
+        self.stage_timer = StageTimer()
+        # Analyze only every Nth frame when the analysis cannot keep up with a high frame rate
+        self.frame_skip_controller = FrameSkipController()
+        # The preview is only drawn while it can be seen
+        self.is_preview_visible = True
+        self.overlay_renderer = OverlayRenderer(self.config)
+        # Output buffers of the frame preprocessing. Used only on the thread of the analysis loop.
+        self.frame_buffer_pool = FrameBufferPool()
+
+        # Apply changes of the video capture config
+        self.capture_supervisor = CaptureSupervisor(self.config, self.restart_video_capture, self.reconfigure_video_capture)
+
+    def add_frame_analyzed_callback(self, callback: Callable[[Any, Vector], None]) -> None:
+        if callback not in self.frame_analyzed_callbacks:
+            self.frame_analyzed_callbacks.append(callback)
+
+    def add_restart_video_capture_callback(self, callback: Callable[[], None]) -> None:
+        if callback not in self.restart_video_capture_callbacks:
+            self.restart_video_capture_callbacks.append(callback)
+
+    def restart_video_capture(self) -> None:
+        if self.is_restart_video_capture:
+            return
+
+        self.log.info("init restart of video capture")
+        self.is_restart_video_capture = True
+        for callback in self.restart_video_capture_callbacks:
+            callback()
+
+    def reconfigure_video_capture(self, capture_size: Vector, capture_fps: float) -> None:
+        frame_source = self.frame_source
+        if (frame_source is None
+                or not frame_source.request_capture_settings(capture_size, capture_fps, self.on_capture_settings_applied)):
+            self.restart_video_capture()
+
+    def on_capture_settings_applied(self, is_success: bool) -> None:
+        # Called on the thread of the frame source, which is the only one that uses the camera
+        if not is_success:
+            self.log.info("video capture does not support changing the settings while running")
+            self.restart_video_capture()
+            return
+
+        error_message = self.update_actual_capture_settings()
+        if error_message:
+            self.log.warning(error_message)
+            self.restart_video_capture()
 
     def start_video_capture(self) -> Union[str, None]:
+        """ Runs the video capture until it is stopped, restarted, or fails. Returns an error message to be shown or None. """
         if not self.config.running.value:
             return None
 
         self.log.info("starting video capture")
-        if (self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM
+        self.is_restart_video_capture = False
+        self.capture_supervisor.on_capture_started()
+        frame_ring_buffer = FrameRingBuffer()
+        mjpeg_stream_reader = self.open_mjpeg_stream_reader(frame_ring_buffer)
+        if self.config.capture_source.value == VideoCaptureSource.FILE:
+            video_file_reader = VideoFileReader(self.config.capture_file_path.value,
+                                                frame_ring_buffer,
+                                                self.config.capture_file_loop.value,
+                                                self.config.capture_file_realtime.value,
+                                                self.config.capture_fps.value)
+            open_error_message = video_file_reader.open()
+            if open_error_message is not None:
+                return open_error_message
+            self.actual_capture_size = video_file_reader.frame_size
+            self.actual_fps = video_file_reader.fps
+            frame_source: FrameSource = video_file_reader
+        elif mjpeg_stream_reader:
+            frame_source = mjpeg_stream_reader
+        elif (self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM
                 or not self.config.capture_source_url.value.endswith(".jpg")):
             setup_result = self.start_video_capture_stream()
             if setup_result is not None:
                 return setup_result
 
-        pause_in_millis = int(1000 / self.actual_fps)
+            frame_source = FrameGrabber(self.cap, frame_ring_buffer, self.config.is_capture_low_latency.value)
+        else:
+            frame_source = SnapshotFetcher(self.config.capture_source_url.value,
+                                           frame_ring_buffer,
+                                           self.create_jpeg_decoder(),
+                                           self.config.capture_snapshot_connection_count.value)
+        self.start_frame_source(frame_source, frame_ring_buffer)
+
+        if self.config.is_analysis_pipeline.value:
+            error_message = AnalysisPipeline(self, frame_source, frame_ring_buffer).run()
+        else:
+            error_message = self.run_analysis_loop(frame_source, frame_ring_buffer)
+
+        self.gesture_recognizer.log_statistics()
+        self.log.info(f"frame buffer pool statistics: {self.frame_buffer_pool.get_statistics_text()}")
+        self.gesture_recognizer.stop_landmark_recording()
+        self.gesture_recognizer.stop_inference_worker()
+
+        self.stop_frame_source()
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+
+        self.log.info("video capture analysis loop finished")
+
+        if error_message:
+            return error_message
+        if frame_source.is_finished and not self.is_restart_video_capture:
+            return "End of video file"
+        return None
+
+    def run_analysis_loop(self, frame_source: FrameSource, frame_ring_buffer: FrameRingBuffer) -> Union[str, None]:
+        """ Analyzes the frames one after another on the calling thread. Returns an error message or None. """
+        # When playing a file as fast as possible, the file reader waits for the analysis and not vice versa
+        is_unpaced = (self.config.capture_source.value == VideoCaptureSource.FILE
+                      and not self.config.capture_file_realtime.value)
+        paced_fps: float = 0 if is_unpaced else self.actual_fps
+        is_frame_skipping = self.config.is_high_frame_rate.value and not is_unpaced
+        frame_pacer = FramePacer(paced_fps)
+        error_message: Union[str, None] = None
 
         self.log.info("starting video capture analysis loop")
         # LOOP START
-        self.is_restart_video_capture = False
+        frame_pacer.start()
+        self.frame_rate_counter.start()
+        self.stage_timer.reset()
+        self.frame_skip_controller.reset()
         while self.config.running.value and (not self.is_restart_video_capture):
-            if (self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM
-                    or not self.config.capture_source_url.value.endswith(".jpg")):
-                ret, frame = self.cap.read() # pylint: disable=unused-variable
-            else:
-                try:
-                    with urllib.request.urlopen(self.config.capture_source_url.value) as img_resp:
-                        img_np = np.array(bytearray(img_resp.read()), dtype=np.uint8)
-                        frame = cv2.imdecode(img_np, -1)
-                        h, w, c = frame.shape # pylint: disable=unused-variable
-                        self.actual_capture_size = Vector(w, h)
-                except Exception:
-                    self.log.exception("Could not access frame from URL")
-                    return f"Could not access frame from URL: {self.config.capture_source_url.value}"
+            # The fps may have been changed in place or only every Nth frame is analyzed
+            target_fps = self.actual_fps / self.frame_skip_controller.stride.value
+            if self.gesture_recognizer.evaluation_plan.is_standby:
+                target_fps = min(target_fps, GestureEvaluationPlan.standby_fps)
+            if not is_unpaced and paced_fps != target_fps:
+                paced_fps = target_fps
+                frame_pacer.set_fps(paced_fps)
+
+            # Always analyze the newest frame. Older frames have been dropped by the ring buffer.
+            # Wait at most a few frames for a new frame such that the loop still notices a restart or shutdown.
+            self.stage_timer.start_frame()
+            frame = frame_ring_buffer.take_latest_frame(5 / self.actual_fps)
+            self.stage_timer.mark("wait")
+            if frame is None:
+                if (frame_source.error_message
+                        and frame_ring_buffer.published_frame_count == 0):
+                    error_message = frame_source.error_message
+                    break
+                if frame_source.is_finished:
+                    break
+                continue
+
+            native_frame_size = frame_source.get_native_frame_size(frame)
+            if native_frame_size != self.actual_capture_size:
+                self.actual_capture_size = native_frame_size
 
             self.process_frame(frame)
+            self.frame_rate_counter.count_frame()
+            if is_frame_skipping:
+                analysis_seconds = self.stage_timer.get_frame_seconds() - self.stage_timer.last_seconds_by_stage["wait"]
+                self.frame_skip_controller.update(analysis_seconds, self.actual_fps)
 
-            cv2.waitKey(pause_in_millis)
+            # Sleep only for the remaining time of this frame's budget
+            frame_pacer.wait_for_next_frame()
         # LOOP END
 
-        if self.cap:
-            self.cap.release()
-        cv2.destroyAllWindows()
-
-        self.log.info("video capture analysis loop finished")
+        self.log.info(f"analysis frame rate: {self.frame_rate_counter.get_statistics_text()}")
+        frame_pacer.log_statistics()
+        self.log.info(f"analysis stage timing: {self.stage_timer.get_statistics_text()}")
+        if is_frame_skipping:
+            self.log.info(f"frame skip statistics: {self.frame_skip_controller.get_statistics_text()}")
+        return error_message
+
+    def open_mjpeg_stream_reader(self, frame_ring_buffer: FrameRingBuffer) -> Union[MjpegStreamReader, None]:
+        if (self.config.capture_source.value != VideoCaptureSource.IP_WEBCAM
+                or not self.config.capture_native_mjpeg.value
+                or self.config.capture_source_url.value.endswith(".jpg")):
+            return None
 
-        if self.config.running.value and self.is_restart_video_capture:
-            self.log.info("restarting video capture")
-            return self.start_video_capture()
+        mjpeg_stream_reader = MjpegStreamReader(self.config.capture_source_url.value, frame_ring_buffer, self.create_jpeg_decoder())
+        try:
+            if mjpeg_stream_reader.open():
+                return mjpeg_stream_reader
+        except Exception as e:
+            self.log.warning(f"Could not open '{self.config.capture_source_url.value}' as MJPEG stream: {str(e)}")
+        # Let OpenCV try to open the video stream
+        return None
 
-        return ""
+    def create_jpeg_decoder(self) -> ReducedJpegDecoder:
+        return ReducedJpegDecoder(self.gesture_recognizer.get_inference_size)
 
     def start_video_capture_stream(self) -> Union[str, None]:
         try:
             if (self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM):
-                self.cap: Any = cv2.VideoCapture(self.config.capture_device_index.value)
+                return self.start_webcam_capture()
             elif (self.config.capture_source_url.value):
                 # Check available video backends
                 available_backends = [cv2.videoio_registry.getBackendName(b) for b in cv2.videoio_registry.getBackends()]
@@ -116,15 +247,63 @@ class WebcamControl(LogHolder):
             self.log.exception(error_message)
             return error_message
 
+        self.configure_capture_buffer()
+        return self.update_actual_capture_settings()
+
+    def configure_capture_buffer(self) -> None:
+        if not self.config.is_capture_low_latency.value:
+            return
+        # Not every backend supports this, e.g. V4L2 and GStreamer do. The grab/retrieve mode reduces latency anyway.
+        if self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1):
+            self.log.info(f"video capture buffer size: {self.cap.get(cv2.CAP_PROP_BUFFERSIZE)}")
+        else:
+            self.log.info("video backend does not support changing the buffer size")
+
+    def start_webcam_capture(self) -> Union[str, None]:
+        backend_name = self.config.capture_backend.value
+        fourcc = self.config.capture_fourcc.value
+        capture_size = self.config.capture_size.value
+        capture_fps: float = self.config.capture_fps.value
+        if self.config.is_capture_autotune.value:
+            camera_mode = CameraModeProbe().get_best_mode(self.config.capture_device_index.value,
+                                                          self.config.capture_target_latency_ms.value,
+                                                          self.config.inference_size.value)
+            if camera_mode is None:
+                self.log.warning("no camera mode found, using configured capture settings")
+            else:
+                self.log.info(f"autotuned camera mode: {camera_mode}")
+                backend_name = camera_mode.backend_name
+                fourcc = camera_mode.fourcc
+                capture_size = Vector(camera_mode.width, camera_mode.height)
+                capture_fps = camera_mode.requested_fps
+
+        if backend_name and backend_name not in video_capture_backends:
+            self.log.warning(f"Unknown video backend '{backend_name}', using default backend")
+            backend_name = ""
+        self.cap = cv2.VideoCapture(self.config.capture_device_index.value, video_capture_backends[backend_name or "ANY"])
+
         default_capture_width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
         default_capture_height = self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
         self.log.info(f"default video capture size of camera: {default_capture_width}x{default_capture_height}")
 
-        # configure video capture
-        if self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM:
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.config.capture_size.value.x)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.config.capture_size.value.y)
-            self.cap.set(cv2.CAP_PROP_FPS, self.config.capture_fps.value)
+        # configure video capture. The pixel format must be set first, it limits the available sizes.
+        if fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, fourcc_to_int(fourcc))
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, capture_size.x)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, capture_size.y)
+        self.cap.set(cv2.CAP_PROP_FPS, capture_fps)
+        if fourcc and int_to_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC)) != fourcc:
+            self.log.warning(f"Configured pixel format {fourcc} does not match actual pixel format {int_to_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC))}")
+        self.configure_capture_buffer()
+
+        return self.update_actual_capture_settings(capture_size, capture_fps)
+
+    def update_actual_capture_settings(self, requested_size: Union[Vector, None] = None, requested_fps: Union[float, None] = None) -> Union[str, None]:
+        """ Reads the settings that the video capture actually uses. The requested settings default to the config. """
+        if requested_size is None:
+            requested_size = self.config.capture_size.value
+        if requested_fps is None:
+            requested_fps = self.config.capture_fps.value
 
         # check video capture configuration was successful
         width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
@@ -134,75 +313,77 @@ class WebcamControl(LogHolder):
             return "Width or height of video is zero"
 
         if (self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM
-                and (self.config.capture_size.value.x != width
-                     or self.config.capture_size.value.y != height)):
-            self.log.warning(f"Configured video size {self.config.capture_size.value.x}x{self.config.capture_size.value.y} does not match actual video size {width}x{height}")
+                and (requested_size.x != width
+                     or requested_size.y != height)):
+            self.log.warning(f"Configured video size {requested_size.x}x{requested_size.y} does not match actual video size {width}x{height}")
 
+        actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
         if (self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM
-                and self.config.capture_fps.value != self.actual_fps):
-            self.log.warning(f"Configured frames per second {self.config.capture_fps.value} does not match actual frames per second {self.actual_fps}")
+                and requested_fps != actual_fps):
+            self.log.warning(f"Configured frames per second {requested_fps} does not match actual frames per second {actual_fps}")
 
-        self.actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
-        if (self.actual_fps == 0):
+        if (actual_fps == 0):
             return "FPS of video is zero"
-        if (self.actual_fps > 30):
-            self.log.info(f"Unexpected high FPS: {self.actual_fps}. Assuming 30 instead.")
-            self.actual_fps = 30
+        if (actual_fps > 30 and not self.config.is_high_frame_rate.value):
+            self.log.info(f"Unexpected high FPS: {actual_fps}. Assuming 30 instead. Enable the high frame rate mode to use it.")
+            actual_fps = 30
+        self.actual_fps = actual_fps
 
         self.log.info(f"Capturing video (width: {width}, height: {height}, fps: {self.actual_fps})")
 
         return None
 
+    def start_frame_source(self, frame_source: FrameSource, frame_ring_buffer: FrameRingBuffer) -> None:
+        self.frame_source = frame_source
+        self.frame_ring_buffer = frame_ring_buffer
+        frame_source.start()
+
+    def stop_frame_source(self) -> None:
+        if self.frame_source:
+            self.frame_source.stop()
+        if self.frame_ring_buffer:
+            self.log.info(f"analyzed frames: {self.frame_ring_buffer.taken_frame_count}, dropped frames: {self.frame_ring_buffer.dropped_frame_count}")
+        self.frame_source = None
+        self.frame_ring_buffer = None
+
     def process_frame(self, frame: Any) -> None:
-        # mirror vertically
-        if self.config.capture_flip.value:
-            frame = cv2.flip(frame, 1)
+        captured_frame, frame = self.preprocess_frame(frame, self.frame_buffer_pool)
+        self.stage_timer.mark("preprocess")
+
+        # Analyze image. The frame is not mirrored, the GestureRecognizer mirrors the landmarks instead.
+        self.gesture_recognizer.process_frame(frame, self.stage_timer)
+
+        if self.show_preview(captured_frame, frame, self.frame_buffer_pool):
+            self.stage_timer.mark("preview")
+
+    def is_bgr_capture(self) -> bool:
+        return self.config.capture_source.value in (VideoCaptureSource.INTEGRATED_WEBCAM, VideoCaptureSource.FILE)
+
+    def preprocess_frame(self, frame: Any, frame_buffer_pool: Union[FrameBufferPool, None]) -> Tuple[Any, Any]:
+        """ Returns the captured frame reduced to inference resolution, and the same frame in RGB for the analysis. """
+        # Reduce to inference resolution first, such that all following steps work on fewer pixels.
+        # The hand model works on far smaller inputs anyway. Landmarks are relative to the frame size.
+        captured_frame = downscale_frame(frame, self.gesture_recognizer.get_inference_size(), frame_buffer_pool)
 
         # Convert to RBG Color Space
-        if self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM:
-            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if self.is_bgr_capture():
+            return captured_frame, convert_bgr_to_rgb(captured_frame, frame_buffer_pool)
+        return captured_frame, captured_frame
 
-        # Draw certain configurable values
-        if self.config.mouse_positioning_mode.value == MousePositioningMode.ABSOLUTE:
-            self.draw_motion_border_overlay(frame)
+    def show_preview(self, captured_frame: Any, frame: Any, frame_buffer_pool: Union[FrameBufferPool, None]) -> bool:
+        """ Draws the overlay of the last analyzed frame and passes the frame to the callbacks. Returns False if there is no preview. """
+        if not self.frame_analyzed_callbacks or not self.is_preview_visible:
+            return False
+
+        # Mirror vertically only for the preview.
+        # Mirroring the captured BGR frame converts it to RGB in the same pass.
+        if self.config.capture_flip.value:
+            frame = mirror_frame(captured_frame, self.is_bgr_capture(), frame_buffer_pool)
 
-        # Analyze image
-        hand_finger_positions = self.gesture_recognizer.process_frame(frame)
-        if hand_finger_positions:
-            self.draw_finger_position_overlay(frame, hand_finger_positions)
+        # Draw certain configurable values
+        self.overlay_renderer.render(frame, self.gesture_recognizer.frame_overlay)
 
+        frame_size = get_frame_size(frame)
         for callback in self.frame_analyzed_callbacks:
-            callback(frame, self.actual_capture_size)
-
-    def draw_motion_border_overlay(self, frame: Any) -> None:
-        color = (127, 127, 127)
-        thickness = 2
-        motion_border_left_x = self.config.motion_border_left.value * self.actual_capture_size.x
-        motion_border_right_x = self.actual_capture_size.x - self.config.motion_border_right.value * self.actual_capture_size.x
-        motion_border_top_y = self.config.motion_border_top.value * self.actual_capture_size.y
-        motion_border_bottom_y = self.actual_capture_size.y - self.config.motion_border_bottom.value * self.actual_capture_size.y
-
-        # motion border frame
-        draw_line(frame, Vector(motion_border_left_x, motion_border_top_y), Vector(motion_border_left_x, motion_border_bottom_y), color, thickness)
-        draw_line(frame, Vector(motion_border_right_x, motion_border_top_y), Vector(motion_border_right_x, motion_border_bottom_y), color, thickness)
-        draw_line(frame, Vector(motion_border_left_x, motion_border_top_y), Vector(motion_border_right_x, motion_border_top_y), color, thickness)
-        draw_line(frame, Vector(motion_border_left_x, motion_border_bottom_y), Vector(motion_border_right_x, motion_border_bottom_y), color, thickness)
-
-        # vertical to edges
-        draw_line(frame, Vector(0, 0), Vector(motion_border_left_x, motion_border_top_y), color, thickness)
-        draw_line(frame, Vector(self.actual_capture_size.x, 0), Vector(motion_border_right_x, motion_border_top_y), color, thickness)
-        draw_line(frame, Vector(0, self.actual_capture_size.y), Vector(motion_border_left_x, motion_border_bottom_y), color, thickness)
-        draw_line(frame, Vector(self.actual_capture_size.x, self.actual_capture_size.y), Vector(motion_border_right_x, motion_border_bottom_y), color, thickness)
-
-    def draw_finger_position_overlay(self, frame: Any, hand_finger_positions: HandFingerPositions) -> None:
-        # draw landmark positions
-        draw_circle(frame, hand_finger_positions.wrist_position.px, 5, (255, 0, 0))
-        draw_circle(frame, hand_finger_positions.thumb_tip_position.px, 5, (0, 255, 255))
-        draw_circle(frame, hand_finger_positions.index_tip_position.px, 5, (255, 255, 0))
-        draw_circle(frame, hand_finger_positions.middle_tip_position.px, 5, (0, 255, 0))
-        draw_circle(frame, hand_finger_positions.ring_tip_position.px, 5, (255, 0, 255))
-        draw_circle(frame, hand_finger_positions.pinky_tip_position.px, 5, (0, 0, 255))
-
-        # draw click threshold
-        draw_circle(frame, hand_finger_positions.thumb_tip_position.px, self.config.click_distance_threshold_low_percent.value * self.actual_capture_size.x / 2, (0, 255, 0), 2)
-        draw_circle(frame, hand_finger_positions.thumb_tip_position.px, self.config.click_distance_threshold_high_percent.value * self.actual_capture_size.x / 2, (0, 255, 0), 2)
+            callback(frame, frame_size)
+        return True
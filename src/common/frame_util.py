@@ -0,0 +1,65 @@
+from typing import Any, Union
+from cv2 import cv2
+from .FrameBufferPool import FrameBufferPool
+from .Vector import Vector
+
+# Decode factors that are supported by cv2.IMREAD_REDUCED_COLOR_X
+jpeg_reduction_factor_to_imread_flag = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+
+def get_frame_size(frame: Any) -> Vector:
+    return Vector(frame.shape[1], frame.shape[0])
+
+def get_inference_scale(frame_size: Vector, inference_size: Vector) -> float:
+    """ Returns the factor to fit the frame into the inference size, keeping the aspect ratio. Frames are never upscaled. """
+    if frame_size.x <= 0 or frame_size.y <= 0 or inference_size.x <= 0 or inference_size.y <= 0:
+        return 1
+    return min(1, inference_size.x / frame_size.x, inference_size.y / frame_size.y)
+
+def get_jpeg_reduction_factor(frame_size: Vector, inference_size: Vector) -> int:
+    """ Returns the largest supported JPEG decode reduction that still yields at least the inference resolution. """
+    scale = get_inference_scale(frame_size, inference_size)
+    for reduction_factor in [8, 4, 2]:
+        if 1 / reduction_factor >= scale:
+            return reduction_factor
+    return 1
+
+def get_pooled_buffer_like(frame: Any, width: int, height: int, name: str, frame_buffer_pool: Union[FrameBufferPool, None]) -> Any:
+    if frame_buffer_pool is None:
+        return None
+    return frame_buffer_pool.get_buffer(name, (height, width) + frame.shape[2:], frame.dtype)
+
+def resize_frame(frame: Any, scale: float, name: str, frame_buffer_pool: Union[FrameBufferPool, None] = None, interpolation: int = cv2.INTER_LINEAR) -> Any:
+    width = max(1, round(frame.shape[1] * scale))
+    height = max(1, round(frame.shape[0] * scale))
+    dst = get_pooled_buffer_like(frame, width, height, name, frame_buffer_pool)
+    return cv2.resize(frame, (width, height), dst=dst, interpolation=interpolation)
+
+def downscale_frame(frame: Any, inference_size: Vector, frame_buffer_pool: Union[FrameBufferPool, None] = None) -> Any:
+    scale = get_inference_scale(get_frame_size(frame), inference_size)
+    if scale >= 1:
+        return frame
+    # INTER_AREA would alias less but is several times slower for non-integer factors
+    return resize_frame(frame, scale, "downscaled", frame_buffer_pool)
+
+def mirror_frame(frame: Any, is_swap_red_blue: bool, frame_buffer_pool: Union[FrameBufferPool, None] = None) -> Any:
+    """ Mirrors the frame horizontally. Optionally converts BGR to RGB (and vice versa) in the same pass. """
+    height, width = frame.shape[0], frame.shape[1]
+    dst = get_pooled_buffer_like(frame, width, height, "mirrored", frame_buffer_pool)
+    if not is_swap_red_blue or frame.ndim != 3:
+        return cv2.flip(frame, 1, dst=dst)
+
+    # Mirroring a row of interleaved color values also reverses the channel order of each pixel
+    row_length = width * frame.shape[2]
+    if dst is None:
+        return cv2.flip(frame.reshape(height, row_length), 1).reshape(frame.shape)
+    cv2.flip(frame.reshape(height, row_length), 1, dst=dst.reshape(height, row_length))
+    return dst
+
+def convert_bgr_to_rgb(frame: Any, frame_buffer_pool: Union[FrameBufferPool, None] = None) -> Any:
+    dst = get_pooled_buffer_like(frame, frame.shape[1], frame.shape[0], "rgb", frame_buffer_pool)
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=dst)
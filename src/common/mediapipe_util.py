@@ -0,0 +1,17 @@
+from __future__ import annotations
+from typing import Any, Dict, List
+import inspect
+import logging
+import mediapipe # type: ignore
+
+def get_supported_hands_option_names() -> List[str]:
+    """ Returns the options of mediapipe's Hands that the installed version knows, e.g. model_complexity has been added in mediapipe 0.8.9. """
+    return [name for name in inspect.signature(mediapipe.solutions.hands.Hands.__init__).parameters if name != "self"]
+
+def create_mediapipe_hands(hands_options: Dict[str, Any]) -> Any:
+    """ Creates mediapipe's Hands with the given options. Options that the installed version does not know are left out. """
+    supported_option_names = get_supported_hands_option_names()
+    unsupported_options = {name: value for name, value in hands_options.items() if name not in supported_option_names}
+    if unsupported_options:
+        logging.getLogger("mediapipe_util").warning(f"mediapipe does not support the hand tracking options {unsupported_options}")
+    return mediapipe.solutions.hands.Hands(**{name: value for name, value in hands_options.items() if name in supported_option_names})
@@ -3,7 +3,7 @@
 from __future__ import annotations
 from typing import Any
 from PySide6.QtGui import QResizeEvent
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QEvent, Qt
 from PySide6.QtWidgets import QMainWindow, QLabel
 from common.version import version
 import common.AppContext as AppContext
@@ -48,6 +48,12 @@ class MainWindow(QMainWindow, LogHolder):
         if hasattr(self, 'resize_event_reactive_property'):
             self.resize_event_reactive_property.value = Vector(event.size().width(), event.size().height())
 
+    def changeEvent(self, event: QEvent) -> None:
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange:
+            # Do not draw the preview while minimized
+            self.app_context.webcam_control.is_preview_visible = not self.isMinimized()
+
     def setup_style_sheet(self) -> None:
         try:
             with open("styles.qss", mode="r", encoding="utf-8") as styles_file:
@@ -78,8 +84,21 @@ class MainWindow(QMainWindow, LogHolder):
         self.config.capture_size.subscribe_and_run(self.update_video_settings_label)
         self.config.capture_fps.subscribe_and_run(self.update_video_settings_label)
         self.config.capture_source_url.subscribe_and_run(self.update_video_settings_label)
+        self.config.capture_file_path.subscribe_and_run(self.update_video_settings_label)
+        self.config.capture_source.subscribe_and_run(self.update_video_settings_label)
         self.statusBar().addWidget(self.video_settings_label)
 
+        # Achieved analysis frame rate label
+        self.analysis_fps_label = QLabel()
+        self.app_context.webcam_control.frame_rate_counter.fps.subscribe_and_run(self.update_analysis_fps_label)
+        self.app_context.webcam_control.frame_skip_controller.stride.subscribe_and_run(self.update_analysis_fps_label)
+        self.statusBar().addWidget(self.analysis_fps_label)
+
+        # Hand tracking quality label
+        self.inference_quality_label = QLabel()
+        self.app_context.gesture_recognizer.inference_quality_controller.level_index.subscribe_and_run(self.update_inference_quality_label)
+        self.statusBar().addWidget(self.inference_quality_label)
+
         # Last performed action label
         self.last_performed_action_description = ""
         self.performed_action_description_count = 0
@@ -102,12 +121,30 @@ class MainWindow(QMainWindow, LogHolder):
             new_jitter_pause_time_seconds = new_jitter_pause_time_ms / 1000
             self.performed_action_description_label.setText(f"pause: {new_jitter_pause_time_seconds:.1f} s")
 
+    def update_analysis_fps_label(self, new_value: Any = None) -> None:
+        webcam_control = self.app_context.webcam_control
+        fps = webcam_control.frame_rate_counter.fps.value
+        stride = webcam_control.frame_skip_controller.stride.value
+        if stride > 1:
+            self.analysis_fps_label.setText(f"Analysis: {fps:.1f} fps (every {stride}. frame)")
+        else:
+            self.analysis_fps_label.setText(f"Analysis: {fps:.1f} fps")
+
+    def update_inference_quality_label(self, new_level_index: int) -> None:
+        if new_level_index > 0:
+            level_count = len(self.app_context.gesture_recognizer.inference_quality_controller.levels)
+            self.inference_quality_label.setText(f"Tracking quality: reduced ({new_level_index}/{level_count - 1})")
+        else:
+            self.inference_quality_label.setText("Tracking quality: full")
+
     def update_video_settings_label(self, new_value: Any) -> None:
         if (self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM):
             w = self.app_context.webcam_control.actual_capture_size.x
             h = self.app_context.webcam_control.actual_capture_size.y
             fps = self.app_context.webcam_control.actual_fps
             self.video_settings_label.setText(f"Video: {w}x{h}@{fps}")
+        elif (self.config.capture_source.value == VideoCaptureSource.FILE):
+            self.video_settings_label.setText(f"Video: {self.config.capture_file_path.value}")
         else:
             self.video_settings_label.setText(f"Video: {self.config.capture_source_url.value}")
 
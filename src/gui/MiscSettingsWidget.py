@@ -13,6 +13,14 @@ class MiscSettingsWidget(QWidget, LogHolder):
         group = QGroupBox("Misc.")
         stay_on_top_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_stay_on_top=}", "Stay on top")
         theme_chooser = self.create_theme_chooser()
+        landmark_recording_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_landmark_recording=}", "Record hand landmarks")
+        landmark_recording_checkbox.setToolTip(f"Records the tracked hand landmarks to the folder '{self.config.landmark_recording_directory.value}'.\n"
+                                               "A recording can be replayed to reproduce issues.")
+        gesture_classifier_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_gesture_classifier=}", "Use gesture classifier")
+        gesture_classifier_checkbox.setToolTip(f"Recognizes the gestures that the classifier '{self.config.gesture_classifier_file_path.value}' has been trained for.\n"
+                                               "Train the classifier from landmark recordings with train_gesture_classifier.py.")
+        gesture_predicate_cache_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_gesture_predicate_cache=}", "Reuse gesture results of still hand")
+        gesture_predicate_cache_checkbox.setToolTip("Finger tip distances are only measured again when the finger tips have moved enough to change a gesture.\nThe recognized gestures are the same.")
 
         # Flip image vertically
         flip_checkbox = QCheckBox()
@@ -30,10 +38,13 @@ class MiscSettingsWidget(QWidget, LogHolder):
 
         grid_layout.addWidget(flip_checkbox, 0, 0)
         grid_layout.addWidget(stay_on_top_checkbox, 1, 0)
+        grid_layout.addWidget(landmark_recording_checkbox, 2, 0)
+        grid_layout.addWidget(gesture_classifier_checkbox, 3, 0)
+        grid_layout.addWidget(gesture_predicate_cache_checkbox, 4, 0)
 
         form_layout = QFormLayout()
         form_layout.addRow(QLabel("Theme"), theme_chooser)
-        grid_layout.addLayout(form_layout, 2, 0)
+        grid_layout.addLayout(form_layout, 5, 0)
 
     def create_theme_chooser(self) -> QWidget:
         combo = QComboBox()
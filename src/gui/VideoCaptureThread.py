@@ -2,12 +2,13 @@
 import time
 from typing import Any
 import logging
-import cv2
 from PySide6.QtCore import QThread
 from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtWidgets import QLabel
 from common.Config import Config
+from common.FrameBufferPool import FrameBufferPool
 from common.Vector import Vector
+from common.frame_util import resize_frame
 
 from common.WebcamControl import WebcamControl
 
@@ -18,12 +19,14 @@ class VideoCaptureThread(QThread):
         self.webcam_control = webcam_control
         self.video_display_label = video_display_label
         self.log = logging.getLogger(self.__class__.__name__)
+        # The QPixmap is a copy, thus the resized frame can be reused
+        self.frame_buffer_pool = FrameBufferPool()
 
     def run(self) -> None:
         self.log.info("started VideoCaptureThread")
+        self.webcam_control.add_frame_analyzed_callback(self.display_video_frame)
+        self.webcam_control.add_restart_video_capture_callback(self.on_video_capture_restart)
         while self.config.running.value:
-            self.webcam_control.frame_analyzed_callbacks.append(self.display_video_frame)
-            self.webcam_control.restart_video_capture_callbacks.append(self.on_video_capture_restart)
             try:
                 video_capture_error_message = self.webcam_control.start_video_capture()
                 if video_capture_error_message is not None:
@@ -33,7 +36,7 @@ class VideoCaptureThread(QThread):
                 self.log.exception(error_message)
                 self.video_display_label.setText(error_message)
 
-            # Wait until video capture should be restarted
+            # Wait until video capture should be restarted (if it has not been stopped for a restart already)
             while self.config.running.value and not self.webcam_control.is_restart_video_capture:
                 time.sleep(0.1)
 
@@ -44,7 +47,7 @@ class VideoCaptureThread(QThread):
             scale_x = label_width / frame_size.x
             scale_y = label_height / frame_size.y
             scale = min(scale_x, scale_y)
-            frame = cv2.resize(frame, None, fx=scale, fy=scale)
+            frame = resize_frame(frame, scale, "preview", self.frame_buffer_pool)
             image = QImage(frame, frame.shape[1], frame.shape[0],
                         frame.strides[0], QImage.Format_RGB888)
             self.video_display_label.setPixmap(QPixmap.fromImage(image))
@@ -3,6 +3,7 @@ from common.Config import Config
 from common.Config import VideoCaptureSource
 from common.LogHolder import LogHolder
 from common.Vector import Vector
+from .ConfigVariableCheckBox import ConfigVariableCheckBox
 from .MonitorSettingsWidget import MonitorDimensionSpinBox
 from .qt_util import new_label
 
@@ -17,32 +18,39 @@ class VideoSettingsWidget(QWidget, LogHolder):
 
         internal_webcam_widget = self.create_internal_webcam_widget()
         ip_webcam_widget = self.create_ip_webcam_widget()
+        video_file_widget = self.create_video_file_widget()
+        inference_widget = self.create_inference_widget()
 
         self.config.capture_source.subscribe_and_run(self.update_radio_buttons_by_capture_source)
 
         # Layout
         main_layout.addWidget(internal_webcam_widget)
         main_layout.addWidget(ip_webcam_widget)
+        main_layout.addWidget(video_file_widget)
+        main_layout.addWidget(inference_widget)
 
     def update_config_by_internal_webcam_button(self) -> None:
         if self.internal_webcam_widget.isChecked():
             self.config.capture_source.value = VideoCaptureSource.INTEGRATED_WEBCAM
-        else:
+        elif self.config.capture_source.value == VideoCaptureSource.INTEGRATED_WEBCAM:
             self.config.capture_source.value = VideoCaptureSource.IP_WEBCAM
 
     def update_config_by_ip_webcam_button(self) -> None:
         if self.ip_webcam_widget.isChecked():
             self.config.capture_source.value = VideoCaptureSource.IP_WEBCAM
-        else:
+        elif self.config.capture_source.value == VideoCaptureSource.IP_WEBCAM:
+            self.config.capture_source.value = VideoCaptureSource.INTEGRATED_WEBCAM
+
+    def update_config_by_video_file_button(self) -> None:
+        if self.video_file_widget.isChecked():
+            self.config.capture_source.value = VideoCaptureSource.FILE
+        elif self.config.capture_source.value == VideoCaptureSource.FILE:
             self.config.capture_source.value = VideoCaptureSource.INTEGRATED_WEBCAM
 
     def update_radio_buttons_by_capture_source(self, new_value: VideoCaptureSource) -> None:
-        if (new_value == VideoCaptureSource.INTEGRATED_WEBCAM):
-            self.internal_webcam_widget.setChecked(True)
-            self.ip_webcam_widget.setChecked(False)
-        elif (new_value == VideoCaptureSource.IP_WEBCAM):
-            self.internal_webcam_widget.setChecked(False)
-            self.ip_webcam_widget.setChecked(True)
+        self.internal_webcam_widget.setChecked(new_value == VideoCaptureSource.INTEGRATED_WEBCAM)
+        self.ip_webcam_widget.setChecked(new_value == VideoCaptureSource.IP_WEBCAM)
+        self.video_file_widget.setChecked(new_value == VideoCaptureSource.FILE)
 
     def add_capture_size_widgets(self, form_layout: QFormLayout) -> None:
         # Size
@@ -67,6 +75,10 @@ class VideoSettingsWidget(QWidget, LogHolder):
         self.config.capture_fps.subscribe_and_run(lambda new_value: self.capture_fps_spinner.setValue(new_value))
         self.capture_fps_spinner.valueChanged.connect(self.update_config_by_capture_fps)
 
+        high_frame_rate_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_high_frame_rate=}", "High frame rate")
+        high_frame_rate_checkbox.setToolTip("Uses more than 30 FPS if the camera supports it.\nOnly every Nth frame is analyzed when the analysis cannot keep up.")
+        form_layout.addRow(high_frame_rate_checkbox)
+
     def update_controls_of_capture_size(self, new_capture_size: Vector) -> None:
         self.capture_size_x_spinner.setValue(int(new_capture_size.x))
         self.capture_size_y_spinner.setValue(int(new_capture_size.y))
@@ -104,8 +116,78 @@ class VideoSettingsWidget(QWidget, LogHolder):
         self.config.capture_device_index.subscribe_and_run(lambda new_value: device_index_spinner.setValue(new_value))
         device_index_spinner.valueChanged.connect(lambda new_value: self.config.capture_device_index.set_value(new_value))
 
+        low_latency_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_capture_low_latency=}", "Low latency")
+        low_latency_checkbox.setToolTip("Keeps the camera buffer small and only decodes the newest frame when the analysis is ready for it.")
+        internal_webcam_form_layout.addRow(low_latency_checkbox)
+
+        # Camera mode autotuning
+        autotune_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_capture_autotune=}", "Choose camera mode automatically")
+        autotune_checkbox.setToolTip("Measures the modes of the webcam once and uses the cheapest mode that meets the target latency.\nOverrides size and FPS.")
+        internal_webcam_form_layout.addRow(autotune_checkbox)
+
+        target_latency_spinner = QSpinBox()
+        internal_webcam_form_layout.addRow(new_label("Target Latency (ms)", "Maximum latency of a camera mode when choosing the mode automatically."),
+                                           target_latency_spinner)
+        target_latency_spinner.setMinimum(5)
+        target_latency_spinner.setMaximum(500)
+        self.config.capture_target_latency_ms.subscribe_and_run(lambda new_value: target_latency_spinner.setValue(new_value))
+        target_latency_spinner.valueChanged.connect(lambda new_value: self.config.capture_target_latency_ms.set_value(new_value))
+
         return internal_webcam_group
 
+    def create_inference_widget(self) -> QWidget:
+        inference_group = QGroupBox("Hand Tracking")
+        inference_form_layout = QFormLayout()
+        inference_group.setLayout(inference_form_layout)
+
+        self.inference_size_x_spinner = MonitorDimensionSpinBox()
+        self.inference_size_y_spinner = MonitorDimensionSpinBox()
+        inference_form_layout.addRow(new_label("Max. Width (Pixels)", "Frames are reduced to this width before hand tracking.\nSmaller values reduce CPU usage."),
+                                     self.inference_size_x_spinner)
+        inference_form_layout.addRow(new_label("Max. Height (Pixels)", "Frames are reduced to this height before hand tracking.\nSmaller values reduce CPU usage."),
+                                     self.inference_size_y_spinner)
+
+        self.config.inference_size.subscribe_and_run(self.update_controls_of_inference_size)
+        self.inference_size_x_spinner.valueChanged.connect(self.update_config_by_inference_size) # type: ignore
+        self.inference_size_y_spinner.valueChanged.connect(self.update_config_by_inference_size) # type: ignore
+
+        hand_region_tracking_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_hand_region_tracking=}", "Only analyze region around hand")
+        hand_region_tracking_checkbox.setToolTip("Once a hand has been found, only the region around it is analyzed in the next frame.")
+        inference_form_layout.addRow(hand_region_tracking_checkbox)
+
+        motion_gate_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_motion_gate=}", "Pause analysis on static scene")
+        motion_gate_checkbox.setToolTip("While no hand is present and nothing moves, the hand tracking only checks the frame from time to time.")
+        inference_form_layout.addRow(motion_gate_checkbox)
+
+        inference_worker_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_inference_worker=}", "Run hand tracking in separate process")
+        inference_worker_checkbox.setToolTip("Hand tracking runs in parallel to video capture, gesture recognition and user interface.\nUses more memory.")
+        inference_form_layout.addRow(inference_worker_checkbox)
+
+        adaptive_inference_quality_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_adaptive_inference_quality=}", "Adapt hand tracking quality")
+        adaptive_inference_quality_checkbox.setToolTip("Uses a faster model, lower confidences and smaller frames when hand tracking takes longer than the time budget.")
+        inference_form_layout.addRow(adaptive_inference_quality_checkbox)
+
+        inference_time_budget_spinner = QSpinBox()
+        inference_form_layout.addRow(new_label("Time Budget (ms)", "Maximum time of the hand tracking per frame before its quality is reduced."),
+                                     inference_time_budget_spinner)
+        inference_time_budget_spinner.setMinimum(1)
+        inference_time_budget_spinner.setMaximum(1000)
+        self.config.inference_time_budget_ms.subscribe_and_run(lambda new_value: inference_time_budget_spinner.setValue(new_value))
+        inference_time_budget_spinner.valueChanged.connect(lambda new_value: self.config.inference_time_budget_ms.set_value(new_value))
+
+        analysis_pipeline_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.is_analysis_pipeline=}", "Analyze in parallel stages")
+        analysis_pipeline_checkbox.setToolTip("The next frame is prepared while the current frame is analyzed.\nIncreases the frame rate on computers with multiple cores.")
+        inference_form_layout.addRow(analysis_pipeline_checkbox)
+
+        return inference_group
+
+    def update_controls_of_inference_size(self, new_inference_size: Vector) -> None:
+        self.inference_size_x_spinner.setValue(int(new_inference_size.x))
+        self.inference_size_y_spinner.setValue(int(new_inference_size.y))
+
+    def update_config_by_inference_size(self) -> None:
+        self.config.inference_size.value = Vector(self.inference_size_x_spinner.value(), self.inference_size_y_spinner.value())
+
     def create_ip_webcam_widget(self) -> QWidget:
         ip_webcam_group = QGroupBox("IP Webcam")
         ip_webcam_grid_layout = QGridLayout()
@@ -128,4 +210,33 @@ class VideoSettingsWidget(QWidget, LogHolder):
         self.config.capture_source_url.subscribe_and_run(lambda new_value: self.ip_webcam_url_text_edit.setText(new_value))
         self.ip_webcam_url_text_edit.editingFinished.connect(lambda: self.config.capture_source_url.set_value(self.ip_webcam_url_text_edit.text()))  # type: ignore
 
-        return ip_webcam_group
\ No newline at end of file
+        return ip_webcam_group
+
+    def create_video_file_widget(self) -> QWidget:
+        video_file_group = QGroupBox("Video File")
+        video_file_grid_layout = QGridLayout()
+        video_file_group.setLayout(video_file_grid_layout)
+
+        self.video_file_widget = QCheckBox("Use Video File")
+        self.video_file_widget.setToolTip("Specifies that a recorded video or a folder of images should be played instead of a camera (e.g. to measure performance).")
+        video_file_grid_layout.addWidget(self.video_file_widget, 0, 0)
+
+        self.video_file_widget.toggled.connect(self.update_config_by_video_file_button)  # type: ignore
+
+        # Path
+        video_file_form_layout = QFormLayout()
+        video_file_grid_layout.addLayout(video_file_form_layout, 1, 0)
+        self.video_file_path_text_edit = QLineEdit()
+        video_file_form_layout.addRow(new_label("Path",
+                                                "Path of a video file or of a folder with images.\nImages are played in the order of their file names."),
+                                      self.video_file_path_text_edit)
+
+        self.config.capture_file_path.subscribe_and_run(lambda new_value: self.video_file_path_text_edit.setText(new_value))
+        self.video_file_path_text_edit.editingFinished.connect(lambda: self.config.capture_file_path.set_value(self.video_file_path_text_edit.text()))  # type: ignore
+
+        video_file_form_layout.addRow(ConfigVariableCheckBox(self.config, f"{self.config.capture_file_loop=}", "Loop"))
+        realtime_checkbox = ConfigVariableCheckBox(self.config, f"{self.config.capture_file_realtime=}", "Play at original speed")
+        realtime_checkbox.setToolTip("Otherwise frames are played as fast as they can be analyzed.")
+        video_file_form_layout.addRow(realtime_checkbox)
+
+        return video_file_group
@@ -1,14 +1,20 @@
 from __future__ import annotations
 import logging
+import multiprocessing
 from common.version import version
 from common.Log import init_logging
 from common.AppContext import AppContext
 
-# Setup logging
-init_logging()
-logging.getLogger('root').info("=============================================")
-logging.getLogger('root').info(f"DedoMouse {version} started")
-logging.getLogger('root').info("=============================================")
+# The inference worker process imports this module again (Windows, macOS), thus the app must only start in the main process.
+if __name__ == "__main__":
+    # Needed for worker processes of the packaged app
+    multiprocessing.freeze_support()
 
-AppContext.configure_json_handlers()
-appContext = AppContext()
+    # Setup logging
+    init_logging()
+    logging.getLogger('root').info("=============================================")
+    logging.getLogger('root').info(f"DedoMouse {version} started")
+    logging.getLogger('root').info("=============================================")
+
+    AppContext.configure_json_handlers()
+    appContext = AppContext()
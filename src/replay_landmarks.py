@@ -0,0 +1,30 @@
+from __future__ import annotations
+import argparse
+import logging
+from typing import List
+from common.Log import init_logging
+from common.AppContext import AppContext
+from common.LandmarkReplay import LandmarkReplay
+
+# Replays a landmark recording through the gesture recognition without camera, hand tracking and GUI.
+# Example: python replay_landmarks.py recordings/landmarks-20211001-120000.npy --speed 0
+parser = argparse.ArgumentParser(description="Replay recorded hand landmarks through the gesture recognition.")
+parser.add_argument("file_path", help="landmark recording (.npy)")
+parser.add_argument("--speed", type=float, default=1, help="1 replays with the original timing, 0 as fast as possible")
+parser.add_argument("--mouse-output", action="store_true", help="move and click the real mouse")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+    init_logging()
+
+    AppContext.configure_json_handlers()
+    app_context = AppContext(is_headless=True)
+    app_context.mouse_control.is_output_enabled = args.mouse_output
+
+    performed_action_descriptions: List[str] = []
+    app_context.mouse_control.performed_action_desciption.subscribe(performed_action_descriptions.append)
+
+    landmark_replay = LandmarkReplay(app_context, args.file_path)
+    landmark_replay.run(args.speed)
+    logging.getLogger("root").info(f"performed actions: {len(performed_action_descriptions)}")
+    logging.getLogger("root").info(f"gesture predicate cache statistics: {app_context.gesture_recognizer.gesture_predicate_cache.get_statistics_text()}")
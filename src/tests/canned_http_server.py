@@ -0,0 +1,248 @@
+from __future__ import annotations
+from typing import Any, Dict, List, TypeVar, Union
+import hashlib
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from cv2 import cv2
+import numpy as np
+
+def create_jpeg(gray_level: int, width: int = 64, height: int = 48) -> bytes:
+    """ JPEG of a single gray level, such that decoded frames can be told apart by get_gray_level. """
+    frame = np.full((height, width, 3), gray_level, dtype=np.uint8)
+    is_success, data = cv2.imencode(".jpg", frame)
+    assert is_success
+    return data.tobytes()
+
+def get_gray_level(frame: Any) -> int:
+    return int(round(float(frame.mean())))
+
+# Numbered frames: the bits of the number are black or white blocks, which survive JPEG compression
+frame_number_bit_count = 16
+frame_number_block_width = 8
+
+def create_numbered_jpeg(number: int, height: int = 48) -> bytes:
+    frame = np.zeros((height, frame_number_bit_count * frame_number_block_width, 3), dtype=np.uint8)
+    for bit_index in range(frame_number_bit_count):
+        if number & (1 << bit_index):
+            frame[:, bit_index * frame_number_block_width:(bit_index + 1) * frame_number_block_width] = 255
+    is_success, data = cv2.imencode(".jpg", frame)
+    assert is_success
+    return data.tobytes()
+
+def get_frame_number(frame: Any) -> int:
+    number = 0
+    for bit_index in range(frame_number_bit_count):
+        # Inner pixels of the block
+        block = frame[:, bit_index * frame_number_block_width + 2:(bit_index + 1) * frame_number_block_width - 2]
+        if block.mean() > 127:
+            number = number | (1 << bit_index)
+    return number
+
+class QuietHttpServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients close their connections when stopped
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+CannedHttpServerType = TypeVar("CannedHttpServerType", bound="CannedHttpServer")
+
+class CannedHttpServer:
+    """ Local stand-in for an IP webcam app. Serves canned responses on a free port of localhost. """
+    def __init__(self, handler_class: Any) -> None:
+        self.http_server = QuietHttpServer(("127.0.0.1", 0), handler_class)
+        # Handlers reach the state of the stand-in via self.server.canned_http_server
+        self.http_server.canned_http_server = self # type: ignore
+        self.thread = threading.Thread(target=self.http_server.serve_forever, daemon=True)
+        self.lock = threading.Lock()
+        self.request_count = 0
+        self.connection_count = 0
+
+        self.is_stopped = False
+
+    def get_url(self, path: str) -> str:
+        return f"http://127.0.0.1:{self.http_server.server_address[1]}{path}"
+
+    def __enter__(self: CannedHttpServerType) -> CannedHttpServerType:
+        """ Returns the server itself, typed as its subclass (e.g. MjpegServer). """
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.is_stopped = True
+        self.http_server.shutdown()
+        self.http_server.server_close()
+
+    def count_request(self) -> int:
+        """ Returns the index of the request. """
+        with self.lock:
+            self.request_count = self.request_count + 1
+            return self.request_count - 1
+
+    def count_connection(self) -> None:
+        with self.lock:
+            self.connection_count = self.connection_count + 1
+
+class SnapshotServer(CannedHttpServer):
+    """ Serves the snapshots one after another on '/shot.jpg', then repeats the last one.
+    responses_per_connection: the server closes the connection after this many responses (0 for keep-alive).
+    dropped_request_count: the first requests are answered by closing the connection without response.
+    """
+    def __init__(self,
+            snapshots: List[bytes],
+            is_etag: bool = True,
+            responses_per_connection: int = 0,
+            dropped_request_count: int = 0) -> None:
+        super().__init__(SnapshotRequestHandler)
+        self.snapshots = snapshots
+        self.is_etag = is_etag
+        self.responses_per_connection = responses_per_connection
+        self.dropped_request_count = dropped_request_count
+        self.not_modified_count = 0
+
+    def get_snapshot(self, request_index: int) -> bytes:
+        return self.snapshots[min(request_index, len(self.snapshots) - 1)]
+
+class SnapshotRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        super().setup()
+        self.response_count = 0
+        self.get_canned_http_server().count_connection()
+
+    def get_canned_http_server(self) -> SnapshotServer:
+        return self.server.canned_http_server # type: ignore
+
+    def do_GET(self) -> None:
+        snapshot_server = self.get_canned_http_server()
+        request_index = snapshot_server.count_request()
+        if request_index < snapshot_server.dropped_request_count:
+            self.close_connection = True
+            return
+
+        self.response_count = self.response_count + 1
+        is_last_response = 0 < snapshot_server.responses_per_connection <= self.response_count
+        body = snapshot_server.get_snapshot(request_index)
+        etag: Union[str, None] = None
+        if snapshot_server.is_etag:
+            etag = f"\"{hashlib.md5(body).hexdigest()}\""
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            with snapshot_server.lock:
+                snapshot_server.not_modified_count = snapshot_server.not_modified_count + 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_connection_header(is_last_response)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.send_connection_header(is_last_response)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_connection_header(self, is_last_response: bool) -> None:
+        if is_last_response:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+
+    def log_message(self, format: str, *args: Any) -> None: # pylint: disable=redefined-builtin
+        pass
+
+class MjpegServer(CannedHttpServer):
+    """ Streams numbered JPEGs (see get_frame_number) as multipart/x-mixed-replace on '/video'.
+    Frame numbers continue across connections.
+    fps: frames per second, 0 for as fast as possible.
+    frame_count: the server closes the stream after this many frames per connection (0 for endless).
+    write_size: parts are written in pieces of this size, such that delimiters are split across reads (0 for whole parts).
+    is_content_length: whether the parts have a Content-Length header.
+    is_truncated: the last part of a stream is cut off in the middle of the JPEG.
+    """
+    boundary = "canned-frame"
+
+    def __init__(self,
+            fps: float = 0,
+            frame_count: int = 0,
+            write_size: int = 0,
+            is_content_length: bool = True,
+            is_truncated: bool = False) -> None:
+        super().__init__(MjpegRequestHandler)
+        self.fps = fps
+        self.frame_count = frame_count
+        self.write_size = write_size
+        self.is_content_length = is_content_length
+        self.is_truncated = is_truncated
+        self.next_frame_number = 0
+        # Number of the last frame that has been sent completely, -1 before the first one
+        self.last_sent_frame_number = -1
+        self.jpeg_cache: Dict[int, bytes] = {}
+
+    def get_jpeg(self, frame_number: int) -> bytes:
+        jpeg = self.jpeg_cache.get(frame_number)
+        if jpeg is None:
+            jpeg = create_numbered_jpeg(frame_number)
+            self.jpeg_cache[frame_number] = jpeg
+        return jpeg
+
+    def take_frame_number(self) -> int:
+        with self.lock:
+            self.next_frame_number = self.next_frame_number + 1
+            return self.next_frame_number - 1
+
+class MjpegRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Small pieces are sent right away instead of being merged
+    disable_nagle_algorithm = True
+
+    def get_canned_http_server(self) -> MjpegServer:
+        return self.server.canned_http_server # type: ignore
+
+    def do_GET(self) -> None:
+        mjpeg_server = self.get_canned_http_server()
+        mjpeg_server.count_connection()
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={mjpeg_server.boundary}")
+        self.send_header("Connection", "close")
+        self.end_headers()
+
+        start_time = time.monotonic()
+        sent_frame_count = 0
+        while not mjpeg_server.is_stopped and (mjpeg_server.frame_count <= 0 or sent_frame_count < mjpeg_server.frame_count):
+            if mjpeg_server.fps > 0:
+                remaining_seconds = start_time + sent_frame_count / mjpeg_server.fps - time.monotonic()
+                if remaining_seconds > 0:
+                    time.sleep(remaining_seconds)
+            frame_number = mjpeg_server.take_frame_number()
+            jpeg = mjpeg_server.get_jpeg(frame_number)
+            sent_frame_count = sent_frame_count + 1
+            is_last_part = 0 < mjpeg_server.frame_count <= sent_frame_count
+            if is_last_part and mjpeg_server.is_truncated:
+                self.write_in_pieces(self.create_part_headers(jpeg) + jpeg[:len(jpeg) // 2])
+                return
+            self.write_in_pieces(self.create_part_headers(jpeg) + jpeg + b"\r\n")
+            mjpeg_server.last_sent_frame_number = frame_number
+        self.write_in_pieces(f"--{mjpeg_server.boundary}--\r\n".encode("latin-1"))
+
+    def create_part_headers(self, jpeg: bytes) -> bytes:
+        mjpeg_server = self.get_canned_http_server()
+        headers = f"--{mjpeg_server.boundary}\r\nContent-Type: image/jpeg\r\n"
+        if mjpeg_server.is_content_length:
+            headers = headers + f"Content-Length: {len(jpeg)}\r\n"
+        return (headers + "\r\n").encode("latin-1")
+
+    def write_in_pieces(self, data: bytes) -> None:
+        write_size = self.get_canned_http_server().write_size or len(data)
+        for start_index in range(0, len(data), write_size):
+            self.wfile.write(data[start_index:start_index + write_size])
+            self.wfile.flush()
+
+    def log_message(self, format: str, *args: Any) -> None: # pylint: disable=redefined-builtin
+        pass
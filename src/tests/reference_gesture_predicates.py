@@ -0,0 +1,132 @@
+from __future__ import annotations
+from typing import Callable, List, TypeVar
+from common.FingerPosition import FingerPosition
+from common.HandFingerPositions import HandFingerPositions
+from common.Vector import Vector
+
+# The gesture predicates of GestureRecognizer and util before they were replaced by HandFeatures and the GestureRuleEngine.
+# They work on the FingerPositions (Vectors) of a hand, one landmark at a time, and serve as reference for the NumPy lookups.
+
+T = TypeVar('T')
+
+def get_elements_except(all_elements: List[T], elements_to_exclude: List[T]) -> List[T]:
+    return [x for x in all_elements if x not in elements_to_exclude]
+
+def get_min_element(elements: List[T], element_to_value: Callable[[T], float]) -> T:
+    min_element = elements[0]
+    min_element_value = element_to_value(min_element)
+    for element in elements:
+        element_value = element_to_value(element)
+        if (element_value < min_element_value):
+            min_element = element
+            min_element_value = element_value
+    return min_element
+
+def get_max_element(elements: List[T], element_to_value: Callable[[T], float]) -> T:
+    max_element = elements[0]
+    max_element_value = element_to_value(max_element)
+    for element in elements:
+        element_value = element_to_value(element)
+        if (element_value > max_element_value):
+            max_element = element
+            max_element_value = element_value
+    return max_element
+
+def all_increasing(elements: List[T], element_to_value: Callable[[T], float]) -> bool:
+    previous_element_value = element_to_value(elements[0])
+    for i in range(1, len(elements)):
+        element_value = element_to_value(elements[i])
+        if previous_element_value > element_value:
+            return False
+        previous_element_value = element_value
+    return True
+
+def all_decreasing(elements: List[T], element_to_value: Callable[[T], float]) -> bool:
+    previous_element_value = element_to_value(elements[0])
+    for i in range(1, len(elements)):
+        element_value = element_to_value(elements[i])
+        if previous_element_value < element_value:
+            return False
+        previous_element_value = element_value
+    return True
+
+def is_faraway_target(finger_positions: List[FingerPosition], target_position: FingerPosition, faraway_distance: float) -> bool:
+    finger_target_distances_percent = [Vector.distance_xy(finger_position.percent, target_position.percent) for finger_position in finger_positions]
+    return all(distance_percent > faraway_distance for distance_percent in finger_target_distances_percent)
+
+def is_near_target(finger_positions: List[FingerPosition], target_position: FingerPosition, near_distance: float) -> bool:
+    finger_target_distances_percent = [Vector.distance_xy(finger_position.percent, target_position.percent) for finger_position in finger_positions]
+    return all(distance_percent < near_distance for distance_percent in finger_target_distances_percent)
+
+def is_only_near_thumb(hand_finger_positions: HandFingerPositions, near_tip_indexes: List[int], near_distance: float, faraway_distance: float) -> bool:
+    """ The click gestures: the tips are near the thumb tip, the tips of the other fingers are faraway. """
+    thumb_tip = hand_finger_positions.thumb_tip_position
+    tip_indexes = [HandFingerPositions.index_tip_index, HandFingerPositions.middle_tip_index,
+                   HandFingerPositions.ring_tip_index, HandFingerPositions.pinky_tip_index]
+    near_tips = hand_finger_positions.get_finger_positions_by_index(near_tip_indexes)
+    faraway_tips = hand_finger_positions.get_finger_positions_by_index([index for index in tip_indexes if index not in near_tip_indexes])
+    return is_near_target(near_tips, thumb_tip, near_distance) and is_faraway_target(faraway_tips, thumb_tip, faraway_distance)
+
+def is_thumb_up(hand_finger_positions: HandFingerPositions) -> bool:
+    # thumb must be vertically aligned upwards
+    if (not is_vertically_aligned_upwards(hand_finger_positions.thumb_finger_positions)):
+        return False
+
+    # thumb must be at the top
+    relevant_thumb_positions = get_elements_except(hand_finger_positions.thumb_finger_positions, [hand_finger_positions.thumb_finger_positions[0], hand_finger_positions.thumb_finger_positions[1]])
+    lowest_thumb_joint = get_min_element(relevant_thumb_positions, lambda finger_position: finger_position.px.y)
+    all_finger_positions_except_thumb = get_elements_except(hand_finger_positions.all_finger_positions, hand_finger_positions.thumb_finger_positions)
+    is_thumb_at_top = all(finger_position.px.y > lowest_thumb_joint.px.y for finger_position in all_finger_positions_except_thumb)
+    if (not is_thumb_at_top):
+        return False
+
+    # other finger joints are vertically aligned and curved
+    return is_fingers_aligned_for_thumb_up_or_thumb_down(hand_finger_positions, True)
+
+def is_thumb_down(hand_finger_positions: HandFingerPositions) -> bool:
+    # thumb must be vertically aligned downwards
+    if (not is_vertically_aligned_downwards(hand_finger_positions.thumb_finger_positions)):
+        return False
+
+    # thumb must be at the bottom
+    relevant_thumb_positions = get_elements_except(hand_finger_positions.thumb_finger_positions, [hand_finger_positions.thumb_finger_positions[0], hand_finger_positions.thumb_finger_positions[1]])
+    highest_thumb_joint = get_max_element(relevant_thumb_positions, lambda finger_position: finger_position.px.y)
+    all_finger_positions_except_thumb = get_elements_except(hand_finger_positions.all_finger_positions, hand_finger_positions.thumb_finger_positions)
+    is_thumb_at_bottom = all(finger_position.px.y < highest_thumb_joint.px.y for finger_position in all_finger_positions_except_thumb)
+    if (not is_thumb_at_bottom):
+        return False
+
+    # other finger joints are vertically aligned and curved
+    return is_fingers_aligned_for_thumb_up_or_thumb_down(hand_finger_positions, False)
+
+def is_fingers_aligned_for_thumb_up_or_thumb_down(hand_finger_positions: HandFingerPositions, is_thumb_up_direction: bool) -> bool:
+    # Fingers are curved
+    if (is_finger_straight_horizontally(hand_finger_positions.index_finger_positions)
+            or is_finger_straight_horizontally(hand_finger_positions.middle_finger_positions)
+            or is_finger_straight_horizontally(hand_finger_positions.ring_finger_positions)
+            or is_finger_straight_horizontally(hand_finger_positions.pinky_finger_positions)):
+        return False
+
+    # Finger joints are vertically aligned.
+    # Note that depending on the gesture, the camera is faced with different joints
+    if is_thumb_up_direction:
+        return is_vertically_aligned_downwards(hand_finger_positions.get_finger_positions_by_index([5, 9, 13, 17]))
+    return is_vertically_aligned_upwards(hand_finger_positions.get_finger_positions_by_index([6, 10, 14, 18]))
+
+def is_finger_straight_horizontally(finger_positions: List[FingerPosition]) -> bool:
+    # stretched finger joints: 0-1-2
+    # curved finger joints: 0-2-1
+    return (all_increasing(finger_positions, lambda finger_position: finger_position.px.x)
+            or all_decreasing(finger_positions, lambda finger_position: finger_position.px.x))
+
+def is_vertically_aligned_upwards(finger_positions: List[FingerPosition]) -> bool:
+    for i in range(1, len(finger_positions)):
+        if (finger_positions[i - 1].px.y < finger_positions[i].px.y):
+            return False
+    return True
+
+def is_vertically_aligned_downwards(finger_positions: List[FingerPosition]) -> bool:
+    for i in range(1, len(finger_positions)):
+        if (finger_positions[i - 1].px.y > finger_positions[i].px.y):
+            return False
+    return True
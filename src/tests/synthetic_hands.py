@@ -0,0 +1,100 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+import numpy as np
+from common.ArrayHandLandmarks import ArrayHandLandmarks
+from common.LandmarkRecorder import LandmarkRecorder
+from common.Vector import Vector
+
+# Hands in pixel coordinates of a 640x480 frame, as seen by a front camera with the palm to the camera.
+# The gestures correspond to the default gesture rules (see get_default_gesture_rules).
+capture_size = Vector(640, 480)
+
+open_hand_px = np.array([[320, 400], [280, 375], [255, 340], [235, 310], [220, 285],
+                         [290, 275], [285, 225], [285, 195], [285, 170],
+                         [320, 270], [320, 215], [320, 180], [320, 155],
+                         [350, 275], [355, 225], [355, 195], [355, 175],
+                         [375, 290], [385, 250], [390, 230], [395, 210]], dtype=np.float64)
+
+# Fist seen from the side with the thumb up: the thumb points upwards above the curled fingers.
+# The knuckles of the curled fingers are ordered from top to bottom, their joints are not ordered from left to right.
+thumb_up_px = np.array([[300, 360], [300, 300], [300, 260], [300, 220], [300, 180],
+                        [330, 250], [370, 255], [355, 270], [340, 265],
+                        [330, 280], [370, 285], [355, 300], [340, 295],
+                        [330, 310], [370, 315], [355, 330], [340, 325],
+                        [330, 340], [370, 345], [355, 360], [340, 355]], dtype=np.float64)
+
+# The thumb up hand upside down. The middle joints are ordered from bottom to top.
+thumb_down_px = thumb_up_px * [1, -1] + [0, 480]
+
+# Finger tips that touch the thumb tip in each click gesture
+pinched_tip_indexes = {
+    "left click": [8],
+    "right click": [12, 16],
+    "middle click": [16, 20],
+}
+
+gesture_names = ["open hand", "left click", "right click", "middle click", "thumb up", "thumb down"]
+
+def create_hand_px(gesture_name: str) -> Any:
+    if gesture_name == "thumb up":
+        return thumb_up_px.copy()
+    if gesture_name == "thumb down":
+        return thumb_down_px.copy()
+    hand_px = open_hand_px.copy()
+    for tip_index in pinched_tip_indexes.get(gesture_name, []):
+        hand_px[tip_index] = hand_px[4] + [5, -5]
+    return hand_px
+
+def to_landmarks(hand_px: Any) -> Any:
+    """ Landmarks in percent of the frame size, as float32 array of shape (21, 3). """
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    landmarks[:, :2] = hand_px / [capture_size.x, capture_size.y]
+    return landmarks
+
+def create_session(frame_count: int, seed: int = 0, jitter_px: float = 1.5, frames_per_gesture: int = 30) -> List[Tuple[int, Any]]:
+    """ Returns (time in ms, landmarks or None) of a session at 30 fps.
+    The hand drifts over the frame and shows the gestures in turn, each followed by the open hand.
+    The landmarks jitter as with a real hand tracking. Between some gestures, the hand is not visible.
+    """
+    rng = np.random.default_rng(seed)
+    session: List[Tuple[int, Any]] = []
+    for frame_index in range(frame_count):
+        time_ms = round(frame_index * 1000 / 30)
+        phase_index = frame_index // frames_per_gesture
+        if phase_index % 13 == 12:
+            session.append((time_ms, None))
+            continue
+        gesture_name = gesture_names[(phase_index + 1) // 2 % len(gesture_names)] if phase_index % 2 == 1 else "open hand"
+        drift_px = [40 * np.sin(frame_index / 50), 20 * np.sin(frame_index / 70)]
+        hand_px = create_hand_px(gesture_name) + drift_px + rng.normal(0, jitter_px, (21, 2))
+        session.append((time_ms, to_landmarks(hand_px)))
+    return session
+
+def create_random_hands(count: int, seed: int = 0) -> List[Any]:
+    """ Returns landmarks of unlikely hands, including joints at the same pixel row or column, and tips at the thresholds. """
+    rng = np.random.default_rng(seed)
+    hands = []
+    for hand_index in range(count):
+        kind = hand_index % 4
+        if kind == 0:
+            hand_px = rng.uniform(0, 640, (21, 2))
+        elif kind == 1:
+            # Few distinct pixel coordinates, thus many joints are at the same row or column
+            hand_px = rng.integers(0, 4, (21, 2)).astype(np.float64) * 20
+        elif kind == 2:
+            hand_px = create_hand_px(gesture_names[hand_index % len(gesture_names)]) + rng.normal(0, 15, (21, 2))
+        else:
+            # Tips around the near and faraway thresholds of the default config (5 % and 7.5 %)
+            hand_px = create_hand_px("open hand")
+            directions = rng.normal(0, 1, (4, 2))
+            directions = directions / np.linalg.norm(directions, axis=1)[:, np.newaxis]
+            distances_percent = rng.choice([0.05, 0.075], 4) + rng.normal(0, 0.002, 4)
+            hand_px[[8, 12, 16, 20]] = hand_px[4] + directions * distances_percent[:, np.newaxis] * [capture_size.x, capture_size.y]
+        hands.append(to_landmarks(hand_px))
+    return hands
+
+def write_landmark_recording(file_path: str, session: List[Tuple[int, Any]]) -> None:
+    landmark_recorder = LandmarkRecorder(file_path)
+    for time_ms, landmarks in session:
+        landmark_recorder.add_record(time_ms, ArrayHandLandmarks(landmarks) if landmarks is not None else None, capture_size)
+    landmark_recorder.close()
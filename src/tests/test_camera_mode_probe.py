@@ -0,0 +1,190 @@
+from __future__ import annotations
+import json
+from typing import Any, Dict, List, Tuple, Union
+from cv2 import cv2
+import numpy as np
+import pytest
+from common.CameraModeProbe import CameraModeProbe, fourcc_to_int, int_to_fourcc, video_capture_backends
+from common.Vector import Vector
+
+class FakeClock:
+    """ Replaces the time module of the probe, such that the fake camera determines the measured frame rate and read time. """
+    def __init__(self) -> None:
+        self.seconds = 0.0
+
+    def monotonic(self) -> float:
+        return self.seconds
+
+class FakeCameraMode:
+    def __init__(self, fourcc: str, width: int, height: int, fps: float, read_ms: float) -> None:
+        self.fourcc = fourcc
+        self.width = width
+        self.height = height
+        self.fps = fps
+        # Time that a read blocks for a frame
+        self.read_ms = read_ms
+
+class FakeCamera:
+    """ Camera that supports a set of modes. Like a real camera, it silently keeps its current mode if a requested mode is not supported. """
+    def __init__(self, backend_name: str, modes: List[FakeCameraMode]) -> None:
+        self.backend_name = backend_name
+        self.modes = modes
+
+class FakeVideoCapture:
+    def __init__(self, camera: Union[FakeCamera, None], clock: FakeClock) -> None:
+        self.camera = camera
+        self.clock = clock
+        self.mode = camera.modes[0] if camera else None
+        self.requested: Dict[int, float] = {}
+
+    def isOpened(self) -> bool:
+        return self.camera is not None
+
+    def set(self, property_id: int, value: float) -> bool:
+        self.requested[property_id] = value
+        return True
+
+    def apply_requested_mode(self) -> None:
+        """ Like a driver when streaming starts, switches to the requested mode if it is supported. """
+        if not self.requested:
+            return
+        requested_fourcc = int_to_fourcc(self.requested.get(cv2.CAP_PROP_FOURCC, fourcc_to_int(self.mode.fourcc))) # type: ignore
+        for mode in self.camera.modes: # type: ignore
+            if (mode.fourcc == requested_fourcc
+                    and mode.width == self.requested.get(cv2.CAP_PROP_FRAME_WIDTH, mode.width)
+                    and mode.height == self.requested.get(cv2.CAP_PROP_FRAME_HEIGHT, mode.height)
+                    and mode.fps == self.requested.get(cv2.CAP_PROP_FPS, mode.fps)):
+                self.mode = mode
+        self.requested = {}
+
+    def get(self, property_id: int) -> float:
+        self.apply_requested_mode()
+        values = {
+            cv2.CAP_PROP_FOURCC: fourcc_to_int(self.mode.fourcc), # type: ignore
+            cv2.CAP_PROP_FRAME_WIDTH: self.mode.width, # type: ignore
+            cv2.CAP_PROP_FRAME_HEIGHT: self.mode.height, # type: ignore
+            cv2.CAP_PROP_FPS: self.mode.fps, # type: ignore
+        }
+        return values.get(property_id, 0)
+
+    def read(self) -> Tuple[bool, Any]:
+        self.apply_requested_mode()
+        # A frame every 1 / fps seconds, that is delivered after the read time
+        self.clock.seconds = self.clock.seconds + max(1 / self.mode.fps, self.mode.read_ms / 1000) # type: ignore
+        return True, np.zeros((self.mode.height, self.mode.width, 3), dtype=np.uint8) # type: ignore
+
+    def release(self) -> None:
+        pass
+
+class FakeCaptureBackend:
+    """ Capture factory with the cameras at the device indexes, each of which is available with one backend. """
+    def __init__(self, clock: FakeClock) -> None:
+        self.clock = clock
+        self.cameras: Dict[int, FakeCamera] = {}
+        self.device_names: Dict[int, str] = {}
+        self.open_count = 0
+
+    def create_capture(self, device_index: int, backend_id: int) -> FakeVideoCapture:
+        self.open_count = self.open_count + 1
+        camera = self.cameras.get(device_index)
+        if camera is not None and video_capture_backends[camera.backend_name] != backend_id:
+            camera = None
+        return FakeVideoCapture(camera, self.clock)
+
+def create_fast_camera() -> FakeCamera:
+    return FakeCamera("V4L2", [
+        # Uncompressed frames take longer to transfer
+        FakeCameraMode("YUYV", 640, 480, 30, 50),
+        FakeCameraMode("MJPG", 640, 480, 30, 5),
+        FakeCameraMode("MJPG", 1280, 720, 60, 10),
+        # Advertises 30 fps but delivers 10 fps
+        FakeCameraMode("YUYV", 1920, 1080, 30, 100),
+    ])
+
+def create_slow_camera() -> FakeCamera:
+    return FakeCamera("V4L2", [FakeCameraMode("YUYV", 640, 480, 30, 50)])
+
+@pytest.fixture(name="fake_capture_backend")
+def fixture_fake_capture_backend(monkeypatch: Any) -> FakeCaptureBackend:
+    clock = FakeClock()
+    monkeypatch.setattr("common.CameraModeProbe.time", clock)
+    return FakeCaptureBackend(clock)
+
+def create_camera_mode_probe(fake_capture_backend: FakeCaptureBackend, cache_file_path: Any) -> CameraModeProbe:
+    camera_mode_probe = CameraModeProbe(fake_capture_backend.create_capture,
+                                        lambda device_index: fake_capture_backend.device_names.get(device_index, ""))
+    camera_mode_probe.cache_file_path = str(cache_file_path)
+    camera_mode_probe.get_available_backend_names = lambda: ["V4L2", "FFMPEG"] # type: ignore
+    return camera_mode_probe
+
+def get_mode_text(camera_mode: Any) -> str:
+    return f"{camera_mode.backend_name} {camera_mode.fourcc} {camera_mode.width}x{camera_mode.height}@{camera_mode.requested_fps}"
+
+def test_probe_finds_accepted_modes(fake_capture_backend: FakeCaptureBackend, tmp_path: Any) -> None:
+    fake_capture_backend.cameras[0] = create_fast_camera()
+    camera_mode_probe = create_camera_mode_probe(fake_capture_backend, tmp_path / "camera_modes.json")
+    modes = camera_mode_probe.probe(0)
+    assert [get_mode_text(mode) for mode in modes] == ["V4L2 MJPG 640x480@30", "V4L2 MJPG 1280x720@60",
+                                                        "V4L2 YUYV 640x480@30", "V4L2 YUYV 1920x1080@30"]
+    assert [round(mode.measured_fps) for mode in modes] == [30, 60, 20, 10]
+    assert [round(mode.read_latency_ms) for mode in modes] == [33, 17, 50, 100]
+
+@pytest.mark.parametrize("target_latency_ms, min_size, expected_mode_text", [
+    # The smallest mode that is fast enough
+    (100, Vector(320, 240), "V4L2 MJPG 640x480@30"),
+    # Large enough
+    (100, Vector(1280, 720), "V4L2 MJPG 1280x720@60"),
+    # No mode is fast enough for the target, thus the fastest large enough mode
+    (1, Vector(1280, 720), "V4L2 MJPG 1280x720@60"),
+    # No mode is large enough, thus all modes are candidates
+    (200, Vector(4096, 2160), "V4L2 MJPG 640x480@30"),
+])
+def test_best_mode_is_selected(fake_capture_backend: FakeCaptureBackend, tmp_path: Any,
+                               target_latency_ms: float, min_size: Vector, expected_mode_text: str) -> None:
+    fake_capture_backend.cameras[0] = create_fast_camera()
+    camera_mode_probe = create_camera_mode_probe(fake_capture_backend, tmp_path / "camera_modes.json")
+    best_mode = camera_mode_probe.get_best_mode(0, target_latency_ms, min_size)
+    assert get_mode_text(best_mode) == expected_mode_text
+
+def test_no_mode_without_camera(fake_capture_backend: FakeCaptureBackend, tmp_path: Any) -> None:
+    camera_mode_probe = create_camera_mode_probe(fake_capture_backend, tmp_path / "camera_modes.json")
+    assert camera_mode_probe.get_best_mode(0, 100, Vector(640, 480)) is None
+    # Probe again next time
+    assert not (tmp_path / "camera_modes.json").exists()
+
+def test_cache_round_trip(fake_capture_backend: FakeCaptureBackend, tmp_path: Any) -> None:
+    fake_capture_backend.cameras[0] = create_fast_camera()
+    fake_capture_backend.device_names[0] = "Fast Webcam"
+    cache_file_path = tmp_path / "camera_modes.json"
+    best_mode = create_camera_mode_probe(fake_capture_backend, cache_file_path).get_best_mode(0, 100, Vector(1280, 720))
+    probe_open_count = fake_capture_backend.open_count
+    assert list(json.loads(cache_file_path.read_text()).keys()) == ["device-0-Fast Webcam"]
+
+    # A new probe loads the modes from the cache. It only opens the camera to validate the mode.
+    cached_best_mode = create_camera_mode_probe(fake_capture_backend, cache_file_path).get_best_mode(0, 100, Vector(1280, 720))
+    assert fake_capture_backend.open_count == probe_open_count + 1
+    assert vars(cached_best_mode) == vars(best_mode)
+
+def test_other_camera_name_at_same_index_is_probed(fake_capture_backend: FakeCaptureBackend, tmp_path: Any) -> None:
+    cache_file_path = tmp_path / "camera_modes.json"
+    fake_capture_backend.cameras[0] = create_fast_camera()
+    fake_capture_backend.device_names[0] = "Fast Webcam"
+    create_camera_mode_probe(fake_capture_backend, cache_file_path).get_best_mode(0, 100, Vector(1280, 720))
+
+    fake_capture_backend.cameras[0] = create_slow_camera()
+    fake_capture_backend.device_names[0] = "Slow Webcam"
+    best_mode = create_camera_mode_probe(fake_capture_backend, cache_file_path).get_best_mode(0, 100, Vector(1280, 720))
+    assert get_mode_text(best_mode) == "V4L2 YUYV 640x480@30"
+    assert sorted(json.loads(cache_file_path.read_text()).keys()) == ["device-0-Fast Webcam", "device-0-Slow Webcam"]
+
+def test_rejected_cached_mode_is_probed_again(fake_capture_backend: FakeCaptureBackend, tmp_path: Any) -> None:
+    # Without a device name, another camera at the same index has the same cache key
+    cache_file_path = tmp_path / "camera_modes.json"
+    fake_capture_backend.cameras[0] = create_fast_camera()
+    create_camera_mode_probe(fake_capture_backend, cache_file_path).get_best_mode(0, 100, Vector(640, 480))
+
+    fake_capture_backend.cameras[0] = create_slow_camera()
+    camera_mode_probe = create_camera_mode_probe(fake_capture_backend, cache_file_path)
+    best_mode = camera_mode_probe.get_best_mode(0, 100, Vector(640, 480))
+    assert get_mode_text(best_mode) == "V4L2 YUYV 640x480@30"
+    assert [get_mode_text(mode) for mode in camera_mode_probe.load_cache()["device-0"]] == ["V4L2 YUYV 640x480@30"]
@@ -0,0 +1,76 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+import pytest
+from rx.testing import TestScheduler
+from common.Vector import Vector
+
+# pylint: disable=wrong-import-position
+try:
+    # The config needs screeninfo
+    from common.CaptureSupervisor import CaptureSupervisor
+    from common.Config import Config, VideoCaptureSource
+except ImportError as e:
+    pytest.skip(f"the config cannot be imported: {e}", allow_module_level=True)
+
+class CaptureCallbacks:
+    """ Records the restarts and reconfigurations that the CaptureSupervisor requests, at the virtual time of the scheduler. """
+    def __init__(self, scheduler: TestScheduler) -> None:
+        self.scheduler = scheduler
+        self.restart_times_seconds: List[float] = []
+        self.reconfigurations: List[Tuple[float, Vector, float]] = []
+
+    def restart(self) -> None:
+        self.restart_times_seconds.append(self.scheduler.clock)
+
+    def reconfigure(self, capture_size: Vector, capture_fps: float) -> None:
+        self.reconfigurations.append((self.scheduler.clock, capture_size, capture_fps))
+
+def create_capture_supervisor(config: Any) -> Tuple[TestScheduler, CaptureCallbacks]:
+    scheduler = TestScheduler()
+    capture_callbacks = CaptureCallbacks(scheduler)
+    CaptureSupervisor(config, capture_callbacks.restart, capture_callbacks.reconfigure, scheduler)
+    return scheduler, capture_callbacks
+
+def set_value_at(scheduler: TestScheduler, time_seconds: float, reactive_property: Any, value: Any) -> None:
+    scheduler.schedule_absolute(time_seconds, lambda *_: reactive_property.set_value(value))
+
+def test_typed_digits_restart_once_after_debounce() -> None:
+    config = Config()
+    scheduler, capture_callbacks = create_capture_supervisor(config)
+    # A device index typed digit by digit, each within the debounce time
+    for time_seconds, device_index in [(1.0, 1), (1.1, 12), (1.2, 1)]:
+        set_value_at(scheduler, time_seconds, config.capture_device_index, device_index)
+    scheduler.start()
+    assert capture_callbacks.restart_times_seconds == [pytest.approx(1.2 + CaptureSupervisor.debounce_seconds)]
+    assert not capture_callbacks.reconfigurations
+
+def test_size_and_fps_of_webcam_are_reconfigured_in_place() -> None:
+    config = Config()
+    config.capture_source.value = VideoCaptureSource.INTEGRATED_WEBCAM
+    scheduler, capture_callbacks = create_capture_supervisor(config)
+    set_value_at(scheduler, 1.0, config.capture_size, Vector(640, 480))
+    set_value_at(scheduler, 1.1, config.capture_fps, 60)
+    scheduler.start()
+    assert capture_callbacks.reconfigurations == [(pytest.approx(1.1 + CaptureSupervisor.debounce_seconds), Vector(640, 480), 60)]
+    assert not capture_callbacks.restart_times_seconds
+
+def test_unchanged_value_does_nothing() -> None:
+    config = Config()
+    scheduler, capture_callbacks = create_capture_supervisor(config)
+    set_value_at(scheduler, 1.0, config.capture_fps, config.capture_fps.value + 1)
+    set_value_at(scheduler, 1.1, config.capture_fps, config.capture_fps.value)
+    scheduler.start()
+    assert not capture_callbacks.restart_times_seconds and not capture_callbacks.reconfigurations
+
+@pytest.mark.parametrize("reactive_property_name", ["capture_source", "is_capture_autotune"])
+def test_size_change_restarts_without_webcam_or_with_autotune(reactive_property_name: str) -> None:
+    config = Config()
+    if reactive_property_name == "capture_source":
+        config.capture_source.value = VideoCaptureSource.IP_WEBCAM
+    else:
+        config.is_capture_autotune.value = True
+    scheduler, capture_callbacks = create_capture_supervisor(config)
+    set_value_at(scheduler, 1.0, config.capture_size, Vector(640, 480))
+    scheduler.start()
+    assert capture_callbacks.restart_times_seconds == [pytest.approx(1.0 + CaptureSupervisor.debounce_seconds)]
+    assert not capture_callbacks.reconfigurations
@@ -0,0 +1,71 @@
+from __future__ import annotations
+from types import SimpleNamespace
+from typing import Any, List
+import pytest
+import common.FramePacer
+from common.FramePacer import FramePacer
+
+class FakeClock:
+    """ Monotonic clock that only advances when the test does work or the pacer sleeps. """
+    def __init__(self) -> None:
+        self.now_seconds = 100.0
+        self.sleeps_seconds: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now_seconds
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps_seconds.append(seconds)
+        self.now_seconds = self.now_seconds + seconds
+
+@pytest.fixture(name="fake_clock")
+def fixture_fake_clock(monkeypatch: Any) -> FakeClock:
+    fake_clock = FakeClock()
+    monkeypatch.setattr(common.FramePacer, "time", SimpleNamespace(monotonic=fake_clock.monotonic, sleep=fake_clock.sleep))
+    return fake_clock
+
+def test_iterations_are_paced_to_interval(fake_clock: FakeClock) -> None:
+    frame_pacer = FramePacer(10)
+    frame_pacer.start()
+    frame_times_seconds = []
+    for _ in range(5):
+        # Work of the iteration
+        fake_clock.now_seconds = fake_clock.now_seconds + 0.03
+        frame_pacer.wait_for_next_frame()
+        frame_times_seconds.append(fake_clock.now_seconds)
+    # Only the remaining budget is slept, thus the iterations do not drift
+    assert fake_clock.sleeps_seconds == pytest.approx([0.07] * 5)
+    assert frame_times_seconds == pytest.approx([100.1, 100.2, 100.3, 100.4, 100.5])
+    assert frame_pacer.overrun_count == 0
+
+def test_overrun_does_not_cause_burst(fake_clock: FakeClock) -> None:
+    frame_pacer = FramePacer(10)
+    frame_pacer.start()
+    fake_clock.now_seconds = fake_clock.now_seconds + 0.35
+    frame_pacer.wait_for_next_frame()
+    assert fake_clock.sleeps_seconds == []
+    assert frame_pacer.overrun_count == 1
+    assert frame_pacer.max_overrun_seconds == pytest.approx(0.25)
+    # The next deadline is one interval after the overrun, not at the missed deadlines
+    frame_pacer.wait_for_next_frame()
+    assert fake_clock.sleeps_seconds == pytest.approx([0.1])
+    assert frame_pacer.iteration_count == 2
+
+def test_changed_fps_applies_to_next_interval(fake_clock: FakeClock) -> None:
+    frame_pacer = FramePacer(10)
+    frame_pacer.start()
+    frame_pacer.wait_for_next_frame()
+    frame_pacer.set_fps(20)
+    frame_pacer.wait_for_next_frame()
+    frame_pacer.wait_for_next_frame()
+    assert fake_clock.sleeps_seconds == pytest.approx([0.1, 0.1, 0.05])
+
+def test_non_positive_fps_disables_pacing(fake_clock: FakeClock) -> None:
+    frame_pacer = FramePacer(0)
+    frame_pacer.start()
+    for _ in range(3):
+        fake_clock.now_seconds = fake_clock.now_seconds + 0.5
+        frame_pacer.wait_for_next_frame()
+    assert fake_clock.sleeps_seconds == []
+    assert frame_pacer.overrun_count == 0
+    assert "overruns: 0" in frame_pacer.get_statistics_text()
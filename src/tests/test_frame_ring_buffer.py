@@ -0,0 +1,67 @@
+from __future__ import annotations
+from typing import Any, List
+import threading
+import time
+import pytest
+from common.FrameRingBuffer import FrameRingBuffer
+from common.FrameSource import FrameSource
+
+def publish(frame_ring_buffer: FrameRingBuffer, frame: Any) -> int:
+    slot_index = frame_ring_buffer.get_write_slot_index()
+    frame_ring_buffer.publish(slot_index, frame)
+    return slot_index
+
+def test_latest_frame_is_taken_and_older_frames_are_dropped() -> None:
+    frame_ring_buffer = FrameRingBuffer()
+    for frame in range(5):
+        publish(frame_ring_buffer, frame)
+    assert frame_ring_buffer.take_latest_frame(0) == 4
+    assert frame_ring_buffer.dropped_frame_count == 4
+    # Each frame is taken once
+    assert frame_ring_buffer.take_latest_frame(0.01) is None
+    publish(frame_ring_buffer, 5)
+    assert frame_ring_buffer.take_latest_frame(0) == 5
+    assert frame_ring_buffer.taken_frame_count == 2
+    assert frame_ring_buffer.dropped_frame_count == 4
+
+def test_taken_and_latest_frames_are_not_overwritten() -> None:
+    frame_ring_buffer = FrameRingBuffer()
+    publish(frame_ring_buffer, "taken")
+    assert frame_ring_buffer.take_latest_frame(0) == "taken"
+    reading_slot_index = frame_ring_buffer.reading_slot_index
+    for frame in range(10):
+        latest_slot_index = frame_ring_buffer.latest_slot_index
+        slot_index = publish(frame_ring_buffer, frame)
+        assert slot_index not in (reading_slot_index, latest_slot_index)
+        # The previous frame is overwritten in the slot that is neither taken nor latest
+        assert frame_ring_buffer.get_slot(reading_slot_index) == "taken"
+    assert frame_ring_buffer.take_latest_frame(0) == 9
+
+def test_waiting_consumer_takes_next_frame() -> None:
+    frame_ring_buffer = FrameRingBuffer()
+    frames: List[Any] = []
+    consumer = threading.Thread(target=lambda: frames.append(frame_ring_buffer.take_latest_frame(5)))
+    consumer.start()
+    while not frame_ring_buffer.is_consumer_waiting():
+        time.sleep(0.001)
+    publish(frame_ring_buffer, "next")
+    consumer.join(5)
+    assert frames == ["next"]
+    assert frame_ring_buffer.wait_until_taken(0)
+
+def test_close_ends_waiting() -> None:
+    frame_ring_buffer = FrameRingBuffer()
+    publish(frame_ring_buffer, 1)
+    frame_ring_buffer.close()
+    assert frame_ring_buffer.take_latest_frame(5) is None
+    assert not frame_ring_buffer.wait_until_taken(5)
+
+def test_ring_buffer_needs_three_slots() -> None:
+    with pytest.raises(ValueError):
+        FrameRingBuffer(2)
+
+def test_frame_sources_must_implement_run() -> None:
+    class IncompleteFrameSource(FrameSource): # pylint: disable=abstract-method
+        pass
+    with pytest.raises(TypeError):
+        IncompleteFrameSource(FrameRingBuffer()) # type: ignore # pylint: disable=abstract-class-instantiated
@@ -0,0 +1,72 @@
+from __future__ import annotations
+from typing import Any, List, Tuple
+import numpy as np
+import pytest
+from common.GestureClassifier import GestureClassifier, GestureClassifierException, get_capture_size_array, get_landmark_features
+from common.GestureRule import GestureAction
+from .synthetic_hands import capture_size, create_hand_px, to_landmarks
+
+# Gesture shown by the synthetic hands of each class
+class_gesture_names = {
+    GestureClassifier.none_class_name: "open hand",
+    GestureAction.LEFT_CLICK.name: "left click",
+    GestureAction.SCROLL_UP.name: "thumb up",
+    GestureAction.SCROLL_DOWN.name: "thumb down",
+}
+class_names = list(class_gesture_names)
+
+def create_training_set(frames_per_class: int, seed: int) -> Tuple[Any, Any]:
+    """ Returns features and class indexes of jittery hands, which are moved and scaled within the frame. """
+    rng = np.random.default_rng(seed)
+    landmarks = []
+    class_indexes = []
+    for class_index, gesture_name in enumerate(class_gesture_names.values()):
+        hand_px = create_hand_px(gesture_name)
+        for _ in range(frames_per_class):
+            center_px = hand_px.mean(axis=0)
+            moved_hand_px = (hand_px - center_px) * rng.uniform(0.6, 1.2) + center_px + rng.uniform(-60, 60, 2)
+            landmarks.append(to_landmarks(moved_hand_px + rng.normal(0, 1.5, (21, 2))))
+            class_indexes.append(class_index)
+    capture_sizes = np.tile(get_capture_size_array(capture_size), (len(landmarks), 1))
+    return get_landmark_features(np.array(landmarks), capture_sizes), np.array(class_indexes)
+
+def train_gesture_classifier() -> GestureClassifier:
+    features, class_indexes = create_training_set(100, 0)
+    return GestureClassifier.train(features, class_indexes, class_names, 4)
+
+def test_features_do_not_depend_on_hand_position_and_size() -> None:
+    hand_px = create_hand_px("thumb up")
+    features = get_landmark_features(to_landmarks(hand_px), get_capture_size_array(capture_size))
+    moved_features = get_landmark_features(to_landmarks(hand_px * 0.5 + [100, 50]), get_capture_size_array(capture_size))
+    assert features.shape == (GestureClassifier.feature_count,)
+    assert np.allclose(features, moved_features, atol=1e-5)
+
+def test_trained_classifier_recognizes_gestures() -> None:
+    gesture_classifier = train_gesture_classifier()
+    assert gesture_classifier.actions == [GestureAction.LEFT_CLICK, GestureAction.SCROLL_UP, GestureAction.SCROLL_DOWN]
+    features, class_indexes = create_training_set(50, 1)
+    assert np.array_equal(gesture_classifier.classify(features), class_indexes)
+
+    # A single hand is classified by its GestureAction value
+    expected_action_values: List[int] = [-1, GestureAction.LEFT_CLICK.value, GestureAction.SCROLL_UP.value, GestureAction.SCROLL_DOWN.value]
+    for class_index, expected_action_value in enumerate(expected_action_values):
+        assert gesture_classifier.classify_action_value(features[class_indexes == class_index][0]) == expected_action_value
+
+def test_saved_classifier_can_be_loaded(tmp_path: Any) -> None:
+    gesture_classifier = train_gesture_classifier()
+    file_path = str(tmp_path / "gesture_classifier.npz")
+    gesture_classifier.save(file_path)
+    loaded_gesture_classifier = GestureClassifier.load(file_path)
+    assert loaded_gesture_classifier.class_names == class_names
+    assert np.array_equal(loaded_gesture_classifier.centroids, gesture_classifier.centroids)
+    features, _ = create_training_set(20, 2)
+    assert np.array_equal(loaded_gesture_classifier.classify(features), gesture_classifier.classify(features))
+
+def test_invalid_classes_are_rejected() -> None:
+    features, class_indexes = create_training_set(10, 0)
+    with pytest.raises(GestureClassifierException, match="unknown gesture class"):
+        GestureClassifier.train(features, class_indexes, class_names[:-1] + ["WAVE"], 2)
+    with pytest.raises(GestureClassifierException, match=GestureClassifier.none_class_name):
+        GestureClassifier.train(features, class_indexes, [GestureAction.DRAG.name] + class_names[1:], 2)
+    with pytest.raises(GestureClassifierException, match="no training frames"):
+        GestureClassifier.train(features, class_indexes, class_names + [GestureAction.DRAG.name], 2)
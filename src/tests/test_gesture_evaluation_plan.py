@@ -0,0 +1,86 @@
+from __future__ import annotations
+from typing import List
+import numpy as np
+import pytest
+from common.ArrayHandLandmarks import ArrayHandLandmarks
+from common.GesturePredicateCache import GesturePredicateCache
+from common.GestureRule import GestureAction, get_default_gesture_rules
+from common.GestureStateMachine import GestureStateMachine
+from common.HandFeatures import HandFeatures
+from common.HandFingerPositions import HandFingerPositions
+from .synthetic_hands import capture_size, create_hand_px, to_landmarks
+
+# pylint: disable=wrong-import-position
+try:
+    # The evaluation plan is created from the config, which needs screeninfo
+    from common.Config import Config
+    from common.GestureEvaluationPlan import GestureEvaluationPlan
+    from common.GestureRuleEngine import GestureRuleEngine
+except ImportError as e:
+    pytest.skip(f"the config cannot be imported: {e}", allow_module_level=True)
+
+# Thresholds of the default config (click_distance_threshold_low_percent and click_distance_threshold_high_percent)
+near_distance = 0.05
+faraway_distance = 0.075
+no_hold_duration_ms = np.zeros(len(GestureAction), dtype=np.int64)
+
+def create_hand_features(gesture_name: str) -> HandFeatures:
+    return HandFeatures(HandFingerPositions(ArrayHandLandmarks(to_landmarks(create_hand_px(gesture_name))), capture_size))
+
+def evaluate(gesture_rule_engine: GestureRuleEngine, hand_features: HandFeatures) -> List[str]:
+    """ Returns the names of the rules that hold. """
+    signals = gesture_rule_engine.evaluate(hand_features, near_distance, faraway_distance, GesturePredicateCache(lambda: False))
+    return [rule.name for rule, signal in zip(gesture_rule_engine.rules, signals.tolist()) if signal]
+
+def test_plan_follows_enabled_controls() -> None:
+    config = Config()
+    config.is_control_mouse_position.value = True
+    config.is_control_click.value = False
+    config.is_control_scroll.value = True
+    evaluation_plan = GestureEvaluationPlan.from_config(config)
+    assert (evaluation_plan.is_mouse_position, evaluation_plan.is_click, evaluation_plan.is_scroll) == (True, False, True)
+    assert not evaluation_plan.is_standby
+    assert repr(evaluation_plan) == "mouse position, scroll"
+
+    config.is_all_control_disabled.value = True
+    evaluation_plan = GestureEvaluationPlan.from_config(config)
+    assert evaluation_plan.is_standby and repr(evaluation_plan) == "standby"
+
+def test_standby_skips_all_features() -> None:
+    gesture_rule_engine = GestureRuleEngine(get_default_gesture_rules())
+    gesture_rule_engine.set_evaluation_plan(GestureEvaluationPlan(False, False, False))
+    hand_features = create_hand_features("left click")
+    assert not evaluate(gesture_rule_engine, hand_features)
+    assert not hand_features.is_tip_distances_computed and not hand_features.is_joint_order_computed
+
+def test_click_plan_skips_joint_order() -> None:
+    gesture_rule_engine = GestureRuleEngine(get_default_gesture_rules())
+    gesture_rule_engine.set_evaluation_plan(GestureEvaluationPlan(True, True, False))
+    hand_features = create_hand_features("left click")
+    assert evaluate(gesture_rule_engine, hand_features) == ["left click", "drag"]
+    assert hand_features.is_tip_distances_computed and not hand_features.is_joint_order_computed
+    # Scroll gestures are not recognized
+    assert not evaluate(gesture_rule_engine, create_hand_features("thumb up"))
+
+def test_scroll_plan_skips_click_rules() -> None:
+    gesture_rule_engine = GestureRuleEngine(get_default_gesture_rules())
+    gesture_rule_engine.set_evaluation_plan(GestureEvaluationPlan(True, False, True))
+    assert not evaluate(gesture_rule_engine, create_hand_features("left click"))
+    hand_features = create_hand_features("thumb up")
+    assert evaluate(gesture_rule_engine, hand_features) == ["scroll up"]
+    assert hand_features.is_joint_order_computed
+
+def test_disabled_clicks_end_held_click() -> None:
+    gesture_rule_engine = GestureRuleEngine(get_default_gesture_rules())
+    gesture_rule_engine.set_evaluation_plan(GestureEvaluationPlan(True, True, True))
+    hand_features = create_hand_features("left click")
+    signals = gesture_rule_engine.evaluate(hand_features, near_distance, faraway_distance, GesturePredicateCache(lambda: False))
+    gesture_rule_engine.update(signals, no_hold_duration_ms, 1000)
+    assert gesture_rule_engine.is_action_present(GestureAction.DRAG)
+
+    # Clicks are turned off while the hand still shows the gesture, as in GestureRecognizer.apply_evaluation_plan
+    gesture_rule_engine.set_evaluation_plan(GestureEvaluationPlan(True, False, True))
+    gesture_events = gesture_rule_engine.update(gesture_rule_engine.signals & gesture_rule_engine.rule_mask, no_hold_duration_ms, 1100)
+    falling_flanks = [(rule.name, events & GestureStateMachine.falling_flank_event != 0) for rule, events in gesture_events]
+    assert falling_flanks == [("left click", True), ("drag", True)]
+    assert not gesture_rule_engine.is_action_present(GestureAction.DRAG)
@@ -0,0 +1,156 @@
+from __future__ import annotations
+from types import SimpleNamespace
+from typing import Any, List, Tuple
+import numpy as np
+import pytest
+from common.ArrayHandLandmarks import ArrayHandLandmarks
+from common.GesturePredicateCache import GesturePredicateCache
+from common.HandFeatures import HandFeatures
+from common.HandFingerPositions import HandFingerPositions
+from common.Vector import Vector
+from .synthetic_hands import capture_size, create_hand_px, create_session, to_landmarks, write_landmark_recording
+
+# Thresholds of the default config (click_distance_threshold_low_percent and click_distance_threshold_high_percent)
+near_distance = 0.05
+faraway_distance = 0.075
+
+def create_pinch_session(frame_count: int, seed: int = 0) -> List[Tuple[int, Any]]:
+    """ Returns (time in ms, landmarks) of a session at 30 fps, in which the index finger tip slowly moves
+    to the thumb tip and back. Its distance crosses the near and faraway thresholds several times, with little jitter.
+    """
+    rng = np.random.default_rng(seed)
+    open_hand_px = create_hand_px("open hand")
+    thumb_tip_px = open_hand_px[HandFingerPositions.thumb_tip_index]
+    index_tip_direction = open_hand_px[HandFingerPositions.index_tip_index] - thumb_tip_px
+    index_tip_direction = index_tip_direction / np.linalg.norm(index_tip_direction)
+    session = []
+    for frame_index in range(frame_count):
+        hand_px = open_hand_px + rng.normal(0, 0.2, (21, 2))
+        # Between 2 % and 10 % of the frame width from the thumb tip
+        distance_px = capture_size.x * (0.06 + 0.04 * np.sin(frame_index / 40))
+        hand_px[HandFingerPositions.index_tip_index] = hand_px[HandFingerPositions.thumb_tip_index] + index_tip_direction * distance_px
+        session.append((round(frame_index * 1000 / 30), to_landmarks(hand_px)))
+    return session
+
+def evaluate_frame(landmarks: Any, frame_near_distance: float, gesture_rule_engine: Any, gesture_predicate_cache: GesturePredicateCache) -> Tuple[Any, List[bool]]:
+    """ Returns the mouse positioning trigger and the gesture rule signals of a hand. """
+    hand_finger_positions = HandFingerPositions(ArrayHandLandmarks(landmarks), capture_size)
+    hand_features = HandFeatures(hand_finger_positions)
+    gesture_predicate_cache.begin_frame(hand_finger_positions)
+
+    def get_mouse_positioning_trigger() -> Tuple[bool, bool]:
+        hand_features.compute_tip_distances()
+        return (all(distance < frame_near_distance for distance in hand_features.thumb_tip_distances[1:]),
+                all(distance > faraway_distance for distance in hand_features.thumb_tip_distances[1:]))
+    mouse_positioning_trigger = gesture_predicate_cache.get_or_compute(gesture_predicate_cache.mouse_positioning_trigger_entry,
+                                                                       hand_features, frame_near_distance, faraway_distance,
+                                                                       get_mouse_positioning_trigger)
+    signals = gesture_rule_engine.evaluate(hand_features, frame_near_distance, faraway_distance, gesture_predicate_cache)
+    return mouse_positioning_trigger, signals.tolist()
+
+def evaluate_tip_distance_predicates(session: List[Tuple[int, Any]], is_cache_enabled: bool) -> Tuple[List[Any], GesturePredicateCache]:
+    """ Returns the mouse positioning trigger and the gesture rule signals of the frames with a hand. """
+    # pylint: disable=import-outside-toplevel
+    try:
+        # The rule engine depends on the config, which needs screeninfo
+        from common.GestureRuleEngine import GestureRuleEngine
+    except ImportError as e:
+        pytest.skip(f"the gesture rule engine cannot be imported: {e}")
+    from common.GestureRule import get_default_gesture_rules
+
+    gesture_rule_engine = GestureRuleEngine(get_default_gesture_rules())
+    gesture_rule_engine.set_evaluation_plan(SimpleNamespace(is_click=True, is_scroll=True)) # type: ignore
+    gesture_predicate_cache = GesturePredicateCache(lambda: is_cache_enabled)
+    results = []
+    for frame_index, (_, landmarks) in enumerate(session):
+        if landmarks is None:
+            continue
+        # The thresholds change during the session
+        frame_near_distance = near_distance if frame_index < len(session) // 2 else near_distance * 1.2
+        results.append(evaluate_frame(landmarks, frame_near_distance, gesture_rule_engine, gesture_predicate_cache))
+    return results, gesture_predicate_cache
+
+@pytest.mark.parametrize("session", [create_session(1200), create_session(1200, jitter_px=0.3), create_pinch_session(1200)],
+                         ids=["jittery session", "steady session", "pinch session"])
+def test_tip_distance_predicates_are_same_with_cache(session: List[Tuple[int, Any]]) -> None:
+    results, _ = evaluate_tip_distance_predicates(session, False)
+    cached_results, gesture_predicate_cache = evaluate_tip_distance_predicates(session, True)
+    assert cached_results == results
+    # Results have been reused, thus the comparison covers the cache
+    for entry in gesture_predicate_cache.entries:
+        assert entry.hit_count > 0, gesture_predicate_cache.get_statistics_text()
+        assert entry.hit_count < entry.lookup_count
+
+def test_results_are_not_reused_after_threshold_change() -> None:
+    gesture_predicate_cache = GesturePredicateCache(lambda: True)
+    hand_finger_positions = HandFingerPositions(ArrayHandLandmarks(to_landmarks(create_hand_px("left click"))), capture_size)
+    entry = gesture_predicate_cache.mouse_positioning_trigger_entry
+
+    def is_index_finger_near_thumb(frame_near_distance: float) -> bool:
+        # The same hand in each frame
+        hand_features = HandFeatures(hand_finger_positions)
+        gesture_predicate_cache.begin_frame(hand_finger_positions)
+        def compute() -> bool:
+            hand_features.compute_tip_distances()
+            return hand_features.thumb_tip_distances[HandFeatures.index_finger] < frame_near_distance
+        return gesture_predicate_cache.get_or_compute(entry, hand_features, frame_near_distance, faraway_distance, compute)
+    # The index finger tip is about 1.3 % from the thumb tip
+    assert is_index_finger_near_thumb(near_distance)
+    assert is_index_finger_near_thumb(near_distance)
+    assert entry.hit_count == 1
+    assert not is_index_finger_near_thumb(0.01)
+    assert entry.hit_count == 1
+
+def test_recorded_session_gestures_are_same_with_cache(tmp_path: Any) -> None:
+    pytest.importorskip("pyautogui")
+    pytest.importorskip("PySide6")
+    pytest.importorskip("mediapipe")
+    # pylint: disable=import-outside-toplevel
+    try:
+        from common.Config import Config, DisableMousePositioningTrigger
+    except ImportError as e:
+        pytest.skip(f"the config cannot be imported: {e}")
+    from common.GestureRecognizer import GestureRecognizer
+    from common.LandmarkReplay import LandmarkReplay
+    from common.MouseControl import MouseControl
+
+    file_path = str(tmp_path / "landmarks.npy")
+    write_landmark_recording(file_path, create_session(1800) + [(round((1800 + i) * 1000 / 30), landmarks)
+                                                               for i, (_, landmarks) in enumerate(create_pinch_session(600))])
+
+    def replay(is_cache_enabled: bool) -> Tuple[List[Any], GesturePredicateCache]:
+        """ Returns the performed mouse actions and positions, and the cache of the GestureRecognizer. """
+        config = Config()
+        config.is_gesture_predicate_cache.value = is_cache_enabled
+        config.screen_size.value = Vector(1920, 1080)
+        config.is_control_click.value = True
+        config.is_control_scroll.value = True
+        # The open hand of the session disables the mouse positioning, the gestures enable it
+        config.disable_mouse_positioning_trigger.value = DisableMousePositioningTrigger.ALL_FINGERS_FARAWAY_THUMB
+        app_context = SimpleNamespace(config=config, webcam_control=SimpleNamespace(actual_capture_size=capture_size))
+        mouse_control = MouseControl(app_context) # type: ignore
+        # Only simulate the mouse
+        mouse_control.is_output_enabled = False
+        app_context.mouse_control = mouse_control
+        gesture_recognizer = GestureRecognizer(app_context) # type: ignore
+        app_context.gesture_recognizer = gesture_recognizer
+
+        mouse_outputs: List[Any] = []
+        mouse_control.performed_action_desciption.subscribe(mouse_outputs.append)
+        on_new_mouse_position_detected = mouse_control.on_new_mouse_position_detected
+        def record_mouse_position(mouse_pos_px: Any) -> None:
+            mouse_outputs.append(mouse_pos_px)
+            on_new_mouse_position_detected(mouse_pos_px)
+        mouse_control.on_new_mouse_position_detected = record_mouse_position # type: ignore
+        LandmarkReplay(app_context, file_path).run(0) # type: ignore
+        return mouse_outputs, gesture_recognizer.gesture_predicate_cache
+
+    mouse_outputs, _ = replay(False)
+    cached_mouse_outputs, gesture_predicate_cache = replay(True)
+    # The session contains clicks, scrolls and mouse movements
+    performed_actions = [mouse_output for mouse_output in mouse_outputs if isinstance(mouse_output, str)]
+    assert any("click" in action for action in performed_actions), performed_actions
+    assert any("scroll" in action for action in performed_actions), performed_actions
+    assert len(performed_actions) < len(mouse_outputs)
+    assert cached_mouse_outputs == mouse_outputs, gesture_predicate_cache.get_statistics_text()
+    assert all(entry.hit_count > 0 for entry in gesture_predicate_cache.entries), gesture_predicate_cache.get_statistics_text()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from types import SimpleNamespace
+from typing import Any, Dict, List
+import numpy as np
+import pytest
+from common.ArrayHandLandmarks import ArrayHandLandmarks
+from common.HandFeatures import HandFeatures
+from common.HandFingerPositions import HandFingerPositions
+from common.Vector import Vector
+from . import reference_gesture_predicates as reference
+from .synthetic_hands import capture_size, create_random_hands, create_session
+
+# Thresholds of the default config (click_distance_threshold_low_percent and click_distance_threshold_high_percent)
+near_distance = 0.05
+faraway_distance = 0.075
+tip_indexes = [HandFingerPositions.index_tip_index, HandFingerPositions.middle_tip_index,
+               HandFingerPositions.ring_tip_index, HandFingerPositions.pinky_tip_index]
+
+def get_hands() -> List[Any]:
+    session_hands = [landmarks for _, landmarks in create_session(1200) if landmarks is not None]
+    return session_hands + create_random_hands(4000)
+
+def create_hand(landmarks: Any) -> HandFingerPositions:
+    return HandFingerPositions(ArrayHandLandmarks(landmarks), capture_size)
+
+def test_tip_distance_lookups_match_reference() -> None:
+    for landmarks in get_hands():
+        hand_finger_positions = create_hand(landmarks)
+        hand_features = HandFeatures(hand_finger_positions)
+        hand_features.compute_tip_distances()
+        thumb_tip = hand_finger_positions.thumb_tip_position
+        for finger, tip_index in enumerate(tip_indexes, start=1):
+            tip = hand_finger_positions.get_finger_position_by_index(tip_index)
+            assert (hand_features.thumb_tip_distances[finger] < near_distance) == reference.is_near_target([tip], thumb_tip, near_distance)
+            assert (hand_features.thumb_tip_distances[finger] > faraway_distance) == reference.is_faraway_target([tip], thumb_tip, faraway_distance)
+
+        # Mouse positioning triggers
+        tips = hand_finger_positions.get_finger_positions_by_index(tip_indexes)
+        assert all(distance < near_distance for distance in hand_features.thumb_tip_distances[1:]) == reference.is_near_target(tips, thumb_tip, near_distance)
+        assert all(distance > faraway_distance for distance in hand_features.thumb_tip_distances[1:]) == reference.is_faraway_target(tips, thumb_tip, faraway_distance)
+
+def test_tip_distances_at_threshold_use_landmark_values() -> None:
+    # Index finger tips just below the near threshold. With float32 landmarks, the distance of some would reach the threshold.
+    float32_differing_count = 0
+    for thumb_tip_x in np.linspace(0.1, 0.5, 101).tolist():
+        landmarks = np.full((21, 3), 0.5)
+        landmarks[HandFingerPositions.thumb_tip_index, 0] = thumb_tip_x
+        landmarks[HandFingerPositions.index_tip_index, 0] = thumb_tip_x + near_distance - 1e-12
+        index_tip_distance = Vector.distance_xy(Vector(*landmarks[HandFingerPositions.index_tip_index].tolist()),
+                                                Vector(*landmarks[HandFingerPositions.thumb_tip_index].tolist()))
+        float32_landmarks = landmarks.astype(np.float32)
+        float32_index_tip_distance = float(float32_landmarks[HandFingerPositions.index_tip_index, 0]) - float(float32_landmarks[HandFingerPositions.thumb_tip_index, 0])
+        float32_differing_count = float32_differing_count + ((float32_index_tip_distance < near_distance) != (index_tip_distance < near_distance))
+
+        hand_features = HandFeatures(create_hand(landmarks))
+        hand_features.compute_tip_distances()
+        assert (hand_features.thumb_tip_distances[HandFeatures.index_finger] < near_distance) == (index_tip_distance < near_distance)
+    assert float32_differing_count > 0
+
+def test_joint_order_lookups_match_reference() -> None:
+    for landmarks in get_hands():
+        hand_finger_positions = create_hand(landmarks)
+        hand_features = HandFeatures(hand_finger_positions)
+        hand_features.compute_joint_order()
+        for chain_index, joint_chain in enumerate(HandFeatures.joint_chains):
+            chain = hand_finger_positions.get_finger_positions_by_index(joint_chain.tolist())
+            for axis, get_value in enumerate([lambda finger_position: finger_position.px.x, lambda finger_position: finger_position.px.y]):
+                assert hand_features.is_chain_increasing[chain_index, axis] == reference.all_increasing(chain, get_value)
+                assert hand_features.is_chain_decreasing[chain_index, axis] == reference.all_decreasing(chain, get_value)
+
+def test_gesture_rules_match_reference() -> None:
+    # pylint: disable=import-outside-toplevel
+    try:
+        # The rule engine depends on the config, which needs screeninfo
+        from common.GestureRuleEngine import GestureRuleEngine
+    except ImportError as e:
+        pytest.skip(f"the gesture rule engine cannot be imported: {e}")
+    from common.GesturePredicateCache import GesturePredicateCache
+    from common.GestureRule import get_default_gesture_rules
+
+    gesture_rule_engine = GestureRuleEngine(get_default_gesture_rules())
+    gesture_rule_engine.set_evaluation_plan(SimpleNamespace(is_click=True, is_scroll=True)) # type: ignore
+    rule_names = [rule.name for rule in gesture_rule_engine.rules]
+    gesture_predicate_cache = GesturePredicateCache(lambda: False)
+    present_counts: Dict[str, int] = {rule_name: 0 for rule_name in rule_names}
+    for landmarks in get_hands():
+        hand_finger_positions = create_hand(landmarks)
+        signals = gesture_rule_engine.evaluate(HandFeatures(hand_finger_positions), near_distance, faraway_distance, gesture_predicate_cache)
+        reference_signals = {
+            "left click": reference.is_only_near_thumb(hand_finger_positions, [8], near_distance, faraway_distance),
+            "drag": reference.is_only_near_thumb(hand_finger_positions, [8], near_distance, faraway_distance),
+            "right click": reference.is_only_near_thumb(hand_finger_positions, [12, 16], near_distance, faraway_distance),
+            "middle click": reference.is_only_near_thumb(hand_finger_positions, [16, 20], near_distance, faraway_distance),
+            "scroll up": reference.is_thumb_up(hand_finger_positions),
+            "scroll down": reference.is_thumb_down(hand_finger_positions),
+        }
+        assert dict(zip(rule_names, signals.tolist())) == reference_signals
+        for rule_name, signal in zip(rule_names, signals.tolist()):
+            present_counts[rule_name] = present_counts[rule_name] + signal
+
+    # Each gesture is present in some of the hands, thus the comparison covers both outcomes
+    assert all(count > 50 for count in present_counts.values()), present_counts
+
+def test_synthetic_gestures_are_recognized_by_reference() -> None:
+    # The synthetic hands must show the gestures, such that the other tests compare present gestures as well
+    session = create_session(360, jitter_px=0)
+    gesture_hands = [create_hand(landmarks) for _, landmarks in session[30:60]]
+    assert all(reference.is_only_near_thumb(hand, [8], near_distance, faraway_distance) for hand in gesture_hands)
+    thumb_up_hands = [create_hand(landmarks) for _, landmarks in session[210:240]]
+    assert all(reference.is_thumb_up(hand) for hand in thumb_up_hands)
+    thumb_down_hands = [create_hand(landmarks) for _, landmarks in session[270:300]]
+    assert all(reference.is_thumb_down(hand) for hand in thumb_down_hands)
+    open_hands = [create_hand(landmarks) for _, landmarks in session[0:30]]
+    assert not any(reference.is_thumb_up(hand) or reference.is_thumb_down(hand) for hand in open_hands)
+    assert np.isfinite(np.stack([landmarks for _, landmarks in session if landmarks is not None])).all()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+from typing import List
+from common.InferenceQualityController import InferenceQualityController
+
+# Options of mediapipe.solutions.hands.Hands
+mediapipe_0_8_8_option_names = ["static_image_mode", "max_num_hands", "min_detection_confidence", "min_tracking_confidence"]
+mediapipe_0_8_9_option_names = mediapipe_0_8_8_option_names + ["model_complexity"]
+
+def lower_quality_until_lowest(inference_quality_controller: InferenceQualityController) -> List[int]:
+    """ Reports inference times far above the budget and returns the level indexes that the controller goes through. """
+    level_indexes = [inference_quality_controller.level_index.value]
+    current_time_ms = 0
+    while len(level_indexes) < 10:
+        current_time_ms = current_time_ms + inference_quality_controller.min_level_duration_ms
+        for _ in range(inference_quality_controller.ignored_sample_count + 1):
+            inference_quality_controller.update(1000, current_time_ms)
+        if inference_quality_controller.level_index.value == level_indexes[-1]:
+            break
+        level_indexes.append(inference_quality_controller.level_index.value)
+    return level_indexes
+
+def test_all_levels_with_all_options() -> None:
+    inference_quality_controller = InferenceQualityController(lambda: 30, mediapipe_0_8_9_option_names)
+    assert len(inference_quality_controller.levels) == 4
+    assert [level.get_hands_options()["model_complexity"] for level in inference_quality_controller.levels] == [1, 0, 0, 0]
+    assert lower_quality_until_lowest(inference_quality_controller) == [0, 1, 2, 3]
+
+def test_levels_without_model_complexity_are_merged() -> None:
+    inference_quality_controller = InferenceQualityController(lambda: 30, mediapipe_0_8_8_option_names)
+    levels = inference_quality_controller.levels
+    # The first two levels only differ in the model complexity
+    assert len(levels) == 3
+    assert all("model_complexity" not in level.get_hands_options() for level in levels)
+    assert [(level.get_hands_options()["min_tracking_confidence"], level.inference_scale) for level in levels] == [(0.5, 1.0), (0.3, 0.75), (0.3, 0.5)]
+    # Each level change changes the hand tracking
+    assert lower_quality_until_lowest(inference_quality_controller) == [0, 1, 2]
+    assert len({repr(level) for level in levels}) == len(levels)
+
+def test_all_options_without_supported_option_names() -> None:
+    inference_quality_controller = InferenceQualityController(lambda: 30)
+    assert len(inference_quality_controller.levels) == 4
+    assert "model_complexity" in inference_quality_controller.get_level().get_hands_options()
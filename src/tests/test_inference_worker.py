@@ -0,0 +1,94 @@
+from __future__ import annotations
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator
+from multiprocessing import shared_memory
+import os
+import signal
+import numpy as np
+import pytest
+from common.ArrayHandLandmarks import ArrayHandLandmarks
+from common.InferenceWorker import InferenceWorker
+
+# Gray levels of frames that the fake hands treat specially
+no_hand_gray_level = 0
+crash_gray_level = 255
+
+class FakeHands:
+    """ Stand-in for mediapipe's Hands. Finds one hand whose landmarks encode the gray level and size of the frame. """
+    def __init__(self, hands_options: Dict[str, Any]) -> None:
+        self.hands_options = hands_options
+
+    def process(self, frame: Any) -> Any:
+        gray_level = int(frame.mean())
+        if gray_level == no_hand_gray_level:
+            return SimpleNamespace(multi_hand_landmarks=None)
+        if gray_level == crash_gray_level:
+            # Like a crash of mediapipe, without cleanup
+            os.kill(os.getpid(), signal.SIGKILL)
+        landmarks = np.zeros((21, 3), dtype=np.float32)
+        landmarks[:, 0] = gray_level
+        landmarks[:, 1] = frame.shape[0]
+        landmarks[:, 2] = frame.shape[1]
+        return SimpleNamespace(multi_hand_landmarks=[ArrayHandLandmarks(landmarks)])
+
+    def close(self) -> None:
+        pass
+
+def create_fake_hands(hands_options: Dict[str, Any]) -> FakeHands:
+    return FakeHands(hands_options)
+
+def create_frame(gray_level: int, height: int = 48, width: int = 64) -> Any:
+    return np.full((height, width, 3), gray_level, dtype=np.uint8)
+
+def get_landmark(multi_hand_landmarks: Any) -> Any:
+    landmark = multi_hand_landmarks[0].landmark[0]
+    return (landmark.x, landmark.y, landmark.z)
+
+@pytest.fixture(name="inference_worker")
+def fixture_inference_worker() -> Iterator[InferenceWorker]:
+    inference_worker = InferenceWorker({}, create_fake_hands)
+    try:
+        yield inference_worker
+    finally:
+        inference_worker.stop()
+
+def test_frames_are_processed_by_the_worker(inference_worker: InferenceWorker) -> None:
+    for gray_level in [10, 20, 30]:
+        multi_hand_landmarks = inference_worker.process_frame(create_frame(gray_level))
+        assert multi_hand_landmarks is not None and len(multi_hand_landmarks) == 1
+        assert get_landmark(multi_hand_landmarks) == (gray_level, 48, 64)
+    assert inference_worker.process_frame(create_frame(no_hand_gray_level)) is None
+    assert inference_worker.request_count == 4
+    assert inference_worker.failed_request_count == 0
+    # Started once
+    assert inference_worker.process is not None and inference_worker.process.pid != os.getpid()
+
+def test_views_and_larger_frames(inference_worker: InferenceWorker) -> None:
+    frame = create_frame(10, 100, 100)
+    frame[20:60, 30:80] = 40
+    # A view of a larger frame is copied with its strides
+    assert get_landmark(inference_worker.process_frame(frame[20:60, 30:80])) == (40, 40, 50)
+    # A larger frame restarts the worker with more shared memory
+    assert get_landmark(inference_worker.process_frame(create_frame(50, 200, 300))) == (50, 200, 300)
+    assert inference_worker.frame_memory is not None and inference_worker.frame_memory.size >= 200 * 300 * 3
+
+def test_crashed_worker_is_restarted(inference_worker: InferenceWorker) -> None:
+    assert inference_worker.process_frame(create_frame(10)) is not None
+    assert inference_worker.process_frame(create_frame(crash_gray_level)) is None
+    assert inference_worker.failed_request_count == 1
+    # The next frame restarts the worker
+    assert get_landmark(inference_worker.process_frame(create_frame(20))) == (20, 48, 64)
+    assert inference_worker.restart_count == 1
+
+def test_stop_ends_the_worker(inference_worker: InferenceWorker) -> None:
+    inference_worker.process_frame(create_frame(10))
+    process = inference_worker.process
+    frame_memory_name = inference_worker.frame_memory.name # type: ignore
+    inference_worker.stop()
+    assert process is not None and not process.is_alive()
+    # The worker ends on the shutdown request instead of being killed
+    assert process.exitcode == 0
+    assert inference_worker.process is None and inference_worker.connection is None and inference_worker.frame_memory is None
+    # The shared memory has been released
+    with pytest.raises(FileNotFoundError):
+        shared_memory.SharedMemory(name=frame_memory_name)
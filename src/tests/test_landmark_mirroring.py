@@ -0,0 +1,87 @@
+from __future__ import annotations
+from typing import Any
+import numpy as np
+import pytest
+from common.ArrayHandLandmarks import ArrayHandLandmarks, hand_landmarks_to_array, mirror_hand_landmarks
+from common.FrameBufferPool import FrameBufferPool
+from common.frame_util import convert_bgr_to_rgb, mirror_frame
+
+# Compares the landmarks of the previous path (mirror the frame, then track the hand)
+# with the current path (track the hand on the unmirrored frame, then mirror the landmarks).
+# The hand tracking is replaced by a detector of colored dots, one per landmark, at known pixels.
+
+frame_width = 160
+frame_height = 120
+
+def create_landmark_colors() -> Any:
+    # Unique BGR colors, none of them symmetric in red and blue
+    return np.array([(10 + 10 * i, 200 - 5 * i, 250 - 10 * i) for i in range(21)], dtype=np.uint8)
+
+def create_hand_frame(landmark_px: Any) -> Any:
+    """ BGR frame with a 2x2 dot of the landmark color at each landmark pixel. """
+    frame = np.zeros((frame_height, frame_width, 3), dtype=np.uint8)
+    for color, (column, row) in zip(create_landmark_colors(), landmark_px):
+        frame[row:row + 2, column:column + 2] = color
+    return frame
+
+def detect_landmarks(rgb_frame: Any) -> Any:
+    """ Landmarks of the dots as mediapipe reports them, relative to the frame size with pixel centers at (c + 0.5) / w. """
+    landmarks = np.zeros((21, 3), dtype=np.float32)
+    for index, bgr_color in enumerate(create_landmark_colors()):
+        rows, columns = np.nonzero(np.all(rgb_frame == bgr_color[::-1], axis=2))
+        assert len(rows) > 0, f"landmark {index} not found"
+        landmarks[index] = ((columns.mean() + 0.5) / frame_width, (rows.mean() + 0.5) / frame_height, 0)
+    return landmarks
+
+def get_handedness(landmarks: Any) -> bool:
+    """ Orientation of wrist, index finger knuckle and pinky knuckle. Mirroring a hand turns a left hand into a right hand. """
+    index_knuckle = landmarks[5, :2] - landmarks[0, :2]
+    pinky_knuckle = landmarks[17, :2] - landmarks[0, :2]
+    return bool(index_knuckle[0] * pinky_knuckle[1] - index_knuckle[1] * pinky_knuckle[0] > 0)
+
+def create_landmark_px(seed: int) -> Any:
+    random = np.random.default_rng(seed)
+    # Open hand with the wrist at the bottom and random jitter, near the left border to make asymmetries visible
+    landmark_px = np.array([(30, 100), (40, 92), (48, 84), (54, 76), (58, 70),
+                            (34, 70), (34, 56), (34, 46), (34, 38),
+                            (24, 68), (22, 52), (21, 42), (20, 34),
+                            (14, 70), (11, 56), (10, 47), (9, 40),
+                            (6, 74), (4, 64), (3, 57), (2, 51)])
+    landmark_px = landmark_px + random.integers(0, 3, landmark_px.shape)
+    offset = np.array([random.integers(0, frame_width - 64), random.integers(0, frame_height - 104)])
+    return landmark_px + offset
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mirrored_landmarks_match_mirrored_frame(seed: int) -> None:
+    frame = create_hand_frame(create_landmark_px(seed))
+    frame_buffer_pool = FrameBufferPool()
+
+    # Previous path: mirror and convert to RGB in one pass, then track the hand
+    previous_landmarks = detect_landmarks(mirror_frame(frame, True, frame_buffer_pool))
+
+    # Current path: only convert to RGB, track the hand, then mirror the landmarks
+    single_hand_landmarks = ArrayHandLandmarks(detect_landmarks(convert_bgr_to_rgb(frame, frame_buffer_pool)))
+    mirror_hand_landmarks(single_hand_landmarks)
+    landmarks = hand_landmarks_to_array(single_hand_landmarks)
+
+    np.testing.assert_allclose(landmarks, previous_landmarks, atol=1e-6)
+    # Thus also the mouse position, which is mapped from the wrist landmark
+    np.testing.assert_allclose(landmarks[0], previous_landmarks[0], atol=1e-6)
+
+@pytest.mark.parametrize("seed", range(5))
+def test_mirrored_landmarks_keep_handedness(seed: int) -> None:
+    frame = create_hand_frame(create_landmark_px(seed))
+    unmirrored_landmarks = detect_landmarks(convert_bgr_to_rgb(frame))
+    previous_landmarks = detect_landmarks(mirror_frame(frame, True))
+    single_hand_landmarks = ArrayHandLandmarks(unmirrored_landmarks)
+    mirror_hand_landmarks(single_hand_landmarks)
+
+    # The hand appears as the other hand in the mirrored frame, in both paths
+    assert get_handedness(previous_landmarks) != get_handedness(unmirrored_landmarks)
+    assert get_handedness(hand_landmarks_to_array(single_hand_landmarks)) == get_handedness(previous_landmarks)
+
+def test_preview_is_mirrored_as_before() -> None:
+    frame = create_hand_frame(create_landmark_px(0))
+    # The preview is mirrored from the captured frame, the analyzed frame is only converted to RGB
+    preview = mirror_frame(frame, True, FrameBufferPool())
+    np.testing.assert_array_equal(preview, convert_bgr_to_rgb(frame)[:, ::-1])
@@ -0,0 +1,81 @@
+from __future__ import annotations
+from types import SimpleNamespace
+from typing import Any, List
+import numpy as np
+import pytest
+from common.ArrayHandLandmarks import ArrayHandLandmarks
+from common.LandmarkRecorder import LandmarkRecorder, load_landmark_records
+from common.Vector import Vector
+from common.util import get_time_ms
+from .synthetic_hands import capture_size, create_session, write_landmark_recording
+
+def test_recording_round_trip(tmp_path: Any) -> None:
+    file_path = str(tmp_path / "landmarks.npy")
+    session = create_session(400)
+    write_landmark_recording(file_path, session)
+
+    records = load_landmark_records(file_path)
+    assert len(records) == len(session)
+    assert records["time_ms"].tolist() == [time_ms for time_ms, _ in session]
+    assert records["has_hand"].tolist() == [landmarks is not None for _, landmarks in session]
+    assert (records["capture_width"] == capture_size.x).all() and (records["capture_height"] == capture_size.y).all()
+    for record, (_, landmarks) in zip(records, session):
+        if landmarks is not None:
+            assert np.array_equal(record["landmarks"], landmarks)
+        else:
+            assert not record["landmarks"].any()
+    # The recording is a regular npy file
+    assert np.array_equal(np.load(file_path), records)
+
+def test_unclosed_recording_can_be_loaded(tmp_path: Any) -> None:
+    file_path = str(tmp_path / "landmarks.npy")
+    landmark_recorder = LandmarkRecorder(file_path)
+    for time_ms, landmarks in create_session(10):
+        landmark_recorder.add_record(time_ms, ArrayHandLandmarks(landmarks), capture_size)
+    # E.g. the app has crashed: the records are written, the record count in the header is not
+    landmark_recorder.file.flush() # type: ignore
+    assert len(load_landmark_records(file_path)) == 10
+    landmark_recorder.close()
+    assert len(load_landmark_records(file_path)) == 10
+
+class RecordingGestureRecognizer:
+    """ Stand-in for the GestureRecognizer. Keeps what it has been fed, and the time of get_time_ms meanwhile. """
+    def __init__(self, webcam_control: Any) -> None:
+        self.webcam_control = webcam_control
+        self.times_ms: List[int] = []
+        self.capture_sizes: List[Vector] = []
+        self.multi_hand_landmarks: List[Any] = []
+
+    def process_multi_hand_landmarks(self, multi_hand_landmarks: Any) -> None:
+        self.times_ms.append(get_time_ms())
+        self.capture_sizes.append(self.webcam_control.actual_capture_size)
+        self.multi_hand_landmarks.append(multi_hand_landmarks)
+
+def test_replay_feeds_recorded_frames(tmp_path: Any) -> None:
+    # pylint: disable=import-outside-toplevel
+    try:
+        # The replay refers to the AppContext, which needs PySide6
+        from common.LandmarkReplay import LandmarkReplay
+    except ImportError as e:
+        pytest.skip(f"the landmark replay cannot be imported: {e}")
+
+    file_path = str(tmp_path / "landmarks.npy")
+    session = create_session(400)
+    write_landmark_recording(file_path, session)
+    webcam_control = SimpleNamespace(actual_capture_size=Vector(1280, 720))
+    gesture_recognizer = RecordingGestureRecognizer(webcam_control)
+    app_context = SimpleNamespace(webcam_control=webcam_control, gesture_recognizer=gesture_recognizer)
+    landmark_replay = LandmarkReplay(app_context, file_path) # type: ignore
+    landmark_replay.run(0)
+
+    assert landmark_replay.replayed_frame_count == len(session)
+    # The clock follows the recorded timestamps during the replay only
+    assert gesture_recognizer.times_ms == [time_ms for time_ms, _ in session]
+    assert abs(get_time_ms() - session[-1][0]) > 1000
+    assert all(replayed_capture_size == capture_size for replayed_capture_size in gesture_recognizer.capture_sizes)
+    for multi_hand_landmarks, (_, landmarks) in zip(gesture_recognizer.multi_hand_landmarks, session):
+        if landmarks is None:
+            assert multi_hand_landmarks is None
+        else:
+            replayed_landmarks = np.array([(landmark.x, landmark.y, landmark.z) for landmark in multi_hand_landmarks[0].landmark])
+            assert np.array_equal(replayed_landmarks, landmarks)
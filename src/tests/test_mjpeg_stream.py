@@ -0,0 +1,142 @@
+from __future__ import annotations
+from typing import Any, List
+import time
+import pytest
+from common.FrameRingBuffer import FrameRingBuffer
+from common.MjpegStreamParser import MjpegStreamParser
+from common.MjpegStreamReader import MjpegStreamReader
+from common.ReducedJpegDecoder import ReducedJpegDecoder
+from common.Vector import Vector
+from .canned_http_server import MjpegServer, get_frame_number
+from .test_snapshot_fetcher import wait_until
+
+boundary = "frame"
+bodies = [b"\xff\xd8first\xff\xd9", b"\xff\xd8--fram\r\n\r\nsecond\xff\xd9", b"", b"\xff\xd8fourth\r\n\xff\xd9"]
+
+def create_part(body: bytes, is_content_length: bool = True) -> bytes:
+    headers = b"--frame\r\nContent-Type: image/jpeg\r\n"
+    if is_content_length:
+        headers = headers + f"Content-Length: {len(body)}\r\n".encode("latin-1")
+    return headers + b"\r\n" + body + b"\r\n"
+
+def create_stream(is_content_length: bool = True) -> bytes:
+    return b"preamble\r\n" + b"".join(create_part(body, is_content_length) for body in bodies) + b"--frame--\r\n"
+
+def feed_chunks(parser: MjpegStreamParser, chunks: List[bytes]) -> List[bytes]:
+    part_bodies = []
+    for chunk in chunks:
+        part_body = parser.feed(chunk, bytes)
+        if part_body is not None:
+            part_bodies.append(part_body)
+    return part_bodies
+
+def test_get_boundary() -> None:
+    assert MjpegStreamParser.get_boundary("multipart/x-mixed-replace; boundary=frame") == "frame"
+    assert MjpegStreamParser.get_boundary("multipart/x-mixed-replace;boundary=\"frame\"") == "\"frame\""
+    assert MjpegStreamParser.get_boundary("image/jpeg") is None
+    assert MjpegStreamParser.get_boundary("multipart/x-mixed-replace") is None
+    # Quotes and leading dashes of the boundary parameter are not part of the delimiter
+    assert MjpegStreamParser("\"--frame\"").delimiter == b"--frame"
+
+@pytest.mark.parametrize("is_content_length", [True, False])
+def test_parts_split_at_every_position(is_content_length: bool) -> None:
+    stream = create_stream(is_content_length)
+    for split_index in range(1, len(stream)):
+        parser = MjpegStreamParser(boundary)
+        part_bodies = feed_chunks(parser, [stream[:split_index], stream[split_index:]])
+        # The second chunk completes several parts, of which only the most recent is handed out
+        assert part_bodies[-1] == bodies[-1]
+        assert all(part_body in bodies for part_body in part_bodies)
+        assert parser.complete_part_count == len(bodies)
+        assert parser.skipped_part_count == len(bodies) - len(part_bodies)
+
+@pytest.mark.parametrize("is_content_length", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 11])
+def test_parts_in_small_chunks(is_content_length: bool, chunk_size: int) -> None:
+    stream = create_stream(is_content_length)
+    parser = MjpegStreamParser(boundary)
+    part_bodies = feed_chunks(parser, [stream[i:i + chunk_size] for i in range(0, len(stream), chunk_size)])
+    # Delimiters split across chunks are found once they are complete, thus every part is handed out in order
+    assert part_bodies == bodies
+    assert parser.skipped_part_count == 0
+
+def test_only_most_recent_part_of_chunk_is_handed_out() -> None:
+    parser = MjpegStreamParser(boundary)
+    assert feed_chunks(parser, [create_stream()]) == [bodies[-1]]
+    assert parser.complete_part_count == len(bodies)
+    assert parser.skipped_part_count == len(bodies) - 1
+
+def test_truncated_last_part_is_not_handed_out() -> None:
+    stream = b"".join(create_part(body) for body in bodies[:2])
+    truncated_stream = stream + create_part(b"\xff\xd8truncated\xff\xd9")[:-8]
+    parser = MjpegStreamParser(boundary)
+    part_bodies = feed_chunks(parser, [truncated_stream[i:i + 4] for i in range(0, len(truncated_stream), 4)])
+    assert part_bodies == bodies[:2]
+    # The truncated part is kept until the stream continues
+    assert parser.buffer.startswith(b"--frame")
+
+def test_oversized_buffer_without_delimiter_is_discarded() -> None:
+    parser = MjpegStreamParser(boundary)
+    parser.max_buffer_size = 1000
+    assert not feed_chunks(parser, [b"x" * 600, b"x" * 600])
+    assert len(parser.buffer) == 0
+    assert feed_chunks(parser, [create_stream()]) == [bodies[-1]]
+
+class RecordingFrameRingBuffer(FrameRingBuffer):
+    def __init__(self) -> None:
+        super().__init__()
+        self.published_frame_numbers: List[int] = []
+
+    def publish(self, slot_index: int, frame: Any) -> None:
+        self.published_frame_numbers.append(get_frame_number(frame))
+        super().publish(slot_index, frame)
+
+def run_mjpeg_stream_reader(mjpeg_server: MjpegServer, published_frame_count: int) -> MjpegStreamReader:
+    frame_ring_buffer = RecordingFrameRingBuffer()
+    mjpeg_stream_reader = MjpegStreamReader(mjpeg_server.get_url("/video"), frame_ring_buffer, ReducedJpegDecoder(lambda: Vector(640, 480)))
+    mjpeg_stream_reader.reconnect_delay_seconds = 0.01
+    mjpeg_stream_reader.start()
+    try:
+        wait_until(lambda: len(frame_ring_buffer.published_frame_numbers) >= published_frame_count)
+    finally:
+        mjpeg_stream_reader.stop()
+    return mjpeg_stream_reader
+
+def get_published_frame_numbers(mjpeg_stream_reader: MjpegStreamReader) -> List[int]:
+    return mjpeg_stream_reader.frame_ring_buffer.published_frame_numbers # type: ignore
+
+@pytest.mark.parametrize("is_content_length", [True, False])
+def test_reader_publishes_frames_in_order(is_content_length: bool) -> None:
+    # Small writes split the delimiters across reads
+    with MjpegServer(fps=200, write_size=97, is_content_length=is_content_length) as mjpeg_server:
+        mjpeg_stream_reader = run_mjpeg_stream_reader(mjpeg_server, 20)
+    frame_numbers = get_published_frame_numbers(mjpeg_stream_reader)
+    assert frame_numbers == sorted(set(frame_numbers))
+    assert mjpeg_stream_reader.error_count == 0
+    assert mjpeg_server.connection_count == 1
+
+def test_reader_skips_truncated_part_and_reconnects() -> None:
+    frame_count = 5
+    with MjpegServer(fps=200, frame_count=frame_count, is_truncated=True) as mjpeg_server:
+        mjpeg_stream_reader = run_mjpeg_stream_reader(mjpeg_server, 2 * (frame_count - 1))
+    frame_numbers = get_published_frame_numbers(mjpeg_stream_reader)
+    # The last frame of each connection is truncated, i.e. never published
+    truncated_frame_numbers = list(range(frame_count - 1, mjpeg_server.next_frame_number, frame_count))
+    assert not set(frame_numbers) & set(truncated_frame_numbers)
+    assert frame_numbers == sorted(set(frame_numbers))
+    assert mjpeg_stream_reader.error_count >= 1
+    assert mjpeg_server.connection_count >= 2
+
+def test_reader_drops_stale_frames() -> None:
+    # Frames that queue up while the consumer is busy are skipped without being decoded
+    with MjpegServer(fps=0) as mjpeg_server:
+        frame_ring_buffer = RecordingFrameRingBuffer()
+        mjpeg_stream_reader = MjpegStreamReader(mjpeg_server.get_url("/video"), frame_ring_buffer, ReducedJpegDecoder(lambda: Vector(640, 480)))
+        mjpeg_stream_reader.start()
+        try:
+            wait_until(lambda: mjpeg_stream_reader.parser is not None and mjpeg_stream_reader.parser.skipped_part_count > 0)
+            time.sleep(0.05)
+        finally:
+            mjpeg_stream_reader.stop()
+    assert mjpeg_stream_reader.parser is not None
+    assert mjpeg_stream_reader.decoded_frame_count < mjpeg_stream_reader.parser.complete_part_count
@@ -0,0 +1,85 @@
+from __future__ import annotations
+from math import sqrt
+from types import SimpleNamespace
+from typing import Iterator, List
+import pytest
+
+pytest.importorskip("pyautogui")
+pytest.importorskip("PySide6")
+pytest.importorskip("screeninfo")
+
+# pylint: disable=wrong-import-position
+from common.Config import Config, MousePositioningMode
+from common.MouseControl import MouseControl
+from common.Vector import Vector
+from common.util import set_time_source_ms
+
+# Speed of the hand in the capture frame
+hand_speed_px_per_second = 1200.0
+
+@pytest.fixture(name="fake_time_ms")
+def fixture_fake_time_ms() -> Iterator[List[int]]:
+    """ The current time in milliseconds, which the test sets. """
+    time_ms = [0]
+    set_time_source_ms(lambda: time_ms[0])
+    try:
+        yield time_ms
+    finally:
+        set_time_source_ms(None)
+
+def create_mouse_control() -> MouseControl:
+    config = Config()
+    config.mouse_positioning_mode.value = MousePositioningMode.RELATIVE
+    app_context = SimpleNamespace(config=config, webcam_control=SimpleNamespace(actual_capture_size=Vector(640, 480)))
+    mouse_control = MouseControl(app_context) # type: ignore
+    # Only simulate the mouse
+    mouse_control.is_output_enabled = False
+    return mouse_control
+
+def get_expected_displacement(mouse_control: MouseControl, hand_distance_px: float, delta_time_seconds: float) -> float:
+    """ Mouse displacement of one frame, see MouseControl._handle_new_mouse_position_via_relative_positioning. """
+    config = mouse_control.config
+    reduced_distance_px = hand_distance_px * (1 - config.min_mouse_position_difference_percent.value)
+    reference_interval_seconds = mouse_control.reference_frame_interval_seconds
+    reference_distance_px = reduced_distance_px * reference_interval_seconds / delta_time_seconds
+    return reduced_distance_px / sqrt(reference_distance_px) / reference_interval_seconds * config.mouse_position_difference_sensitivity.value
+
+def move_hand_for_one_second(mouse_control: MouseControl, fake_time_ms: List[int], fps: int) -> float:
+    """ Moves the hand to the right with constant speed and returns the horizontal mouse displacement. """
+    for frame_index in range(fps + 1):
+        # Timestamps are whole milliseconds, thus the frame intervals at 15 and 60 fps vary by 1 ms
+        fake_time_ms[0] = round(1000 * frame_index / fps)
+        mouse_control.on_new_mouse_position_detected(Vector(hand_speed_px_per_second * fake_time_ms[0] / 1000, 240))
+    return mouse_control.simulated_mouse_position.x # type: ignore
+
+@pytest.mark.parametrize("fps", [15, 30, 60])
+def test_mouse_speed_does_not_depend_on_frame_rate(fake_time_ms: List[int], fps: int) -> None:
+    mouse_control = create_mouse_control()
+    displacement_px = move_hand_for_one_second(mouse_control, fake_time_ms, fps)
+
+    # The displacement of a frame is proportional to its interval, thus it adds up to the displacement of one second at 30 fps
+    expected_displacement_px = 30 * get_expected_displacement(mouse_control, hand_speed_px_per_second / 30, 1 / 30)
+    assert displacement_px == pytest.approx(expected_displacement_px, rel=1e-6)
+    assert mouse_control.simulated_mouse_position.y == 0
+
+def test_delta_time_has_a_floor_of_one_millisecond(fake_time_ms: List[int]) -> None:
+    mouse_control = create_mouse_control()
+    fake_time_ms[0] = 1000
+    mouse_control.on_new_mouse_position_detected(Vector(100, 240))
+    assert mouse_control.get_delta_time_seconds() == mouse_control.min_delta_time_seconds == 0.001
+    fake_time_ms[0] = 1001
+    assert mouse_control.get_delta_time_seconds() == 0.001
+    fake_time_ms[0] = 1033
+    assert mouse_control.get_delta_time_seconds() == pytest.approx(0.033)
+
+    # A frame with the same timestamp moves the mouse as if it came 1 ms later
+    fake_time_ms[0] = 1000
+    mouse_control.on_new_mouse_position_detected(Vector(120, 240))
+    displacement_px = mouse_control.simulated_mouse_position.x
+    assert displacement_px == pytest.approx(get_expected_displacement(mouse_control, 20, 0.001))
+
+    other_mouse_control = create_mouse_control()
+    other_mouse_control.on_new_mouse_position_detected(Vector(100, 240))
+    fake_time_ms[0] = 1001
+    other_mouse_control.on_new_mouse_position_detected(Vector(120, 240))
+    assert other_mouse_control.simulated_mouse_position.x == pytest.approx(displacement_px)
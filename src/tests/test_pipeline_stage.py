@@ -0,0 +1,95 @@
+from __future__ import annotations
+from typing import Any, List
+import threading
+import pytest
+from common.DropOldestQueue import DropOldestQueue
+from common.PipelineStage import PipelineStage
+
+def test_queue_drops_oldest_items_when_full() -> None:
+    queue = DropOldestQueue(2)
+    for item in range(5):
+        queue.put(item)
+    assert queue.put_count == 5
+    assert queue.dropped_count == 3
+    assert queue.get(0) == 3
+    assert queue.get(0) == 4
+    # Empty
+    assert queue.get(0.01) is None
+
+def test_close_wakes_waiting_consumer() -> None:
+    queue = DropOldestQueue(1)
+    items: List[Any] = []
+    consumer = threading.Thread(target=lambda: items.append(queue.get()))
+    consumer.start()
+    queue.close()
+    consumer.join(5)
+    assert not consumer.is_alive()
+    assert items == [None]
+    # Items of a closed queue are not delivered
+    queue.put(1)
+    assert queue.get(0) is None
+
+def test_queue_needs_room() -> None:
+    with pytest.raises(ValueError):
+        DropOldestQueue(0)
+
+def test_stages_pass_items_on_in_order() -> None:
+    input_queue = DropOldestQueue(100)
+    middle_queue = DropOldestQueue(100)
+    output_queue = DropOldestQueue(100)
+    stages = [
+        PipelineStage("double", input_queue.get, lambda item: item * 2, middle_queue),
+        # None results are not passed on
+        PipelineStage("odd", middle_queue.get, lambda item: item + 1 if item % 4 == 0 else None, output_queue),
+    ]
+    for stage in stages:
+        stage.start()
+    try:
+        for item in range(20):
+            input_queue.put(item)
+        outputs = [output_queue.get(5) for _ in range(10)]
+    finally:
+        for stage in stages:
+            stage.stop()
+    assert outputs == [item * 2 + 1 for item in range(0, 20, 2)]
+    assert [stage.processed_item_count for stage in stages] == [20, 20]
+    assert middle_queue.dropped_count == 0
+
+def test_failing_item_does_not_stop_the_stage() -> None:
+    input_queue = DropOldestQueue(10)
+    output_queue = DropOldestQueue(10)
+    stage = PipelineStage("inverse", input_queue.get, lambda item: 1 / item, output_queue)
+    stage.start()
+    try:
+        for item in [1, 0, 2]:
+            input_queue.put(item)
+        assert [output_queue.get(5), output_queue.get(5)] == [1, 0.5]
+    finally:
+        stage.stop()
+    assert stage.failed_item_count == 1
+    assert stage.processed_item_count == 2
+
+def test_stop_waits_for_current_item() -> None:
+    input_queue = DropOldestQueue(1)
+    is_processing = threading.Event()
+    is_released = threading.Event()
+    def process_item(item: Any) -> Any:
+        is_processing.set()
+        is_released.wait(10)
+        return item
+    stage = PipelineStage("slow", input_queue.get, process_item, None)
+    stage.start()
+    stage_thread = stage.thread
+    input_queue.put(1)
+    assert is_processing.wait(5)
+
+    stopping_thread = threading.Thread(target=stage.stop)
+    stopping_thread.start()
+    # Longer than an item of a real stage takes
+    stopping_thread.join(1.5)
+    assert stopping_thread.is_alive()
+    is_released.set()
+    stopping_thread.join(5)
+    assert not stopping_thread.is_alive()
+    assert stage_thread is not None and not stage_thread.is_alive()
+    assert stage.thread is None and stage.processed_item_count == 1
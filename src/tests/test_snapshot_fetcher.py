@@ -0,0 +1,111 @@
+from __future__ import annotations
+from typing import Any, Callable, List
+import time
+from common.FrameRingBuffer import FrameRingBuffer
+from common.ReducedJpegDecoder import ReducedJpegDecoder
+from common.SnapshotFetcher import SnapshotFetcher
+from common.Vector import Vector
+from .canned_http_server import SnapshotServer, create_jpeg, get_gray_level
+
+class RecordingFrameRingBuffer(FrameRingBuffer):
+    """ Remembers the gray level of every published frame, also of frames that the consumer would have dropped. """
+    def __init__(self) -> None:
+        super().__init__()
+        self.published_gray_levels: List[int] = []
+
+    def publish(self, slot_index: int, frame: Any) -> None:
+        self.published_gray_levels.append(get_gray_level(frame))
+        super().publish(slot_index, frame)
+
+def create_snapshot_fetcher(url: str, connection_count: int = 1) -> SnapshotFetcher:
+    snapshot_fetcher = SnapshotFetcher(url, RecordingFrameRingBuffer(), ReducedJpegDecoder(lambda: Vector(640, 480)), connection_count)
+    snapshot_fetcher.reconnect_delay_seconds = 0.01
+    snapshot_fetcher.unchanged_snapshot_delay_seconds = 0.001
+    return snapshot_fetcher
+
+def get_published_gray_levels(snapshot_fetcher: SnapshotFetcher) -> List[int]:
+    return snapshot_fetcher.frame_ring_buffer.published_gray_levels # type: ignore
+
+def wait_until(condition: Callable[[], bool], timeout_seconds: float = 5) -> None:
+    end_time = time.monotonic() + timeout_seconds
+    while not condition():
+        assert time.monotonic() < end_time, "timeout"
+        time.sleep(0.005)
+
+def run_until(snapshot_fetcher: SnapshotFetcher, condition: Callable[[], bool]) -> None:
+    snapshot_fetcher.start()
+    try:
+        wait_until(condition)
+    finally:
+        snapshot_fetcher.stop()
+
+def test_frames_are_published_in_order() -> None:
+    gray_levels = [20, 60, 100, 140, 180, 220]
+    with SnapshotServer([create_jpeg(gray_level) for gray_level in gray_levels]) as snapshot_server:
+        snapshot_fetcher = create_snapshot_fetcher(snapshot_server.get_url("/shot.jpg"))
+        run_until(snapshot_fetcher, lambda: len(get_published_gray_levels(snapshot_fetcher)) >= len(gray_levels))
+    assert get_published_gray_levels(snapshot_fetcher) == gray_levels
+    # One persistent connection
+    assert snapshot_server.connection_count == 1
+    assert snapshot_fetcher.error_count == 0
+
+def test_unchanged_snapshots_are_skipped_by_etag() -> None:
+    snapshots = [create_jpeg(50), create_jpeg(50), create_jpeg(50), create_jpeg(150), create_jpeg(150), create_jpeg(250)]
+    with SnapshotServer(snapshots) as snapshot_server:
+        snapshot_fetcher = create_snapshot_fetcher(snapshot_server.get_url("/shot.jpg"))
+        run_until(snapshot_fetcher, lambda: snapshot_server.request_count > len(snapshots) + 3)
+    assert get_published_gray_levels(snapshot_fetcher) == [50, 150, 250]
+    # Answered with 304 via If-None-Match
+    assert snapshot_server.not_modified_count >= 3
+    assert snapshot_fetcher.unchanged_snapshot_count >= 3
+    assert snapshot_fetcher.decoded_snapshot_count == 3
+
+def test_unchanged_snapshots_are_skipped_by_bytes() -> None:
+    snapshots = [create_jpeg(50), create_jpeg(50), create_jpeg(150), create_jpeg(150)]
+    with SnapshotServer(snapshots, is_etag=False) as snapshot_server:
+        snapshot_fetcher = create_snapshot_fetcher(snapshot_server.get_url("/shot.jpg"))
+        run_until(snapshot_fetcher, lambda: snapshot_server.request_count > len(snapshots) + 3)
+    assert get_published_gray_levels(snapshot_fetcher) == [50, 150]
+    assert snapshot_server.not_modified_count == 0
+    assert snapshot_fetcher.unchanged_snapshot_count >= 2
+
+def test_reconnects_when_server_closes_connection() -> None:
+    gray_levels = [20, 60, 100, 140, 180, 220]
+    with SnapshotServer([create_jpeg(gray_level) for gray_level in gray_levels], responses_per_connection=2) as snapshot_server:
+        snapshot_fetcher = create_snapshot_fetcher(snapshot_server.get_url("/shot.jpg"))
+        run_until(snapshot_fetcher, lambda: len(get_published_gray_levels(snapshot_fetcher)) >= len(gray_levels))
+    assert get_published_gray_levels(snapshot_fetcher) == gray_levels
+    # 'Connection: close' is not an error
+    assert snapshot_fetcher.error_count == 0
+    assert snapshot_fetcher.connection_count_opened >= 3
+    assert snapshot_server.connection_count >= 3
+
+def test_reconnects_after_dropped_connections() -> None:
+    gray_levels = [20, 60, 100]
+    # The first two requests are dropped, thus the third snapshot is the first one that is served
+    snapshots = [create_jpeg(0), create_jpeg(0)] + [create_jpeg(gray_level) for gray_level in gray_levels]
+    with SnapshotServer(snapshots, dropped_request_count=2) as snapshot_server:
+        snapshot_fetcher = create_snapshot_fetcher(snapshot_server.get_url("/shot.jpg"))
+        run_until(snapshot_fetcher, lambda: len(get_published_gray_levels(snapshot_fetcher)) >= len(gray_levels))
+    assert get_published_gray_levels(snapshot_fetcher) == gray_levels
+    assert snapshot_fetcher.error_count == 2
+    assert snapshot_fetcher.error_message is None
+
+def test_multiple_connections_publish_new_snapshots() -> None:
+    gray_levels = [20, 60, 100, 140, 180, 220]
+    with SnapshotServer([create_jpeg(gray_level) for gray_level in gray_levels]) as snapshot_server:
+        snapshot_fetcher = create_snapshot_fetcher(snapshot_server.get_url("/shot.jpg"), connection_count=2)
+        run_until(snapshot_fetcher, lambda: gray_levels[-1] in get_published_gray_levels(snapshot_fetcher))
+    published_gray_levels = get_published_gray_levels(snapshot_fetcher)
+    # Each snapshot at most once
+    assert len(published_gray_levels) == len(set(published_gray_levels))
+    assert snapshot_server.connection_count == 2
+
+def test_outdated_responses_are_skipped() -> None:
+    # With multiple requests in flight, the response to an older request may arrive after a newer snapshot has been published
+    snapshot_fetcher = create_snapshot_fetcher("http://127.0.0.1:1/shot.jpg")
+    assert snapshot_fetcher.handle_response(1, 200, {}, create_jpeg(60))
+    assert not snapshot_fetcher.handle_response(0, 200, {}, create_jpeg(20))
+    assert snapshot_fetcher.handle_response(2, 200, {}, create_jpeg(100))
+    assert get_published_gray_levels(snapshot_fetcher) == [60, 100]
+    assert snapshot_fetcher.outdated_snapshot_count == 1
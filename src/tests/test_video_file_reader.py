@@ -0,0 +1,45 @@
+from __future__ import annotations
+from typing import Any
+from cv2 import cv2
+import numpy as np
+from common.FrameRingBuffer import FrameRingBuffer
+from common.VideoFileReader import VideoFileReader
+
+def write_images(directory: Any, count: int) -> None:
+    for image_index in range(count):
+        cv2.imwrite(str(directory / f"frame-{image_index:03}.png"), np.full((48, 64, 3), image_index * 50, dtype=np.uint8))
+
+def create_video_file_reader(directory: Any) -> VideoFileReader:
+    # Realtime at a high frame rate, such that the reader does not wait for the frames to be taken
+    video_file_reader = VideoFileReader(str(directory), FrameRingBuffer(), True, True, 1000)
+    assert video_file_reader.open() is None
+    return video_file_reader
+
+def test_looped_images_are_replayed(tmp_path: Any) -> None:
+    write_images(tmp_path, 3)
+    video_file_reader = create_video_file_reader(tmp_path)
+    frame_ring_buffer = video_file_reader.frame_ring_buffer
+    video_file_reader.start()
+    try:
+        for _ in range(10):
+            assert frame_ring_buffer.take_latest_frame(1) is not None
+    finally:
+        video_file_reader.stop()
+    assert video_file_reader.loop_count > 0
+    assert video_file_reader.error_message is None
+
+def test_loop_stops_when_no_frame_can_be_read(tmp_path: Any) -> None:
+    write_images(tmp_path, 3)
+    video_file_reader = create_video_file_reader(tmp_path)
+    # The images become unreadable after the reader has been opened
+    for image_file_path in video_file_reader.image_file_paths:
+        with open(image_file_path, "wb") as file:
+            file.write(b"not an image")
+
+    video_file_reader.is_running = True
+    # Returns instead of rewinding forever
+    video_file_reader.run()
+    assert video_file_reader.error_message is not None
+    assert video_file_reader.is_finished
+    assert video_file_reader.empty_loop_count == VideoFileReader.max_empty_loop_count
+    assert video_file_reader.frame_ring_buffer.published_frame_count == 0
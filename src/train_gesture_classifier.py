@@ -0,0 +1,60 @@
+from __future__ import annotations
+import argparse
+import logging
+from typing import List
+import numpy as np
+from common.Log import init_logging
+from common.GestureClassifier import GestureClassifier, get_landmark_features
+from common.LandmarkRecorder import load_landmark_records
+
+# Trains the gesture classifier from landmark recordings. Each recording is labeled with the gesture that is shown in all of its frames,
+# NONE for recordings of hands without gesture. Enable the classifier in the config (is_gesture_classifier) to use it.
+# Example: python train_gesture_classifier.py NONE=recordings/open-hand.npy SCROLL_UP=recordings/thumb-up.npy SCROLL_DOWN=recordings/thumb-down.npy
+parser = argparse.ArgumentParser(description="Train the gesture classifier from labeled landmark recordings.")
+parser.add_argument("labeled_file_paths", nargs="+", metavar="LABEL=FILE", help="gesture class (NONE or a GestureAction, e.g. SCROLL_UP) and landmark recording (.npy)")
+parser.add_argument("--output", default="gesture_classifier.npz", help="file of the trained classifier")
+parser.add_argument("--centroids", type=int, default=8, help="centroids per gesture class")
+parser.add_argument("--validation-fraction", type=float, default=0.2, help="fraction at the end of each recording that is used to measure the accuracy, 0 to skip")
+
+if __name__ == "__main__":
+    args = parser.parse_args()
+
+    init_logging()
+    log = logging.getLogger("root")
+
+    class_names: List[str] = []
+    features_of_recordings = []
+    class_indexes_of_recordings = []
+    is_validation_of_recordings = []
+    for labeled_file_path in args.labeled_file_paths:
+        class_name, separator, file_path = labeled_file_path.partition("=")
+        if not separator:
+            parser.error(f"expected LABEL=FILE, not '{labeled_file_path}'")
+        if class_name not in class_names:
+            class_names.append(class_name)
+        records = load_landmark_records(file_path)
+        records = records[records["has_hand"]]
+        capture_sizes = np.stack([records["capture_width"], records["capture_height"]], axis=-1)
+        features_of_recordings.append(get_landmark_features(records["landmarks"], capture_sizes))
+        class_indexes_of_recordings.append(np.full(len(records), class_names.index(class_name)))
+        # Neighboring frames are almost equal, thus the validation frames are a separate part of the recording
+        is_validation_of_recordings.append(np.arange(len(records)) >= len(records) * (1 - args.validation_fraction))
+        log.info(f"{class_name}: {len(records)} frames with hand in '{file_path}'")
+
+    features = np.concatenate(features_of_recordings)
+    class_indexes = np.concatenate(class_indexes_of_recordings)
+    is_validation = np.concatenate(is_validation_of_recordings)
+
+    if is_validation.any():
+        gesture_classifier = GestureClassifier.train(features[~is_validation], class_indexes[~is_validation], class_names, args.centroids)
+        predicted_class_indexes = gesture_classifier.classify(features[is_validation])
+        validation_class_indexes = class_indexes[is_validation]
+        log.info(f"validation accuracy: {np.mean(predicted_class_indexes == validation_class_indexes):.3f} ({is_validation.sum()} frames)")
+        for class_index, class_name in enumerate(class_names):
+            is_class = validation_class_indexes == class_index
+            if is_class.any():
+                log.info(f"  {class_name}: {np.mean(predicted_class_indexes[is_class] == class_index):.3f}")
+
+    gesture_classifier = GestureClassifier.train(features, class_indexes, class_names, args.centroids)
+    gesture_classifier.save(args.output)
+    log.info(f"saved gesture classifier with {len(gesture_classifier.centroids)} centroids to '{args.output}'")